@@ -18,9 +18,10 @@
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from .note import Note
-from .note_container import NoteContainer
+from .note_container import NoteContainer, FrozenNoteContainer
 from .bar import Bar
 from .track import Track
 from .composition import Composition
 from .suite import Suite
 from .instrument import Instrument, Piano, Guitar, MidiInstrument
+from .note_array import NoteArray
@@ -0,0 +1,45 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, arrays module.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The flat arrays used by NoteArray and EventTable.
+
+The arrays are NumPy arrays when NumPy is installed and array.array objects
+otherwise. Set numpy to None to use array.array objects anyway; the bulk
+conversions of TempoMap then return lists.
+"""
+
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _column(typecode, values):
+    """Return values as an array of the type given by typecode."""
+    if numpy is not None:
+        return numpy.array(values, dtype=typecode)
+    return array(typecode, values)
+
+
+def _take(column, indices):
+    """Return the values of column at indices as a new array."""
+    if isinstance(column, array):
+        return array(column.typecode, [column[i] for i in indices])
+    return column[indices]
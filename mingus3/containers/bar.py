@@ -17,26 +17,41 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+
 from mingus3.core import meter as _meter
-from mingus3.core import progressions, keys
+from mingus3.core import intervals, progressions, keys, value
 from .note_container import NoteContainer
 from .note import Note
 from .mt_exceptions import MeterFormatError
 
 
+def _beat_fraction(beat):
+    """Return a beat as an exact Fraction."""
+    if type(beat) is float:
+        return Fraction(beat).limit_denominator(1 << 16)
+    return Fraction(beat)
+
+
 class Bar(object):
     """A bar object.
 
     A Bar is basically a container for NoteContainers.
 
     Bars can be stored together with Instruments in Tracks.
+
+    The beats of the entries are kept as exact Fractions of a whole note,
+    so tuplets add up without rounding errors; the entries in bar and the
+    current_beat and length attributes hold them as floats.
     """
 
     key = 'C'
     meter = (4, 4)
-    current_beat = 0.0
-    length = 0.0
     bar = []
+    _onsets = []
+    _current_beat = Fraction(0)
+    _length = Fraction(0)
 
     def __init__(self, key='C', meter=(4, 4)):
         # warning should check types
@@ -46,10 +61,27 @@ class Bar(object):
         self.set_meter(meter)
         self.empty()
 
+    @property
+    def current_beat(self):
+        return float(self._current_beat)
+
+    @current_beat.setter
+    def current_beat(self, beat):
+        self._current_beat = _beat_fraction(beat)
+
+    @property
+    def length(self):
+        return float(self._length)
+
+    @length.setter
+    def length(self, length):
+        self._length = _beat_fraction(length)
+
     def empty(self):
         """Empty the Bar, remove all the NoteContainers."""
         self.bar = []
-        self.current_beat = 0.0
+        self._onsets = []
+        self._current_beat = Fraction(0)
         return self.bar
 
     def set_meter(self, meter):
@@ -63,10 +95,10 @@ class Bar(object):
         # warning should raise exception
         if _meter.valid_beat_duration(meter[1]):
             self.meter = (meter[0], meter[1])
-            self.length = meter[0] / meter[1]
+            self._length = Fraction(meter[0], meter[1])
         elif meter == (0, 0):
             self.meter = (0, 0)
-            self.length = 0.0
+            self._length = Fraction(0)
         else:
             raise MeterFormatError(
                     "The meter argument '%s' is not an "
@@ -78,7 +110,8 @@ class Bar(object):
         """Place the notes on the current_beat.
 
         Notes can be strings, Notes, list of strings, list of Notes or a
-        NoteContainer.
+        NoteContainer. The duration can also be an exact Fraction, which is
+        stored in the entry as a float.
 
         Raise a MeterFormatError if the duration is not valid.
 
@@ -92,18 +125,52 @@ class Bar(object):
         elif hasattr(notes, 'name') or (type(notes) in (str, list)):
             notes = NoteContainer(notes)
 
-        if (self.current_beat + 1/duration <= self.length) or (self.length == 0.0):
-            self.bar.append([self.current_beat, duration, notes])
-            self.current_beat += 1/duration
+        end = self._current_beat + value.to_fraction(duration)
+        if end <= self._length or self._length == 0:
+            if type(duration) is Fraction:
+                duration = float(duration)
+            self.bar.append([float(self._current_beat), duration, notes])
+            self._onsets.append(self._current_beat)
+            self._current_beat = end
             return True
         else:
             return False
 
     def place_notes_at(self, notes, at):
-        """Place notes at the given index."""
-        for x in self.bar:
-            if x[0] == at:
-                x[0][2] += notes
+        """Add notes to the entry starting at the beat at."""
+        i = self._index(at)
+        if i is not None:
+            if self.bar[i][2] is None:
+                self.bar[i][2] = NoteContainer(notes)
+            else:
+                self.bar[i][2] += notes
+
+    def _index(self, at):
+        """Return the index of the entry starting at the beat at, or None
+        when there is none."""
+        at = _beat_fraction(at)
+        i = bisect_left(self._onsets, at)
+        if i < len(self._onsets) and self._onsets[i] == at:
+            return i
+        return None
+
+    def get_entry_at(self, beat):
+        """Return the [beat, duration, notes] entry sounding at the beat,
+        or None when nothing has been placed there.
+
+        Example:
+        >>> b = Bar()
+        >>> b.place_notes('C', 2)
+        >>> b.get_entry_at(0.25)
+        [0.0, 2, ['C-4']]
+        """
+        beat = _beat_fraction(beat)
+        i = bisect_right(self._onsets, beat) - 1
+        if i < 0:
+            return None
+        if beat < self._onsets[i] + self._entry_length(i):
+            return self.bar[i]
+        return None
 
     def place_rest(self, duration):
         """Place a rest of given duration on the current_beat.
@@ -118,32 +185,53 @@ class Bar(object):
             rmv = self.bar.pop()
         except IndexError:
             print('[!] Bar is already empty!')
-            self.current_beat = 0
+            self._current_beat = Fraction(0)
         else:
-            self.current_beat -= 1/rmv[1]
+            self._current_beat = self._onsets.pop()
         return self.current_beat
 
+    def _entry_length(self, index):
+        """Return the exact length of the entry at index."""
+        if index + 1 < len(self._onsets):
+            return self._onsets[index + 1] - self._onsets[index]
+        return self._current_beat - self._onsets[index]
+
+    def change_last_duration(self, duration):
+        """Change the duration of the last entry.
+
+        Like in place_notes, the duration can be an exact Fraction, so the
+        current_beat stays exact. Return False when the Bar is empty.
+        """
+        if not self.bar:
+            return False
+        self._current_beat = self._onsets[-1] + value.to_fraction(duration)
+        if type(duration) is Fraction:
+            duration = float(duration)
+        self.bar[-1][1] = duration
+        return True
+
     def is_full(self):
         """Return False if there is room in this Bar for another
         NoteContainer, True otherwise."""
-        if (self.length == 0.0) or (not self.bar):
+        if (self._length == 0) or (not self.bar):
             return False
-        if self.current_beat >= self.length - 0.001:
+        if self._current_beat >= self._length:
             return True
         return False
 
     def change_note_duration(self, at, to):
-        """Change the note duration at the given index to the given
-        duration."""
+        """Change the duration of the entry starting at the beat at to the
+        given duration, moving the entries after it."""
         if _meter.valid_beat_duration(to):
-            diff = 0
-            for x in self.bar:
-                if diff != 0:
-                    x[0][0] -= diff
-                if x[0] == at:
-                    cur = x[0][1]
-                    x[0][1] = to
-                    diff = 1/cur - 1/to
+            i = self._index(at)
+            if i is None:
+                return
+            diff = value.to_fraction(to) - self._entry_length(i)
+            self.bar[i][1] = to
+            for j in range(i + 1, len(self.bar)):
+                self._onsets[j] += diff
+                self.bar[j][0] = float(self._onsets[j])
+            self._current_beat += diff
 
     def get_range(self):
         """Return the highest and the lowest note in a tuple."""
@@ -158,7 +246,7 @@ class Bar(object):
 
     def space_left(self):
         """Return the space left on the Bar."""
-        return self.length - self.current_beat
+        return float(self._length - self._current_beat)
 
     def value_left(self):
         """Return the value left on the Bar."""
@@ -167,20 +255,28 @@ class Bar(object):
     def augment(self):
         """Augment the NoteContainers in Bar."""
         for cont in self.bar:
-            cont[2].augment()
+            if cont[2] is not None:
+                cont[2].augment()
 
     def diminish(self):
         """Diminish the NoteContainers in Bar."""
         for cont in self.bar:
-            cont[2].diminish()
+            if cont[2] is not None:
+                cont[2].diminish()
 
     def transpose(self, interval, up=True):
         """Transpose the notes in the bar up or down the interval.
 
-        Call transpose() on all NoteContainers in the bar.
+        The interval is only parsed once for all the NoteContainers in the
+        bar; rests are skipped.
         """
+        self._transpose(intervals.transposition(interval, up))
+
+    def _transpose(self, transposition):
+        """Transpose the notes with a map from intervals.transposition."""
         for cont in self.bar:
-            cont[2].transpose(interval, up)
+            if cont[2] is not None:
+                cont[2]._transpose(transposition)
 
     def determine_chords(self, shorthand=False):
         """Return a list of lists [place_in_beat, possible_chords]."""
@@ -17,6 +17,11 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import copy
+from heapq import merge
+from operator import itemgetter
+
+from mingus3.core import intervals
 from .mt_exceptions import UnexpectedObjectError
 
 
@@ -83,6 +88,59 @@ class Composition(object):
         self.author = author
         self.email = email
 
+    def fork(self):
+        """Return a copy of the Composition with forks of all the Tracks.
+
+        The Tracks share their Bars with the ones in this Composition until
+        they are changed, see Track.fork.
+        """
+        res = copy.copy(self)
+        res.tracks = [track.fork() for track in self.tracks]
+        res.selected_tracks = list(self.selected_tracks)
+        return res
+
+    def transpose(self, interval, up=True):
+        """Transpose all the notes in the composition up or down the
+        interval.
+
+        The interval is only parsed once for all the Tracks.
+        """
+        transposition = intervals.transposition(interval, up)
+        for track in self.tracks:
+            track._transpose(transposition)
+        return self
+
+    def augment(self):
+        """Augment all the notes in the composition."""
+        for track in self.tracks:
+            track.augment()
+        return self
+
+    def diminish(self):
+        """Diminish all the notes in the composition."""
+        for track in self.tracks:
+            track.diminish()
+        return self
+
+    def bar_at(self, time):
+        """Return a list with the index of the Bar playing at time in every
+        Track, with None for the Tracks that are not playing."""
+        return [track.bar_at(time) for track in self.tracks]
+
+    def notes_at(self, time):
+        """Return a list of (onset, duration, NoteContainer) tuples for the
+        notes sounding at time in any of the Tracks, sorted on their onsets.
+        """
+        return list(merge(*[track.notes_at(time) for track in self.tracks],
+                          key=itemgetter(0)))
+
+    def notes_between(self, start, end):
+        """Return a list of (onset, duration, NoteContainer) tuples for the
+        notes sounding somewhere in the range [start, end) in any of the
+        Tracks, sorted on their onsets."""
+        return list(merge(*[track.notes_between(start, end) for track in
+                          self.tracks], key=itemgetter(0)))
+
     def __add__(self, value):
         """Enable the '+' operator for Compositions.
 
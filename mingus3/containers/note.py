@@ -22,6 +22,24 @@ from .mt_exceptions import NoteFormatError
 from math import log
 import re
 
+# The (channel, velocity) pairs used by Notes, shared between them
+_midi_pairs = {}
+_max_midi_pairs = 4096
+
+
+def _midi_pair(channel, velocity):
+    """Return the shared (channel, velocity) tuple."""
+    pair = (channel, velocity)
+    res = _midi_pairs.get(pair)
+    if res is None:
+        res = pair
+        if len(_midi_pairs) < _max_midi_pairs:
+            _midi_pairs[pair] = pair
+    return res
+
+_default_midi = _midi_pair(1, 64)
+
+
 class Note(object):
 
     """A note object.
@@ -39,18 +57,29 @@ class Note(object):
     and chords.
     """
 
-    name = 'C'
-    octave = 4
-    dynamics = {}
-    channel = 1
-    velocity = 64
-
-    def __init__(self, name='C', octave=4, dynamics={}):
+    # The channel and velocity share one slot, holding a (channel, velocity)
+    # tuple that is shared by all the Notes using the same pair. The string
+    # and fret are only set by the tunings module. The __dict__ is only
+    # created for other attributes set on a Note.
+    __slots__ = ('_name', '_octave', '_dynamics', '_int', '_midi', 'string',
+                 'fret', '__dict__')
+
+    def __init__(self, name='C', octave=4, dynamics=None):
+        self._name = 'C'
+        self._octave = 4
+        self._dynamics = None
+        self._int = None
+        self._midi = _default_midi
         if type(name) is str:
             self.set_note(name, octave, dynamics)
         elif hasattr(name, 'name'):
             # Hardcopy Note object
-            self.set_note(name.name, name.octave, name.dynamics)
+            if isinstance(name, Note):
+                dynamics = name._dynamics
+            else:
+                dynamics = getattr(name, 'dynamics', None)
+            self.set_note(name.name, name.octave, dict(dynamics) if dynamics
+                          else None)
             if hasattr(name, 'channel'):
                 self.channel = name.channel
             if hasattr(name, 'velocity'):
@@ -61,13 +90,61 @@ class Note(object):
             raise NoteFormatError("Don't know what to do with name object: "
                     "'%s'" % name)
 
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        self._int = None
+
+    @property
+    def octave(self):
+        return self._octave
+
+    @octave.setter
+    def octave(self, octave):
+        self._octave = octave
+        self._int = None
+
+    @property
+    def dynamics(self):
+        """The dictionary with the dynamics of the note.
+
+        It is only created when it is first asked for.
+        """
+        if self._dynamics is None:
+            self._dynamics = {}
+        return self._dynamics
+
+    @dynamics.setter
+    def dynamics(self, dynamics):
+        self._dynamics = dynamics
+
+    @property
+    def channel(self):
+        return self._midi[0]
+
+    @channel.setter
+    def channel(self, channel):
+        self._midi = _midi_pair(channel, self._midi[1])
+
+    @property
+    def velocity(self):
+        return self._midi[1]
+
+    @velocity.setter
+    def velocity(self, velocity):
+        self._midi = _midi_pair(self._midi[0], velocity)
+
     def set_channel(self, channel):
         self.channel = channel
         
     def set_velocity(self, velocity):
         self.velocity = velocity
     
-    def set_note(self, name='C', octave=4, dynamics={}):
+    def set_note(self, name='C', octave=4, dynamics=None):
         """Set the note to name in octave with dynamics.
 
         Return the objects if it succeeded, raise an NoteFormatError
@@ -98,7 +175,7 @@ class Note(object):
         """Remove the data in the instance."""
         self.name = ''
         octave = 0
-        dynamics = {}
+        dynamics = None
 
     def augment(self):
         """Call notes.augment with this note as argument."""
@@ -138,19 +215,9 @@ class Note(object):
         >>> a
         'A-4'
         """
-        # Calculate the new self.name and self.octave
-        old_name, old_octave = self.name, self.octave
-        self.name = intervals.from_shorthand(self.name, interval, up)
-        if up:
-            if Note(self.name[0]) < Note(old_name[0]):
-                self.octave += 1
-        else:
-            if Note(self.name[0]) > Note(old_name[0]):
-                self.octave -= 1
-
-        # Correct for interval larger than one octave
-        _acc, _deg, add_octave = intervals.parse_shorthand(interval)
-        self.octave += add_octave
+        name, octaves = intervals.transposition(interval, up)[self.name]
+        self.name = name
+        self.octave += octaves
 
     def from_int(self, integer):
         """Set the Note corresponding to the integer.
@@ -249,7 +316,7 @@ class Note(object):
                 octave -= 1
             elif x == "'":
                 octave += 1
-        return self.set_note(name, octave, {})
+        return self.set_note(name, octave)
 
     def __int__(self):
         """Return the current octave multiplied by twelve and add
@@ -257,13 +324,14 @@ class Note(object):
         
         This means a C-0 returns 0, C-1 returns 12, etc. This method allows
         you to use int() on Notes.
+
+        The value is kept until the name or octave of the note change.
         """
-        res = self.octave * 12 + notes.note_to_int(self.name[0])
-        for n in self.name[1:]:
-            if n == '#':
-                res += 1
-            elif n == 'b':
-                res -= 1
+        res = self._int
+        if res is None:
+            letter, alteration = notes.spelled_pitch(self._name)
+            res = self._int = (self._octave * 12 +
+                    notes.note_to_int(self._name[0]) + alteration)
         return res
 
     def __lt__(self, other):
@@ -290,6 +358,29 @@ class Note(object):
     def __ne__(self, other):
         return not self == other
 
+    def __hash__(self):
+        """Hash Notes by their note value, so equal Notes hash the same."""
+        return hash(int(self))
+
+    def __getstate__(self):
+        """Return the state of the note as a tuple, which keeps pickles and
+        copies of many notes small."""
+        return (self._name, self._octave, self._midi[0], self._midi[1],
+                self._dynamics, getattr(self, 'string', None),
+                getattr(self, 'fret', None), self.__dict__ or None)
+
+    def __setstate__(self, state):
+        (self._name, self._octave, channel, velocity, self._dynamics, string,
+         fret, attributes) = state
+        if attributes:
+            self.__dict__.update(attributes)
+        self._int = None
+        self._midi = _midi_pair(channel, velocity)
+        if string is not None:
+            self.string = string
+        if fret is not None:
+            self.fret = fret
+
     def __gt__(self, other):
         return not(self < other or self == other)
 
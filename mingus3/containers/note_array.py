@@ -0,0 +1,448 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, note_array module.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""A container storing large amounts of notes in flat arrays.
+
+A NoteArray keeps one array per attribute of its notes instead of one
+object per note: the onset, the duration, the integer pitch, the spelling
+of the note name as a letter and an alteration, the velocity and the MIDI
+channel. The arrays are NumPy arrays when NumPy is installed and
+array.array objects otherwise.
+
+Onsets are measured in whole notes from the start of the first bar, like
+the beats in a Bar, and durations are note values, like 4 for a quarter
+note. The notes are kept sorted on their onsets. The dynamics of the notes
+that have them are kept in the dynamics dictionary and the onset, key and
+meter of every Bar a NoteArray was made from in the bars list.
+
+Bars hold one entry at a time, so to_track splits notes that cross a bar
+line or overlap other notes starting or ending earlier. Every part but the
+last gets a 'tie' in its dynamics, which from_track uses to join the parts
+again.
+"""
+
+from array import array
+from bisect import bisect_left
+from fractions import Fraction
+
+from mingus3.core import notes, value
+from .note import Note
+from .note_container import NoteContainer
+from .bar import Bar, _beat_fraction
+from .track import Track
+from .mt_exceptions import MeterFormatError
+from . import arrays
+from .arrays import _column, _take
+
+# The attribute and array.array typecode of every array in a NoteArray
+_columns = (
+    ('onset', 'd'),
+    ('duration', 'd'),
+    ('pitch', 'i'),
+    ('letter', 'b'),
+    ('alteration', 'h'),
+    ('velocity', 'h'),
+    ('channel', 'h'),
+    )
+
+_letter_ints = (0, 2, 4, 5, 7, 9, 11)
+
+
+def _note_name(letter, alteration):
+    """Return the note name spelled by letter and alteration."""
+    if alteration > 0:
+        return 'CDEFGAB'[letter] + '#' * alteration
+    return 'CDEFGAB'[letter] + 'b' * -alteration
+
+
+def _value(duration):
+    """Return duration as an int when it is a whole number, like the note
+    values used in Bars."""
+    duration = float(duration)
+    if duration.is_integer():
+        return int(duration)
+    return duration
+
+
+class NoteArray(object):
+
+    """A container holding notes in flat arrays.
+
+    NoteArrays can be converted from and to Tracks, Bars and
+    NoteContainers, and offer transpose, get_range, filter and
+    slice_by_time on all of their notes at once.
+
+    Example:
+    >>> a = NoteArray([0.0, 0.25], [4, 4], [48, 52])
+    >>> a.transpose('3').to_note_container()
+    ['E-4', 'G#-4']
+    """
+
+    key = 'C'
+    meter = (4, 4)
+
+    def __init__(self, onset=(), duration=(), pitch=(), velocity=None,
+                 channel=None, names=None):
+        """Create a NoteArray from sequences of onsets, durations and
+        integer pitches.
+
+        The velocities default to 64 and the channels to 1. The note names
+        are spelled with notes.int_to_note unless a sequence of names is
+        given.
+        """
+        size = len(pitch)
+        if velocity is None:
+            velocity = [64] * size
+        if channel is None:
+            channel = [1] * size
+        if names is None:
+            names = [notes.int_to_note(p % 12) for p in pitch]
+        letter = []
+        alteration = []
+        for name in names:
+            l, a = notes.spelled_pitch(name)
+            letter.append(l)
+            alteration.append(a)
+        order = sorted(range(size), key=onset.__getitem__)
+        self.bars = []
+        self._set_columns([onset, duration, pitch, letter, alteration,
+                           velocity, channel], order)
+
+    def _set_columns(self, values, order=None, dynamics=None):
+        """Set the arrays to the sequences in values and the dynamics to the
+        dictionary of dynamics by row, rearranged in order when given."""
+        for (attr, typecode), column in zip(_columns, values):
+            if order is not None:
+                column = [column[i] for i in order]
+            setattr(self, attr, _column(typecode, column))
+        self.dynamics = {}
+        if dynamics:
+            position = dict((old, new) for new, old in enumerate(order))
+            self.dynamics = dict((position[row], d) for row, d in
+                                 dynamics.items())
+
+    def _copy(self, indices):
+        """Return a new NoteArray with the notes at indices."""
+        res = NoteArray.__new__(NoteArray)
+        for attr, typecode in _columns:
+            setattr(res, attr, _take(getattr(self, attr), indices))
+        res.key = self.key
+        res.meter = self.meter
+        res.bars = list(self.bars)
+        res.dynamics = {}
+        if self.dynamics:
+            for i, j in enumerate(indices):
+                if int(j) in self.dynamics:
+                    res.dynamics[i] = self.dynamics[int(j)]
+        return res
+
+    def _note(self, index):
+        """Return the note at index as a Note."""
+        letter = int(self.letter[index])
+        alteration = int(self.alteration[index])
+        octave = (int(self.pitch[index]) - _letter_ints[letter]
+                  - alteration) // 12
+        n = Note(_note_name(letter, alteration), octave)
+        n.velocity = int(self.velocity[index])
+        n.channel = int(self.channel[index])
+        if index in self.dynamics:
+            n.dynamics = dict(self.dynamics[index])
+        return n
+
+    def from_note_container(self, note_container, onset=0.0, duration=4):
+        """Set the NoteArray to the notes in a NoteContainer, all starting
+        at onset and lasting duration."""
+        entries = [(onset, duration, note_container)]
+        self.bars = []
+        return self._from_entries(entries)
+
+    def from_bar(self, bar, onset=0.0):
+        """Set the NoteArray to the notes in a Bar, which starts at onset."""
+        self.key = bar.key
+        self.meter = bar.meter
+        self.bars = [(float(onset), bar.key, bar.meter)]
+        entries = [(onset + beat, duration, container) for beat, duration,
+                   container in bar]
+        return self._from_entries(entries)
+
+    def from_track(self, track):
+        """Set the NoteArray to the notes in a Track.
+
+        The onset, key and meter of every Bar are kept in bars; key and
+        meter are set to those of the first Bar.
+        """
+        entries = []
+        self.bars = []
+        start = Fraction(0)
+        for bar in track.bars:
+            self.bars.append((float(start), bar.key, bar.meter))
+            for beat, duration, container in bar:
+                entries.append((float(start + _beat_fraction(beat)),
+                                duration, container))
+            start += bar._length
+        if track.bars:
+            self.key = track.bars[0].key
+            self.meter = track.bars[0].meter
+        return self._from_entries(entries)
+
+    def _from_entries(self, entries):
+        """Set the NoteArray to the notes in a sequence of (onset,
+        duration, NoteContainer) entries, skipping rests and joining the
+        parts of tied notes."""
+        values = [[], [], [], [], [], [], []]
+        (onset, duration, pitch, letter, alteration, velocity,
+         channel) = values
+        dynamics = {}
+        ends = []
+        tied = {}  # The rows of the notes tied to the next entry by pitch
+        for start, length, container in entries:
+            if container is None:
+                continue
+            start = _beat_fraction(start)
+            end = start + value.to_fraction(length)
+            for n in container:
+                d = n._dynamics
+                tie = False
+                if d:
+                    d = dict(d)
+                    tie = d.pop('tie', False)
+                key = (int(n), n.channel)
+                row = tied.pop(key, None)
+                if row is not None and ends[row] == start:
+                    ends[row] = end
+                else:
+                    row = len(onset)
+                    l, a = notes.spelled_pitch(n.name)
+                    onset.append(float(start))
+                    pitch.append(int(n))
+                    letter.append(l)
+                    alteration.append(a)
+                    velocity.append(n.velocity)
+                    channel.append(n.channel)
+                    ends.append(end)
+                    if d:
+                        dynamics[row] = d
+                if tie:
+                    tied[key] = row
+        for row, end in enumerate(ends):
+            duration.append(float(1 / (end - _beat_fraction(onset[row]))))
+        order = sorted(range(len(onset)), key=onset.__getitem__)
+        self._set_columns(values, order, dynamics)
+        return self
+
+    def _layout(self, end):
+        """Return the Bars of the NoteArray, as (start, Bar) tuples, that
+        are needed to hold the notes up to end.
+
+        The Bars in bars are followed by as many Bars with the key and
+        meter of the last one as needed.
+        """
+        layout = [(_beat_fraction(float(start)), key, meter) for start, key,
+                  meter in self.bars]
+        if not layout:
+            layout = [(Fraction(0), self.key, self.meter)]
+        elif layout[0][0] > 0:
+            layout.insert(0, (Fraction(0), layout[0][1], layout[0][2]))
+        res = []
+        for i, (start, key, meter) in enumerate(layout):
+            last = i + 1 == len(layout)
+            stop = max(end, start) if last else layout[i + 1][0]
+            while True:
+                bar = Bar(key, meter)
+                res.append((start, bar))
+                if bar._length:
+                    start += bar._length
+                else:
+                    start = stop
+                if start >= stop:
+                    break
+        return res
+
+    def to_note_container(self):
+        """Return a NoteContainer with all the notes in the NoteArray."""
+        res = NoteContainer()
+        for i in range(len(self)):
+            res.add_note(self._note(i))
+        return res
+
+    def to_bar(self):
+        """Return the notes as a Bar, with rests filling the gaps between
+        them.
+
+        The notes should fit in a single bar of the NoteArray's meter.
+        """
+        return self.to_track().bars[0]
+
+    def to_track(self, instrument=None):
+        """Return the notes as a Track, with rests filling the gaps between
+        them.
+
+        The Bars get the onset, key and meter they had in the Track or Bar
+        the NoteArray was made from, followed by Bars with the key and meter
+        of the last one. Notes crossing a bar line, or overlapping notes
+        that start or end earlier, are split and tied; see the module
+        documentation.
+
+        Raise a MeterFormatError when a note has a negative onset or a
+        duration that is not positive, or overlaps a note of the same
+        pitch.
+        """
+        spans = []
+        for i in range(len(self)):
+            if not self.onset[i] >= 0 or not self.duration[i] > 0:
+                raise MeterFormatError("Can't place the note at onset %s "
+                                       "with duration %s" % (self.onset[i],
+                                       self.duration[i]))
+            start = _beat_fraction(float(self.onset[i]))
+            spans.append((start, start + value.to_fraction(
+                          float(self.duration[i])), i))
+        end = max([e for s, e, i in spans] or [0])
+        layout = self._layout(end)
+        end = max(end, layout[-1][0])
+        points = set([s for s, e, i in spans] + [e for s, e, i in spans] +
+                     [start for start, bar in layout] + [end])
+        points = sorted(p for p in points if p <= end)
+        res = Track(instrument)
+        for start, bar in layout:
+            res.add_bar(bar)
+        sounding = []
+        next_span = 0
+        next_bar = 0
+        for p, q in zip(points, points[1:]):
+            while next_bar < len(layout) and layout[next_bar][0] <= p:
+                bar = layout[next_bar][1]
+                next_bar += 1
+            sounding = [span for span in sounding if span[1] > p]
+            while next_span < len(spans) and spans[next_span][0] == p:
+                sounding.append(spans[next_span])
+                next_span += 1
+            duration = _value(1 / (q - p))
+            if value.to_fraction(duration) != q - p:
+                duration = 1 / (q - p)
+            if sounding:
+                container = NoteContainer()
+                for s, e, i in sounding:
+                    n = self._note(i)
+                    if e > q:
+                        n.dynamics['tie'] = True
+                    container.add_note(n)
+                placed = len(container) == len(sounding) and \
+                    bar.place_notes(container, duration)
+            else:
+                placed = bar.place_rest(duration)
+            if not placed:
+                raise MeterFormatError("Can't place an entry of %s at %s in "
+                                       "bar %d" % (q - p, p, next_bar - 1))
+        return res
+
+    def transpose(self, interval, up=True):
+        """Transpose all the notes up or down the interval.
+
+        The notes are spelled as Note.transpose would, but the interval is
+        only applied once for every distinct note name.
+        """
+        numpy = arrays.numpy
+        if numpy is not None:
+            codes = self.alteration.astype('l') * 7 + self.letter
+            unique, inverse = numpy.unique(codes, return_inverse=True)
+            unique = unique.tolist()
+        else:
+            codes = [a * 7 + l for l, a in zip(self.letter,
+                     self.alteration)]
+            unique = sorted(set(codes))
+            position = dict((code, i) for i, code in enumerate(unique))
+            inverse = [position[code] for code in codes]
+        letter = []
+        alteration = []
+        shift = []
+        for code in unique:
+            l, a = code % 7, code // 7
+            n = Note(_note_name(l, a), 0)
+            n.transpose(interval, up)
+            new_letter, new_alteration = notes.spelled_pitch(n.name)
+            letter.append(new_letter)
+            alteration.append(new_alteration)
+            shift.append(int(n) - _letter_ints[l] - a)
+        letter = _column('b', letter)
+        alteration = _column('h', alteration)
+        shift = _column('i', shift)
+        self.letter = _take(letter, inverse)
+        self.alteration = _take(alteration, inverse)
+        if numpy is not None:
+            self.pitch = self.pitch + shift[inverse]
+        else:
+            self.pitch = array('i', [p + shift[i] for p, i in
+                               zip(self.pitch, inverse)])
+        return self
+
+    def get_range(self):
+        """Return the lowest and the highest note as a tuple of Notes.
+
+        Return (None, None) when the NoteArray is empty.
+        """
+        numpy = arrays.numpy
+        if not len(self):
+            return (None, None)
+        if numpy is not None:
+            low = int(numpy.argmin(self.pitch))
+            high = int(numpy.argmax(self.pitch))
+        else:
+            low = min(range(len(self)), key=self.pitch.__getitem__)
+            high = max(range(len(self)), key=self.pitch.__getitem__)
+        return (self._note(low), self._note(high))
+
+    def filter(self, mask):
+        """Return a new NoteArray with the notes for which mask is true.
+
+        The mask is a sequence of booleans, one for every note.
+
+        Example:
+        >>> a.filter(a.pitch >= 60)
+        """
+        numpy = arrays.numpy
+        if numpy is not None:
+            indices = numpy.flatnonzero(numpy.asarray(mask, dtype=bool))
+        else:
+            indices = [i for i, keep in enumerate(mask) if keep]
+        return self._copy(indices)
+
+    def slice_by_time(self, start, end):
+        """Return a new NoteArray with the notes that have an onset in the
+        range [start, end)."""
+        numpy = arrays.numpy
+        if numpy is not None:
+            first, last = numpy.searchsorted(self.onset, [start, end])
+            indices = numpy.arange(first, last)
+        else:
+            indices = range(bisect_left(self.onset, start),
+                            bisect_left(self.onset, end))
+        return self._copy(indices)
+
+    def __iter__(self):
+        """Iterate over the notes as (onset, duration, Note) tuples."""
+        for i in range(len(self)):
+            yield (float(self.onset[i]), float(self.duration[i]),
+                   self._note(i))
+
+    def __len__(self):
+        """Return the number of notes."""
+        return len(self.pitch)
+
+    def __repr__(self):
+        """Return a string representing the NoteArray."""
+        return str(list(self))
@@ -17,10 +17,17 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from bisect import bisect_left
+from operator import gt
+from weakref import WeakValueDictionary
+
 from .note import Note
 from mingus3.core import intervals, chords, progressions
 from .mt_exceptions import UnexpectedObjectError
 
+# The FrozenNoteContainers in use, by their note names and octaves
+_frozen_note_containers = WeakValueDictionary()
+
 
 class NoteContainer(object):
 
@@ -34,6 +41,16 @@ class NoteContainer(object):
     """
 
     notes = []
+    # The integer values of the notes, sorted like them, a set of the same
+    # values and the notes list they belong to, see _pitch_cache. _pitches
+    # is None after notes were changed through the container.
+    _pitches = None
+    _pitch_set = frozenset()
+    _indexed = None
+    # The number of intervals between the notes for every value of
+    # intervals.dissonance, when asked for before and kept up to date by
+    # the methods adding and removing notes
+    _dissonances = None
 
     def __init__(self, notes=[]):
         self.empty()
@@ -42,33 +59,78 @@ class NoteContainer(object):
     def empty(self):
         """Empty the container."""
         self.notes = []
+        self._pitches = []
+        self._pitch_set = set()
+        self._indexed = self.notes
+        self._dissonances = None
 
-    def add_note(self, note, octave=None, dynamics={}):
-        """Add a note to the container and sorts the notes from low to high.
+    def _to_note(self, note, octave=None, dynamics=None, top=None):
+        """Return note as a Note object.
 
-        The note can either be a string, in which case you could also use
-        the octave and dynamics arguments, or a Note object.
+        Note names without an octave are placed in the octave of the top
+        note, or the one above it when they would sound lower.
         """
         if type(note) is str:
             if octave:
                 note = Note(note, octave, dynamics)
-            elif len(self.notes) == 0:
+            elif top is None:
                 note = Note(note, 4, dynamics)
             else:
-                if Note(note, self.notes[-1].octave) < self.notes[-1]:
-                    note = Note(note, self.notes[-1].octave + 1, dynamics)
+                if Note(note, top.octave) < top:
+                    note = Note(note, top.octave + 1, dynamics)
                 else:
-                    note = Note(note, self.notes[-1].octave, dynamics)
+                    note = Note(note, top.octave, dynamics)
 
         if not hasattr(note, 'name'):
             raise UnexpectedObjectError("Object '%s' was not expected. "
                     "Expecting a mingus.containers.Note object." % note)
+        return note
 
-        if note not in self.notes:
-            self.notes.append(note)
-            self.notes.sort()
+    def add_note(self, note, octave=None, dynamics=None):
+        """Add a note to the container and sorts the notes from low to high.
+
+        The note can either be a string, in which case you could also use
+        the octave and dynamics arguments, or a Note object.
+        """
+        note = self._to_note(note, octave, dynamics,
+                             self.notes[-1] if self.notes else None)
+        pitches = self._pitch_cache()
+        pitch = int(note)
+        if pitch not in self._pitch_set:
+            i = bisect_left(pitches, pitch)
+            self.notes.insert(i, note)
+            pitches.insert(i, pitch)
+            self._pitch_set.add(pitch)
+            if self._dissonances is not None:
+                self._count_note_dissonances(i)
         return self.notes
 
+    def _pitch_cache(self):
+        """Return the sorted integer values of the notes.
+
+        The values are kept with the notes and only computed again, sorting
+        the notes when they are out of order, after the notes list was
+        replaced, grown or shrunk from outside or changed through
+        __setitem__ or sort.
+        """
+        pitches = self._pitches
+        if (pitches is None or self._indexed is not self.notes or
+                len(pitches) != len(self.notes)):
+            self._dissonances = None
+            pitches = self._index_pitches()
+        return pitches
+
+    def _index_pitches(self):
+        """Compute the integer values of the notes again."""
+        pitches = [int(n) for n in self.notes]
+        if any(map(gt, pitches, pitches[1:])):
+            self.notes.sort()
+            pitches.sort()
+        self._pitches = pitches
+        self._pitch_set = set(pitches)
+        self._indexed = self.notes
+        return pitches
+
     def add_notes(self, notes):
         """Feed notes to self.add_note.
 
@@ -78,25 +140,47 @@ class NoteContainer(object):
 
         or even:
         >>> notes = [['C', 5, {'volume': 20}], ['E', 6, {'volume': 20}]]
+
+        Lists of notes are added at once, sorting the container only once.
         """
         if hasattr(notes, 'notes'):
-            for x in notes.notes:
-                self.add_note(x)
-            return self.notes
-        elif hasattr(notes, 'name'):
+            args = [(x,) for x in notes.notes]
+        elif hasattr(notes, 'name') or type(notes) is str:
             self.add_note(notes)
             return self.notes
-        elif type(notes) is str:
-            self.add_note(notes)
-            return self.notes
-        for x in notes:
-            if type(x) is list and len(x) != 1:
-                if len(x) == 2:
-                    self.add_note(x[0], x[1])
+        else:
+            args = []
+            for x in notes:
+                if type(x) is list and len(x) != 1:
+                    args.append(tuple(x[:3]))
                 else:
-                    self.add_note(x[0], x[1], x[2])
-            else:
-                self.add_note(x)
+                    args.append((x,))
+        if len(args) < 2:
+            for x in args:
+                self.add_note(*x)
+            return self.notes
+
+        self._pitch_cache()
+        # Names without an octave depend on the highest note added so far
+        top = self.notes[-1] if self.notes else None
+        new = []
+        for x in args:
+            note = self._to_note(*x, top=top)
+            if top is None or note > top:
+                top = note
+            new.append(note)
+        pitches = self._pitch_set
+        added = set()
+        for note in new:
+            pitch = int(note)
+            if pitch not in pitches:
+                pitches.add(pitch)
+                added.add(pitch)
+                self.notes.append(note)
+        self.notes.sort()
+        self._pitches = [int(x) for x in self.notes]
+        if added and self._dissonances is not None:
+            self._count_dissonances([p in added for p in self._pitches], 1)
         return self.notes
 
     def from_chord(self, shorthand):
@@ -166,20 +250,62 @@ class NoteContainer(object):
         self.add_notes(notes)
         return self
 
-    def _consonance_test(self, testfunc, param=None):
-        """Private function used for testing consonance/dissonance."""
-        n = list(self.notes)
-        while len(n) > 1:
-            first = n[0]
-            for second in n[1:]:
-                if param is None:
-                    if not testfunc(first.name, second.name):
-                        return False
-                else:
-                    if not testfunc(first.name, second.name, param):
-                        return False
-            n = n[1:]
-        return True
+    def _dissonance_counts(self):
+        """Return a list with the number of intervals between the notes for
+        every value of intervals.dissonance.
+
+        The counts are computed once and then updated by the methods adding
+        and removing notes. They are counted again from scratch when the
+        values of the notes are computed again, see _pitch_cache.
+        """
+        self._pitch_cache()
+        if self._dissonances is None:
+            self._dissonances = [0] * 6
+            self._count_dissonances([True] * len(self._pitches), 1)
+        return self._dissonances
+
+    def _count_note_dissonances(self, index):
+        """Count the intervals with the note that was inserted at index."""
+        counts = self._dissonances
+        table = intervals._dissonance_table
+        pitches = self._pitches
+        pitch = pitches[index] % 12
+        for other in pitches[:index]:
+            counts[table[other % 12][pitch]] += 1
+        row = table[pitch]
+        for other in pitches[index + 1:]:
+            counts[row[other % 12]] += 1
+
+    def _count_dissonances(self, marked, sign):
+        """Add sign to the counts of the intervals that involve one of the
+        notes for which marked is True, counting every interval once."""
+        counts = self._dissonances
+        table = intervals._dissonance_table
+        classes = [p % 12 for p in self._pitches]
+        for i, pitch in enumerate(classes):
+            if not marked[i]:
+                continue
+            for j in range(i):
+                if not marked[j]:
+                    counts[table[classes[j]][pitch]] += sign
+            row = table[pitch]
+            for other in classes[i + 1:]:
+                counts[row[other]] += sign
+
+    def dissonance(self):
+        """Return the sum of intervals.dissonance over all the intervals
+        between the notes.
+
+        Lower scores mean more consonant voicings.
+
+        Example:
+        >>> NoteContainer(['C', 'E', 'G']).dissonance()
+        2
+        >>> NoteContainer(['C', 'D', 'E']).dissonance()
+        7
+        """
+        return sum([value * count for value, count in
+                   enumerate(self._dissonance_counts())])
 
     def is_consonant(self, include_fourths=True):
         """Test whether the notes are consonants.
@@ -187,7 +313,8 @@ class NoteContainer(object):
         See the core.intervals module for a longer description on
         consonance.
         """
-        return self._consonance_test(intervals.is_consonant, include_fourths)
+        counts = self._dissonance_counts()
+        return not any(counts[3:]) and (include_fourths or not counts[2])
 
     def is_perfect_consonant(self, include_fourths=True):
         """Test whether the notes are perfect consonants.
@@ -195,8 +322,9 @@ class NoteContainer(object):
         See the core.intervals module for a longer description on
         consonance.
         """
-        return self._consonance_test(intervals.is_perfect_consonant,
-                include_fourths)
+        counts = self._dissonance_counts()
+        return (not counts[1] and not any(counts[3:]) and
+                (include_fourths or not counts[2]))
 
     def is_imperfect_consonant(self):
         """Test whether the notes are imperfect consonants.
@@ -204,7 +332,8 @@ class NoteContainer(object):
         See the core.intervals module for a longer description on
         consonance.
         """
-        return self._consonance_test(intervals.is_imperfect_consonant)
+        counts = self._dissonance_counts()
+        return not counts[0] and not any(counts[2:])
 
     def is_dissonant(self, include_fourths=False):
         """Test whether the notes are dissonants.
@@ -220,19 +349,37 @@ class NoteContainer(object):
         note's name. If no specific octave is given, the note gets removed
         in every octave.
         """
-        res = []
+        self._pitch_cache()
+        if type(note) is not str and int(note) not in self._pitch_set:
+            return self._keep_notes([True] * len(self.notes))
+        keep = []
         for x in self.notes:
             if type(note) is str:
-                if x.name != note:
-                    res.append(x)
-                else:
-                    if x.octave != octave and octave != -999:
-                        res.append(x)
+                keep.append(x.name != note or (x.octave != octave and
+                            octave != -999))
             else:
-                if x != note:
-                    res.append(x)
-        self.notes = res
-        return res
+                keep.append(x != note)
+        return self._keep_notes(keep)
+
+    def _keep_notes(self, keep):
+        """Remove the notes for which keep is False.
+
+        keep has to be computed after _pitch_cache, which can reorder the
+        notes.
+        """
+        pitches = self._pitches
+        if not all(keep):
+            if self._dissonances is not None:
+                self._count_dissonances([not k for k in keep], -1)
+            self.notes = [x for x, k in zip(self.notes, keep) if k]
+            pitches = [p for p, k in zip(pitches, keep) if k]
+            self._pitch_set = set(pitches)
+        else:
+            self.notes = list(self.notes)
+            pitches = list(pitches)
+        self._pitches = pitches
+        self._indexed = self.notes
+        return self.notes
 
     def remove_notes(self, notes):
         """Remove notes from the containers.
@@ -242,43 +389,75 @@ class NoteContainer(object):
         """
         if (type(notes) is str) or hasattr(notes, 'name'):
             return self.remove_note(notes)
+        self._pitch_cache()
+        names = set()
+        pitches = set()
         for n in notes:
-            self.remove_note(n)
-        return self.notes
+            if type(n) is str:
+                names.add(n)
+            else:
+                pitches.add(int(n))
+        return self._keep_notes([x.name not in names and p not in pitches
+                                 for x, p in zip(self.notes, self._pitches)])
 
     def remove_duplicate_notes(self):
         """Remove duplicate and enharmonic notes from the container."""
-        res = []
-        for x in self.notes:
-            if x not in res:
-                res.append(x)
-        self.notes = res
-        return res
+        self._pitch_cache()
+        pitches = set()
+        keep = []
+        for pitch in self._pitches:
+            keep.append(pitch not in pitches)
+            pitches.add(pitch)
+        return self._keep_notes(keep)
 
     def sort(self):
-        """Sort the notes in the container from low to high."""
+        """Sort the notes in the container from low to high.
+
+        Call this after changing notes of the container in place, for
+        instance with Note.transpose, so the container picks up their new
+        values.
+        """
         self.notes.sort()
+        self._pitches = None
 
     def augment(self):
         """Augment all the notes in the NoteContainer."""
         for n in self.notes:
             n.augment()
+        self._pitches = None
 
     def diminish(self):
         """Diminish all the notes in the NoteContainer."""
         for n in self.notes:
             n.diminish()
+        self._pitches = None
 
     def determine(self, shorthand=False):
         """Determine the type of chord or interval currently in the
         container."""
         return chords.determine(self.get_note_names(), shorthand)
 
+    def freeze(self):
+        """Return the notes in the container as a FrozenNoteContainer."""
+        return FrozenNoteContainer(self)
+
     def transpose(self, interval, up=True):
         """Transpose all the notes in the container up or down the given
         interval."""
+        return self._transpose(intervals.transposition(interval, up))
+
+    def _transpose(self, transposition):
+        """Transpose the notes with a map from intervals.transposition.
+
+        As every note moves the same number of semitones the notes stay
+        sorted.
+        """
         for n in self.notes:
-            n.transpose(interval, up)
+            name, octaves = transposition[n.name]
+            n.name = name
+            if octaves:
+                n.octave += octaves
+        self._pitches = None
         return self
 
     def get_note_names(self):
@@ -322,6 +501,7 @@ class NoteContainer(object):
             self.notes[item] = n
         else:
             self.notes[item] = value
+        self._pitches = None
         return self.notes
 
     def __add__(self, notes):
@@ -350,10 +530,137 @@ class NoteContainer(object):
         """Return the number of notes in the container."""
         return len(self.notes)
 
+    def __contains__(self, note):
+        """Enable the 'in' operator for Notes on NoteContainers."""
+        if hasattr(note, 'name'):
+            self._pitch_cache()
+            return int(note) in self._pitch_set
+        return note in self.notes
+
     def __eq__(self, other):
         """Enable the '==' operator for NoteContainer instances."""
+        if type(other) is FrozenNoteContainer:
+            return NotImplemented
+        pitches = set(int(x) for x in other)
         for x in self:
-            if x not in other:
+            if int(x) not in pitches:
                 return False
         return True
 
+
+
+class FrozenNoteContainer(object):
+
+    """An immutable and hashable container for notes.
+
+    A FrozenNoteContainer holds the names and octaves of the notes of a
+    NoteContainer, sorted from low to high, and the tuple of their integer
+    values in pitches. It can be used as a dictionary key: containers with
+    equal pitches are equal and hash the same. The velocity, channel and
+    dynamics of the notes are not kept.
+
+    Containers are interned, so freezing the same notes twice returns the
+    same object, and results like determine() are only computed once for
+    every voicing.
+
+    Example:
+    >>> FrozenNoteContainer(['C', 'E', 'G']) is NoteContainer(['C', 'E',
+    ... 'G']).freeze()
+    True
+    >>> FrozenNoteContainer(['C', 'E', 'G']).pitches
+    (48, 52, 55)
+    """
+
+    __slots__ = ('_key', 'pitches', '_hash', '_chords', '__weakref__')
+
+    def __new__(cls, notes=[]):
+        if type(notes) is cls:
+            return notes
+        if type(notes) is not NoteContainer:
+            notes = NoteContainer(notes)
+        notes = sorted(notes.notes)
+        key = tuple([(n.name, n.octave) for n in notes])
+        res = _frozen_note_containers.get(key)
+        if res is None:
+            res = object.__new__(cls)
+            res._key = key
+            res.pitches = tuple([int(n) for n in notes])
+            res._hash = hash(res.pitches)
+            res._chords = {}
+            _frozen_note_containers[key] = res
+        return res
+
+    @property
+    def notes(self):
+        """A new list with the notes as Note objects."""
+        return [Note(name, octave) for name, octave in self._key]
+
+    def thaw(self):
+        """Return the notes as a new NoteContainer."""
+        res = NoteContainer()
+        res.notes = self.notes
+        return res
+
+    def get_note_names(self):
+        """Return a list with all the note names in the container.
+
+        Every name will only be mentioned once.
+        """
+        res = []
+        for name, octave in self._key:
+            if name not in res:
+                res.append(name)
+        return res
+
+    def determine(self, shorthand=False):
+        """Determine the type of chord or interval in the container.
+
+        The result is stored on the container, which is shared by every
+        caller freezing the same notes.
+        """
+        try:
+            return list(self._chords[shorthand])
+        except KeyError:
+            pass
+        res = chords.determine(self.get_note_names(), shorthand)
+        self._chords[shorthand] = tuple(res)
+        return res
+
+    def __reduce__(self):
+        return (FrozenNoteContainer, (self.notes,))
+
+    def __repr__(self):
+        """Return a string representing the container."""
+        return str(self.notes)
+
+    def __getitem__(self, item):
+        """Return a new Note for the note at item."""
+        name, octave = self._key[item]
+        return Note(name, octave)
+
+    def __iter__(self):
+        for name, octave in self._key:
+            yield Note(name, octave)
+
+    def __len__(self):
+        """Return the number of notes in the container."""
+        return len(self._key)
+
+    def __contains__(self, note):
+        """Enable the 'in' operator for Notes."""
+        return int(note) in self.pitches
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        """Compare the pitches with those of another FrozenNoteContainer or
+        NoteContainer."""
+        if type(other) is FrozenNoteContainer:
+            return self.pitches == other.pitches
+        if isinstance(other, NoteContainer):
+            return self.pitches == tuple(sorted(int(x) for x in other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        return not self == other
@@ -17,9 +17,13 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from bisect import bisect_left, bisect_right
+import copy
+
 from .mt_exceptions import InstrumentRangeError
 from mingus3.containers.note_container import NoteContainer, UnexpectedObjectError
-from mingus3.containers.bar import Bar
+from mingus3.containers.bar import Bar, _beat_fraction
+from mingus3.core import intervals
 import mingus3.core.value as value
 
 
@@ -33,19 +37,68 @@ class Track(object):
     optional.
 
     Tracks can be stored together in Compositions.
+
+    The time based lookups bar_at, notes_at and notes_between use an index
+    that is built on first use and thrown away whenever the Track changes
+    a Bar or hands one out through '[]' or iteration, so it is rebuilt
+    after any change made that way.
+
+    Tracks made with fork share their Bars until one of them hands out a
+    Bar for changing, which then gets its own copy first. The methods of
+    the Track, the '[]' notation and iterating over the Track take care of
+    this; Bars reached through the bars attribute may be shared and should
+    only be read.
     """
 
     bars = []
     instrument = None
     name = 'Untitled'  # Will be looked for when saving a MIDI file.
     tuning = None  # Used by tablature
+    _index = None
+    _shared = ()  # Whether the Bar at each index is shared with a fork
 
     def __init__(self, instrument=None):
         self.bars = []
         self.instrument = instrument
+        self._shared = []
+
+    def fork(self):
+        """Return a copy of the Track sharing its Bars with this one.
+
+        A shared Bar is only copied when either Track changes it or hands
+        it out through '[]' or iteration, so forks are cheap to make and
+        only take memory for the Bars that differ. The instrument and
+        tuning are shared as well.
+
+        Example:
+        >>> variant = track.fork()
+        >>> variant[3].transpose('5')
+        """
+        res = copy.copy(self)
+        res.bars = list(self.bars)
+        res._index = None
+        self._shared = [True] * len(self.bars)
+        res._shared = [True] * len(self.bars)
+        return res
+
+    def _own(self, index):
+        """Return the Bar at index, replacing it by a copy first when it is
+        shared with a fork.
+
+        The Bar is about to change, so the time index is thrown away.
+        """
+        self._index = None
+        bar = self.bars[index]
+        if index < 0:
+            index += len(self.bars)
+        if index < len(self._shared) and self._shared[index]:
+            self._shared[index] = False
+            bar = self.bars[index] = copy.deepcopy(bar)
+        return bar
 
     def add_bar(self, bar):
         """Add a Bar to the current track."""
+        self._index = None
         self.bars.append(bar)
         return self
 
@@ -77,7 +130,7 @@ class Track(object):
             self.bars.append(Bar(last_bar.key, last_bar.meter))
             # warning should hold note if it doesn't fit
 
-        return self.bars[-1].place_notes(note, duration)
+        return self._own(-1).place_notes(note, duration)
 
     def get_notes(self):
         """Return an iterator that iterates through every bar in the this
@@ -86,6 +139,102 @@ class Track(object):
             for beat, duration, notes in bar:
                 yield beat, duration, notes
 
+    def reset_index(self):
+        """Throw away the time index, so it gets rebuilt on the next lookup.
+
+        Only needed after changing a Bar reached through the bars
+        attribute.
+        """
+        self._index = None
+
+    def _time_index(self):
+        """Return the time index of the Track.
+
+        The index is a tuple holding a key to check whether the Track
+        changed, the bars list, the start of every Bar followed by the end
+        of the last one, and the onsets, the ends, the running maximum of
+        the ends and the (onset, duration, notes) tuples of all the entries
+        that are not rests. Times are Fractions of a whole note.
+        """
+        last = self.bars[-1] if self.bars else None
+        key = (id(self.bars), len(self.bars), id(last),
+               len(last.bar) if last is not None else 0)
+        if self._index is not None and self._index[0] == key:
+            return self._index
+        starts = [0]
+        onsets = []
+        ends = []
+        max_ends = []
+        entries = []
+        for bar in self.bars:
+            start = starts[-1]
+            for onset, (beat, duration, notes) in zip(bar._onsets, bar.bar):
+                if notes is None:
+                    continue
+                onset += start
+                end = onset + value.to_fraction(duration)
+                onsets.append(onset)
+                ends.append(end)
+                max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+                entries.append((float(onset), duration, notes))
+            starts.append(start + (bar._length or bar._current_beat))
+        self._index = (key, self.bars, starts, onsets, ends, max_ends,
+                       entries)
+        return self._index
+
+    def bar_at(self, time):
+        """Return the index of the Bar playing at time, or None when the
+        time lies outside of the Track.
+
+        Times are measured in whole notes from the start of the first Bar,
+        like the beats in a Bar.
+        """
+        starts = self._time_index()[2]
+        time = _beat_fraction(time)
+        i = bisect_right(starts, time) - 1
+        if i < 0 or i >= len(self.bars):
+            return None
+        return i
+
+    def notes_at(self, time):
+        """Return a list of (onset, duration, NoteContainer) tuples for the
+        notes sounding at time.
+
+        Example:
+        >>> t = Track()
+        >>> t + 'C'
+        >>> t + 'E'
+        >>> t.notes_at(0.3)
+        [(0.25, 4, ['E-4'])]
+        """
+        time = _beat_fraction(time)
+        return self._entries_between(time, time, bisect_right)
+
+    def notes_between(self, start, end):
+        """Return a list of (onset, duration, NoteContainer) tuples for the
+        notes sounding somewhere in the range [start, end), sorted on their
+        onsets."""
+        return self._entries_between(_beat_fraction(start),
+                                     _beat_fraction(end), bisect_left)
+
+    def _entries_between(self, start, end, bisect):
+        """Return the entries that start before end, as found by bisect, and
+        end after start.
+
+        Walks back from the last entry starting before end and stops as soon
+        as none of the earlier entries can still be sounding.
+        """
+        (key, bars, starts, onsets, ends, max_ends,
+         entries) = self._time_index()
+        res = []
+        i = bisect(onsets, end) - 1
+        while i >= 0 and max_ends[i] > start:
+            if ends[i] > start:
+                res.append(entries[i])
+            i -= 1
+        res.reverse()
+        return res
+
     #  Todo: check mingus3.extra.tunings
     def from_chords(self, chords, duration=1):
         """Add chords to the Track.
@@ -151,22 +300,26 @@ class Track(object):
     def transpose(self, interval, up=True):
         """Transpose all the notes in the track up or down the interval.
 
-        Call transpose() on every Bar.
+        The interval is only parsed once for all the Bars.
         """
-        for bar in self.bars:
-            bar.transpose(interval, up)
+        return self._transpose(intervals.transposition(interval, up))
+
+    def _transpose(self, transposition):
+        """Transpose the notes with a map from intervals.transposition."""
+        for i in range(len(self.bars)):
+            self._own(i)._transpose(transposition)
         return self
 
     def augment(self):
         """Augment all the bars in the Track."""
-        for bar in self.bars:
-            bar.augment()
+        for i in range(len(self.bars)):
+            self._own(i).augment()
         return self
 
     def diminish(self):
         """Diminish all the bars in the Track."""
-        for bar in self.bars:
-            bar.diminish()
+        for i in range(len(self.bars)):
+            self._own(i).diminish()
         return self
 
     def __add__(self, value):
@@ -197,8 +350,18 @@ class Track(object):
         return True
 
     def __getitem__(self, index):
-        """Enable the '[]' notation for Tracks."""
-        return self.bars[index]
+        """Enable the '[]' notation for Tracks.
+
+        Bars shared with a fork are copied first, so they can be changed.
+        """
+        if type(index) is slice:
+            return [self._own(i) for i in range(*index.indices(len(self)))]
+        return self._own(index)
+
+    def __iter__(self):
+        """Iterate over the Bars, copying the ones shared with a fork."""
+        for i in range(len(self.bars)):
+            yield self._own(i)
 
     def __setitem__(self, index, value):
         """Enable the '[] =' notation for Tracks.
@@ -212,6 +375,11 @@ class Track(object):
                 "mingus.containers.Barobject" % value
             )
         self.bars[index] = value
+        if index < 0:
+            index += len(self.bars)
+        if index < len(self._shared):
+            self._shared[index] = False
+        self._index = None
 
     def __repr__(self):
         """Return a string representing the class."""
@@ -93,9 +93,13 @@ Get Chords by Function
 Useful Functions
  * determine - Can recognize all the chords that can be generated with \
 from_shorthand (a lot) and their inversions.
+ * determine_many - Names the chords in the rows of a NumPy array of pitch \
+class bitmasks or MIDI numbers.
  * from_shorthand - Generates chords from shorthand (eg. 'Cmin7')
 """
 
+from functools import lru_cache
+
 from . import intervals
 from . import keys
 from . import notes
@@ -106,6 +110,12 @@ _triads_cache = {}
 # A cache for composed sevenths
 _sevenths_cache = {}
 
+# Chords built from shorthand, keyed on (root, quality)
+_chord_table = {}
+
+# Chord names for every pitch class bitmask, see determine_many()
+_pitch_class_cache = {}
+
 chord_shorthand_meaning = {  # Triads Augmented chords Suspended chords Sevenths
     # Sixths Ninths Elevenths Thirteenths Altered
     # Chords Special
@@ -831,7 +841,6 @@ def from_shorthand(shorthand_string, slash=None):
 
     Special: '5', 'NC', 'hendrix'
     """
-    # warning reduce??
     if type(shorthand_string) == list:
         res = []
         for x in shorthand_string:
@@ -840,6 +849,40 @@ def from_shorthand(shorthand_string, slash=None):
     if shorthand_string in ['NC', 'N.C.']:
         return []
 
+    root_note, chord_quality, bass, poly = _parse_shorthand(shorthand_string)
+    if poly is not None:
+        slash = from_shorthand(poly)
+    if bass is not None:
+        slash = bass
+
+    res = _chord_from_table(root_note, chord_quality)
+    if slash:
+        # Add slashed chords
+        if type(slash) is str:
+            if notes.is_valid_note(slash):
+                res = [slash] + res
+            else:
+                raise NoteFormatError(
+                    "Unrecognised note '%s' in slash chord'%s'"
+                    % (slash, slash + root_note + chord_quality)
+                )
+
+        # Add polychords
+        elif type(slash) is list:
+            if slash[-1] == res[0]:
+                slash.pop()
+            res = slash + res
+    return res
+
+
+@lru_cache(maxsize=4096)
+def _parse_shorthand(shorthand_string):
+    """Split a chord shorthand into a (root, quality, slash, poly) tuple.
+
+    The slash is the bass note of a slashed chord and poly the shorthand of
+    the lower chord of a polychord; both are None when absent. The results
+    are cached, so every shorthand string only gets parsed once.
+    """
     # Shrink shorthand_string to a format recognised by chord_shorthand
     shorthand_string = shorthand_string.replace('min', 'm')
     shorthand_string = shorthand_string.replace('mi', 'm')
@@ -868,42 +911,53 @@ def from_shorthand(shorthand_string, slash=None):
         if n == '/':
             slash_index = i
         elif n == '|':
-            # Process polychord
-            lower_chord = from_shorthand(shorthand_string[after_rt + i+1:])
-            upper_chord = shorthand_string[:after_rt + i]
-            return from_shorthand(upper_chord, slash=lower_chord)
+            # Process polychord, the bass of a slashed upper chord wins
+            root_note, chord_quality, bass, _ = _parse_shorthand(
+                shorthand_string[:after_rt + i])
+            return (root_note, chord_quality, bass,
+                    shorthand_string[after_rt + i + 1:])
 
-    # Process slash chord
+    # Process slash chord, the innermost slash wins
     slash_count = rest_of_string.count('/')
     quality_with_slash_count = sum(rest_of_string.count(q)
                                    for q in ('m/M7', '6/9', '6/7'))
     if slash_index != -1 and slash_count > quality_with_slash_count:
         upper_chord, bass = shorthand_string.rsplit('/', 1)
-        return from_shorthand(upper_chord, slash=bass)
+        root_note, chord_quality, inner_bass, poly = _parse_shorthand(
+            upper_chord)
+        if inner_bass is not None:
+            bass = inner_bass
+        return (root_note, chord_quality, bass, poly)
 
     chord_quality = shorthand_string[after_rt:]
-    if chord_quality in chord_shorthand:
-        res = chord_shorthand[chord_quality](root_note)
-        if slash:
-            # Add slashed chords
-            if type(slash) is str:
-                if notes.is_valid_note(slash):
-                    res = [slash] + res
-                else:
-                    raise NoteFormatError(
-                        "Unrecognised note '%s' in slash chord'%s'"
-                        % (slash, slash + shorthand_string)
-                    )
-
-            # Add polychords
-            elif type(slash) is list:
-                if slash[-1] == res[0]:
-                    slash.pop()
-                res = slash + res
-
-        return res
-    else:
+    if chord_quality not in chord_shorthand:
         raise FormatError('Unknown shorthand: %s' % shorthand_string)
+    return (root_note, chord_quality, None, None)
+
+
+def _build_chord_table():
+    """Fill _chord_table with the chords on every natural, sharp and flat
+    root for all the qualities in chord_shorthand."""
+    for letter in keys.base_scale:
+        for root in (letter, letter + '#', letter + 'b'):
+            for quality, func in chord_shorthand.items():
+                _chord_table[(root, quality)] = tuple(func(root))
+
+
+@lru_cache(maxsize=1024)
+def _exotic_chord(root_note, chord_quality):
+    """Build the chord for roots that are not in _chord_table (eg. 'Cbb')."""
+    return tuple(chord_shorthand[chord_quality](root_note))
+
+
+def _chord_from_table(root_note, chord_quality):
+    """Return a new list with the notes of the chord_quality on root_note."""
+    if not _chord_table:
+        _build_chord_table()
+    try:
+        return list(_chord_table[(root_note, chord_quality)])
+    except KeyError:
+        return list(_exotic_chord(root_note, chord_quality))
 
 
 def determine(chord, shorthand=False, no_inversions=False, no_polychords=False):
@@ -956,61 +1010,7 @@ def determine_triad(triad, shorthand=False, no_inversions=False,
     if len(triad) != 3:
         # warning: raise exception: not a triad
         return False
-
-    def inversion_exhauster(triad, shorthand, tries, result):
-        """Run tries every inversion and save the result."""
-        intval1 = intervals.determine(triad[0], triad[1], True)
-        intval2 = intervals.determine(triad[0], triad[2], True)
-
-        def add_result(short):
-            result.append((short, tries, triad[0]))
-
-        intval = intval1 + intval2
-        if intval == '25':
-            add_result('sus2')
-        elif intval == '3b7':
-            add_result('dom7')  # changed from just '7'
-        elif intval == '3b5':
-            add_result('7b5')  # why not b5?
-        elif intval == '35':
-            add_result('M')
-        elif intval == '3#5':
-            add_result('aug')
-        elif intval == '36':
-            add_result('M6')
-        elif intval == '37':
-            add_result('M7')
-        elif intval == 'b3b5':
-            add_result('dim')
-        elif intval == 'b35':
-            add_result('m')
-        elif intval == 'b36':
-            add_result('m6')
-        elif intval == 'b3b7':
-            add_result('m7')
-        elif intval == 'b37':
-            add_result('m/M7')
-        elif intval == '45':
-            add_result('sus4')
-        elif intval == '5b7':
-            add_result('m7')
-        elif intval == '57':
-            add_result('M7')
-        if tries != 3 and not no_inversions:
-            return inversion_exhauster([triad[-1]] + triad[:-1], shorthand,
-                                       tries + 1, result)
-        else:
-            res = []
-            for r in result:
-                qual, trls, root = r
-                if shorthand:
-                    res.append(root + qual)
-                else:
-                    res.append(root + chord_shorthand_meaning[qual] +
-                               inv_desc(trls))
-            return res
-
-    return inversion_exhauster(triad, shorthand, 1, [])
+    return _determine_inversions(triad, shorthand, 1 if no_inversions else 3)
 
 
 def determine_seventh(seventh, shorthand=False, no_inversion=False,
@@ -1030,83 +1030,11 @@ def determine_seventh(seventh, shorthand=False, no_inversion=False,
     if len(seventh) != 4:
         # warning raise exception: seventh chord is not a seventh chord
         return False
-
-    def inversion_exhauster(seventh, shorthand, tries, result, polychords):
-        """Determine sevenths recursive functions."""
-        # Check whether the first three notes of seventh are part of some triad.
-        triads = determine_triad(seventh[:3], True, True)
-
-        # Get the interval between the first and last note
-        intval3 = intervals.determine(seventh[0], seventh[3])
-
-        def add_result(short, poly=False):
-            """Helper function."""
-            result.append((short, tries, seventh[0], poly))
-
-        # Recognizing polychords
-        if tries == 1 and not no_polychords:
-            polychords = polychords + determine_polychords(seventh, shorthand)
-
-        # Recognizing sevenths
-        for triad in triads:
-            # Basic triads
-            triad = triad[len(seventh[0]):]
-            if triad == 'm':
-                if intval3 == 'minor seventh':
-                    add_result('m7')
-                elif intval3 == 'major seventh':
-                    add_result('m/M7')
-                elif intval3 == 'major sixth':
-                    add_result('m6')
-            elif triad == 'M':
-                if intval3 == 'major seventh':
-                    add_result('M7')
-                elif intval3 == 'minor seventh':
-                    add_result('7')
-                elif intval3 == 'major sixth':
-                    add_result('M6')
-            elif triad == 'dim':
-                if intval3 == 'minor seventh':
-                    add_result('m7b5')
-                elif intval3 == 'diminished seventh':
-                    add_result('dim7')
-            elif triad == 'aug':
-                if intval3 == 'minor seventh':
-                    add_result('m7+')
-                if intval3 == 'major seventh':
-                    add_result('M7+')
-            elif triad == 'sus4':
-                if intval3 == 'minor seventh':
-                    add_result('sus47')
-                elif intval3 == 'minor second':
-                    add_result('sus4b9')
-            elif triad == 'm7':
-
-                # Other
-                if intval3 == 'perfect fourth':
-                    add_result('11')
-            elif triad == '7b5':
-                if intval3 == 'minor seventh':
-                    add_result('7b5')
-
-        if tries != 4 and not no_inversion:
-            return inversion_exhauster([seventh[-1]] + seventh[:-1], shorthand,
-                                       tries + 1, result, polychords)
-        else:
-            # Return results
-            res = []
-
-            # Reset seventh
-            seventh = [seventh[3]] + seventh[0:3]
-            for x in result:
-                if shorthand:
-                    res.append(x[2] + x[0])
-                else:
-                    res.append(x[2] + chord_shorthand_meaning[x[0]]
-                               + inv_desc(x[1]))
-            return res + polychords
-
-    return inversion_exhauster(seventh, shorthand, 1, [], [])
+    polychords = []
+    if not no_polychords:
+        polychords = determine_polychords(seventh, shorthand)
+    return _determine_inversions(seventh, shorthand,
+                                 1 if no_inversion else 4) + polychords
 
 
 def determine_extended_chord5(chord, shorthand=False, no_inversions=False,
@@ -1115,63 +1043,11 @@ def determine_extended_chord5(chord, shorthand=False, no_inversions=False,
     if len(chord) != 5:
         # warning raise exeption: not an extended chord
         return False
-
-    def inversion_exhauster(chord, shorthand, tries, result, polychords):
-        """Recursive helper function."""
-
-        def add_result(short):
-            result.append((short, tries, chord[0]))
-
-        triads = determine_triad(chord[:3], True, True)
-        sevenths = determine_seventh(chord[:4], True, True, True)
-
-        # Determine polychords
-        if tries == 1 and not no_polychords:
-            polychords += determine_polychords(chord, shorthand)
-
-        intval4 = intervals.determine(chord[0], chord[4])
-        for seventh in sevenths:
-            seventh = seventh[len(chord[0]):]
-            if seventh == 'M7':
-                if intval4 == 'major second':
-                    add_result('M9')
-            elif seventh == 'm7':
-                if intval4 == 'major second':
-                    add_result('m9')
-                elif intval4 == 'perfect fourth':
-                    add_result('m11')
-            elif seventh == '7':
-                if intval4 == 'major second':
-                    add_result('9')
-                elif intval4 == 'minor second':
-                    add_result('7b9')
-                elif intval4 == 'augmented second':
-                    add_result('7#9')
-                elif intval4 == 'minor third':
-                    add_result('7b12')
-                elif intval4 == 'augmented fourth':
-                    add_result('7#11')
-                elif intval4 == 'major sixth':
-                    add_result('13')
-            elif seventh == 'M6':
-                if intval4 == 'major second':
-                    add_result('6/9')
-                elif intval4 == 'minor seventh':
-                    add_result('6/7')
-        if tries != 5 and not no_inversions:
-            return inversion_exhauster([chord[-1]] + chord[:-1], shorthand,
-                                       tries + 1, result, polychords)
-        else:
-            res = []
-            for r in result:
-                if shorthand:
-                    res.append(r[2] + r[0])
-                else:
-                    res.append(r[2] + chord_shorthand_meaning[r[0]]
-                               + inv_desc(r[1]))
-            return res + polychords
-
-    return inversion_exhauster(chord, shorthand, 1, [], [])
+    polychords = []
+    if not no_polychords:
+        polychords = determine_polychords(chord, shorthand)
+    return _determine_inversions(chord, shorthand,
+                                 1 if no_inversions else 5) + polychords
 
 
 def determine_extended_chord6(chord, shorthand=False, no_inversions=False,
@@ -1180,58 +1056,11 @@ def determine_extended_chord6(chord, shorthand=False, no_inversions=False,
     if len(chord) != 6:
         # warning raise exeption: not an extended chord
         return False
-
-    def inversion_exhauster(
-            chord,
-            shorthand,
-            tries,
-            result,
-            polychords,
-    ):
-        """Recursive helper function"""
-
-        # Determine polychords
-        if tries == 1 and not no_polychords:
-            polychords += determine_polychords(chord, shorthand)
-
-        def add_result(short):
-            result.append((short, tries, chord[0]))
-
-        ch = determine_extended_chord5(chord[:5], True, True, True)
-        intval5 = intervals.determine(chord[0], chord[5])
-        for c in ch:
-            c = c[len(chord[0]):]
-            if c == '9':
-                if intval5 == 'perfect fourth':
-                    add_result('11')
-                elif intval5 == 'augmented fourth':
-                    add_result('7#11')
-                elif intval5 == 'major sixth':
-                    add_result('13')
-            elif c == 'm9':
-                if intval5 == 'perfect fourth':
-                    add_result('m11')
-                elif intval5 == 'major sixth':
-                    add_result('m13')
-            elif c == 'M9':
-                if intval5 == 'perfect fourth':
-                    add_result('M11')
-                elif intval5 == 'major sixth':
-                    add_result('M13')
-        if tries != 6 and not no_inversions:
-            return inversion_exhauster([chord[-1]] + chord[:-1], shorthand,
-                                       tries + 1, result, polychords)
-        else:
-            res = []
-            for r in result:
-                if shorthand:
-                    res.append(r[2] + r[0])
-                else:
-                    res.append(r[2] + chord_shorthand_meaning[r[0]] +
-                               inv_desc(r[1]))
-            return res + polychords
-
-    return inversion_exhauster(chord, shorthand, 1, [], [])
+    polychords = []
+    if not no_polychords:
+        polychords = determine_polychords(chord, shorthand)
+    return _determine_inversions(chord, shorthand,
+                                 1 if no_inversions else 6) + polychords
 
 
 def determine_extended_chord7(chord, shorthand=False, no_inversions=False,
@@ -1240,43 +1069,39 @@ def determine_extended_chord7(chord, shorthand=False, no_inversions=False,
     if len(chord) != 7:
         # warning raise exeption: not an extended chord
         return False
+    polychords = []
+    if not no_polychords:
+        polychords = determine_polychords(chord, shorthand)
+    return _determine_inversions(chord, shorthand, 6) + polychords
 
-    def inversion_exhauster(chord, shorthand, tries, result, polychords):
-        """Recursive helper function."""
-        # Determine polychords
-        if tries == 1 and not no_polychords:
-            polychords += determine_polychords(chord, shorthand)
-
-        def add_result(short):
-            result.append((short, tries, chord[0]))
-
-        ch = determine_extended_chord6(chord[:6], True, True, True)
-        intval6 = intervals.determine(chord[0], chord[6])
-        for c in ch:
-            c = c[len(chord[0]):]
-            if c == '11':
-                if intval6 == 'major sixth':
-                    add_result('13')
-            elif c == 'm11':
-                if intval6 == 'major sixth':
-                    add_result('m13')
-            elif c == 'M11':
-                if intval6 == 'major sixth':
-                    add_result('M13')
-        if tries != 6:
-            return inversion_exhauster([chord[-1]] + chord[:-1], shorthand,
-                                       tries + 1, result, polychords)
-        else:
-            res = []
-            for r in result:
-                if shorthand:
-                    res.append(r[2] + r[0])
-                else:
-                    res.append(r[2] + chord_shorthand_meaning[r[0]]
-                               + inv_desc(r[1]))
-            return res + polychords
 
-    return inversion_exhauster(chord, shorthand, 1, [], [])
+@lru_cache(maxsize=4096)
+def _interval_shorthand(note1, note2):
+    """Cached intervals.determine(note1, note2, True)."""
+    return intervals.determine(note1, note2, True)
+
+
+def _determine_inversions(chord, shorthand, inversions):
+    """Look up the first inversions of chord in _chord_index.
+
+    Every inversion is reduced to a fingerprint: the tuple of interval
+    shorthands between its root and the other notes. Return the names found
+    in the same format as the determine_* functions.
+    """
+    chord = list(chord)
+    res = []
+    for tries in range(1, inversions + 1):
+        root = chord[0]
+        quality = _chord_index.get(
+            tuple([_interval_shorthand(root, n) for n in chord[1:]]))
+        if quality is not None:
+            if shorthand:
+                res.append(root + quality)
+            else:
+                res.append(root + chord_shorthand_meaning[quality] +
+                           inv_desc(tries))
+        chord = [chord[-1]] + chord[:-1]
+    return res
 
 
 def inv_desc(tries):
@@ -1328,6 +1153,72 @@ def determine_polychords(chord, shorthand=False):
     return polychords
 
 
+def determine_many(chords, shorthand=False, accidentals='#',
+                   bitmasks=False):
+    """Name the chords in every row of a NumPy array at once.
+
+    The array holds MIDI note numbers with one chord per row; negative
+    numbers can be used to pad the rows. When bitmasks is True it holds
+    pitch class bitmasks instead and should be an (N, 12) array of booleans
+    or zeros and ones.
+
+    The pitch classes of every row are matched against those of every chord
+    in chord_shorthand on all twelve roots. Spelling and voicing are lost,
+    so roots are named with int_to_note and inversions are not reported.
+    Return a list with a list of names for every row.
+
+    Example:
+    >>> determine_many([[60, 64, 67, -1], [57, 60, 64, 67]], True)
+    [['CM'], ['Am7', 'CM6']]
+    """
+    import numpy
+    chords = numpy.asarray(chords)
+    if chords.ndim == 1 and len(chords):
+        chords = chords.reshape(1, -1)
+    if not len(chords):
+        return []
+    if bitmasks:
+        masks = chords.astype(numpy.int64).dot(1 << numpy.arange(12))
+    else:
+        chords = chords.astype(numpy.int64)
+        masks = numpy.bitwise_or.reduce(numpy.where(chords >= 0,
+                                        1 << chords % 12, 0), axis=1)
+    table = _pitch_class_table(shorthand, accidentals)
+    return [list(table[m]) for m in masks.tolist()]
+
+
+def _pitch_class_table(shorthand, accidentals):
+    """Return a list with the chord names for each of the 4096 pitch class
+    bitmasks, matching them against a template matrix built from
+    chord_shorthand."""
+    import numpy
+    if (shorthand, accidentals) in _pitch_class_cache:
+        return _pitch_class_cache[(shorthand, accidentals)]
+    templates = []
+    names = []
+    seen = set()
+    for quality in chord_shorthand:
+        pitch_classes = set(notes.note_to_int(n)
+                            for n in from_shorthand('C' + quality))
+        for root in range(12):
+            mask = sum(1 << (pc + root) % 12 for pc in pitch_classes)
+            # Skip aliases such as 'M' and '' or '7' and 'dom7'
+            if (mask, root) in seen:
+                continue
+            seen.add((mask, root))
+            templates.append(mask)
+            root_name = notes.int_to_note(root, accidentals)
+            if shorthand:
+                names.append(root_name + quality)
+            else:
+                names.append(root_name + chord_shorthand_meaning[quality])
+    matches = numpy.arange(4096)[:, numpy.newaxis] == numpy.array(templates)
+    table = [tuple(names[i] for i in numpy.flatnonzero(row))
+             for row in matches]
+    _pitch_class_cache[(shorthand, accidentals)] = table
+    return table
+
+
 # A dictionairy that can be used to present chord abbreviations. This
 # dictionairy is also used in from_shorthand()
 chord_shorthand = {  # Triads Augmented chords Suspended chords Sevenths Sixths
@@ -1380,3 +1271,87 @@ chord_shorthand = {  # Triads Augmented chords Suspended chords Sevenths Sixths
     '7b12': dominant_sharp_ninth,
     '5': lambda x: [x, intervals.perfect_fifth(x)]
 }
+
+
+# The chords determine() recognises. Triads are named by the intervals
+# between their root and the other two notes, bigger chords by the name of
+# the chord on their first notes and the interval to the last one.
+_triad_rules = {
+    ('2', '5'): 'sus2',
+    ('3', 'b7'): 'dom7',
+    ('3', 'b5'): '7b5',
+    ('3', '5'): 'M',
+    ('3', '#5'): 'aug',
+    ('3', '6'): 'M6',
+    ('3', '7'): 'M7',
+    ('b3', 'b5'): 'dim',
+    ('b3', '5'): 'm',
+    ('b3', '6'): 'm6',
+    ('b3', 'b7'): 'm7',
+    ('b3', '7'): 'm/M7',
+    ('4', '5'): 'sus4',
+    ('5', 'b7'): 'm7',
+    ('5', '7'): 'M7',
+}
+_extended_rules = {
+    # Sevenths
+    ('m', 'b7'): 'm7',
+    ('m', '7'): 'm/M7',
+    ('m', '6'): 'm6',
+    ('M', '7'): 'M7',
+    ('M', 'b7'): '7',
+    ('M', '6'): 'M6',
+    ('dim', 'b7'): 'm7b5',
+    ('dim', 'bb7'): 'dim7',
+    ('aug', 'b7'): 'm7+',
+    ('aug', '7'): 'M7+',
+    ('sus4', 'b7'): 'sus47',
+    ('sus4', 'b2'): 'sus4b9',
+    ('m7', '4'): '11',
+    ('7b5', 'b7'): '7b5',
+}, {
+    # Five note chords
+    ('M7', '2'): 'M9',
+    ('m7', '2'): 'm9',
+    ('m7', '4'): 'm11',
+    ('7', '2'): '9',
+    ('7', 'b2'): '7b9',
+    ('7', '#2'): '7#9',
+    ('7', 'b3'): '7b12',
+    ('7', '#4'): '7#11',
+    ('7', '6'): '13',
+    ('M6', '2'): '6/9',
+    ('M6', 'b7'): '6/7',
+}, {
+    # Six note chords
+    ('9', '4'): '11',
+    ('9', '#4'): '7#11',
+    ('9', '6'): '13',
+    ('m9', '4'): 'm11',
+    ('m9', '6'): 'm13',
+    ('M9', '4'): 'M11',
+    ('M9', '6'): 'M13',
+}, {
+    # Seven note chords
+    ('11', '6'): '13',
+    ('m11', '6'): 'm13',
+    ('M11', '6'): 'M13',
+}
+
+
+def _build_chord_index():
+    """Return a dictionary mapping interval fingerprints to chord qualities."""
+    index = dict(_triad_rules)
+    previous = _triad_rules
+    for rules in _extended_rules:
+        found = {}
+        for fingerprint, quality in previous.items():
+            for (base, interval), extended in rules.items():
+                if base == quality:
+                    found[fingerprint + (interval,)] = extended
+        index.update(found)
+        previous = found
+    return index
+
+
+_chord_index = _build_chord_index()
@@ -28,14 +28,74 @@ functions. For example: minor_third('F') returns 'Ab' while major_third('F')
 returns 'A'.
 
 This modules also contains other useful helper functions like measure,
-determine, invert, is_consonant and is_dissonant.
+determine, invert, is_consonant, is_dissonant and dissonance, and
+transposition, which returns the spelling map used to transpose many notes
+by the same interval.
 """
 
 import re
+from functools import lru_cache
 
 from . import keys
 from . import notes
 
+# Cache for the note lookup tables of get_interval
+_diatonic_note_lookup_cache = {}
+
+# The note integers of the natural notes in keys.base_scale
+_letter_ints = (0, 2, 4, 5, 7, 9, 11)
+
+# Store the properties of unaltered major scale intervals
+_pre_alt_int_lookup = {
+    1: ['unison', 'perfect', 0],  # [interval_type, harmony_quality, half_steps]
+    2: ['second', 'imperfect', 2],
+    3: ['third', 'imperfect', 4],
+    4: ['fourth', 'perfect', 5],
+    5: ['fifth', 'imperfect', 7],
+    6: ['sixth', 'imperfect', 9],
+    7: ['seventh', 'imperfect', 11],
+}
+
+# Store the interval quality modifier
+_perfect_int_modifier = {-2: ['doubly diminished', 'bb'],
+                         -1: ['diminished', 'b'],
+                         0: ['perfect', ''],
+                         1: ['augmented', '#'],
+                         2: ['doubly augmented', '##'],
+                         }
+
+_imperfect_int_modifier = {-2: ['diminished', 'bb'],
+                           -1: ['minor', 'b'],
+                           0: ['major', ''],
+                           1: ['augmented', '#'],
+                           }
+
+# The major or perfect interval, in letters and half steps, and the
+# alteration on top of it that from_shorthand uses for every degree
+# (1: up=True, 0: up=False)
+_shorthand_lookup = {
+    1: {1: (1, 0, 0), 0: (1, 0, 0)},
+    2: {1: (2, 2, 0), 0: (7, 11, -1)},
+    3: {1: (3, 4, 0), 0: (6, 9, -1)},
+    4: {1: (4, 5, 0), 0: (5, 7, 0)},
+    5: {1: (5, 7, 0), 0: (4, 5, 0)},
+    6: {1: (6, 9, 0), 0: (3, 4, -1)},
+    7: {1: (7, 11, 0), 0: (2, 2, -1)},
+}
+
+# The interval shorthand understood by parse_shorthand
+_shorthand_re = re.compile('^([b#]*)([1-9]|1[0-5])$')
+
+# Cache for the spelling maps of transposition
+_transpositions = {}
+
+# The dissonance of every interval class, see dissonance()
+_dissonance_ranks = (0, 5, 3, 1, 1, 2, 4, 0, 1, 1, 3, 5)
+
+# The dissonance of the interval between every pair of pitch classes
+_dissonance_table = tuple(tuple(_dissonance_ranks[(upper - lower) % 12]
+                          for upper in range(12)) for lower in range(12))
+
 
 def assert_valid_start_note(key, note):
     notes.assert_valid_note(note)
@@ -187,8 +247,7 @@ def minor_second(note):
 
 
 def major_second(note):
-    sec = second(note[0], 'C')
-    return augment_or_diminish_until_the_interval_is_right(note, sec, 2)
+    return _spell(*_major_interval(note, 2, 2))
 
 
 def minor_third(note):
@@ -196,8 +255,7 @@ def minor_third(note):
 
 
 def major_third(note):
-    trd = third(note[0], 'C')
-    return augment_or_diminish_until_the_interval_is_right(note, trd, 4)
+    return _spell(*_major_interval(note, 3, 4))
 
 
 def minor_fourth(note):
@@ -209,8 +267,7 @@ def major_fourth(note):
 
 
 def perfect_fourth(note):
-    frt = fourth(note[0], 'C')
-    return augment_or_diminish_until_the_interval_is_right(note, frt, 5)
+    return _spell(*_major_interval(note, 4, 5))
 
 
 def diminished_fourth(note):
@@ -230,8 +287,7 @@ def major_fifth(note):
 
 
 def perfect_fifth(note):
-    fif = fifth(note[0], 'C')
-    return augment_or_diminish_until_the_interval_is_right(note, fif, 7)
+    return _spell(*_major_interval(note, 5, 7))
 
 
 def diminished_fifth(note):
@@ -243,8 +299,7 @@ def minor_sixth(note):
 
 
 def major_sixth(note):
-    sth = sixth(note[0], 'C')
-    return augment_or_diminish_until_the_interval_is_right(note, sth, 9)
+    return _spell(*_major_interval(note, 6, 9))
 
 
 def minor_seventh(note):
@@ -252,8 +307,7 @@ def minor_seventh(note):
 
 
 def major_seventh(note):
-    sth = seventh(note[0], 'C')
-    return augment_or_diminish_until_the_interval_is_right(note, sth, 11)
+    return _spell(*_major_interval(note, 7, 11))
 
 
 def diminished_seventh(note):
@@ -272,9 +326,8 @@ def get_interval(note, half_steps, key='C', up=True):  # Todo, up/down toggle?
     if not up:
         half_steps *= -1
 
-    # Set up a diatonic note lookup table that map note_int to note name
-    diatonic_notes = keys.get_notes(key)
-    diatonic_note_lookup = {notes.note_to_int(dn): dn for dn in diatonic_notes}
+    # Get the diatonic note lookup table that maps note_int to note name
+    diatonic_note_lookup = _diatonic_note_lookup(key)
 
     # Calculate note_ints
     starting_note_int = notes.note_to_int(note)
@@ -290,6 +343,45 @@ def get_interval(note, half_steps, key='C', up=True):  # Todo, up/down toggle?
     return res
 
 
+def _diatonic_note_lookup(key):
+    """Return a cached dictionary mapping note_ints to the notes in key."""
+    try:
+        return _diatonic_note_lookup_cache[key]
+    except KeyError:
+        pass
+    res = {notes.note_to_int(dn): dn for dn in keys.get_notes(key)}
+    _diatonic_note_lookup_cache[key] = res
+    return res
+
+
+@lru_cache(maxsize=4096)
+def _major_interval(note, degree, half_steps):
+    """Return the (letter, alteration) of the note degree letters above note
+    that lies half_steps semitones higher.
+
+    This is the closed form of augment_or_diminish_until_the_interval_is_right
+    applied to the natural note on that letter, so the spellings are exactly
+    the same; alterations of more than 6 accidentals get flipped around.
+    """
+    letter, alteration = notes.spelled_pitch(note)
+    target = (letter + degree - 1) % 7
+    cur = (notes.note_to_int(keys.base_scale[target]) -
+           notes.note_to_int(keys.base_scale[letter]) - alteration) % 12
+    res = half_steps - cur
+    if res > 6:
+        res -= 12
+    elif res < -6:
+        res += 12
+    return target, res
+
+
+def _spell(letter, alteration):
+    """Return the note name for the given letter index and alteration."""
+    if alteration > 0:
+        return keys.base_scale[letter] + '#' * alteration
+    return keys.base_scale[letter] + 'b' * -alteration
+
+
 def measure(note1, note2):
     """Return an integer in the range of 0-11, determining the half note steps
     between note1 and note2.
@@ -361,78 +453,85 @@ def determine(note1, note2, shorthand=False, up=True):
     >>> determine('C', 'F')
     'perfect fourth'
     """
-    # Check notes are valid
-    notes.assert_valid_note(note1)
-    notes.assert_valid_note(note2)
-
-    # Store the properties of unaltered major scale intervals
-    pre_alt_int_lookup = {
-        1: ['unison', 'perfect', 0],  # [interval_type, harmony_quality, half_steps]
-        2: ['second', 'imperfect', 2],
-        3: ['third', 'imperfect', 4],
-        4: ['fourth', 'perfect', 5],
-        5: ['fifth', 'imperfect', 7],
-        6: ['sixth', 'imperfect', 9],
-        7: ['seventh', 'imperfect', 11],
-    }
-
-    # Store the interval quality modifier
-    perfect_int_modifier = {-2: ['doubly diminished', 'bb'],
-                            -1: ['diminished', 'b'],
-                            0: ['perfect', ''],
-                            1: ['augmented', '#'],
-                            2: ['doubly augmented', '##'],
-                            }
-
-    imperfect_int_modifier = {-2: ['diminished', 'bb'],
-                              -1: ['minor', 'b'],
-                              0: ['major', ''],
-                              1: ['augmented', '#'],
-                              }
-
-    # Calculate interval type and get its unaltered properties
-    n1_int_pre_alt = keys.base_scale.index(note1[0])
-    n2_int_pre_alt = keys.base_scale.index(note2[0])
-    if up:
-        distance_pre_alt = (n2_int_pre_alt - n1_int_pre_alt) % 7 + 1
-    else:
-        distance_pre_alt = (n1_int_pre_alt - n2_int_pre_alt) % 7 + 1
-    int_type_name, hmy_qual, half_steps_pre_alt = pre_alt_int_lookup[distance_pre_alt]
+    # Get the letter indices and note integers, checking the notes are valid
+    letter1, alteration1 = notes.spelled_pitch(note1)
+    letter2, alteration2 = notes.spelled_pitch(note2)
+    n1_int = _letter_ints[letter1] + alteration1
+    n2_int = _letter_ints[letter2] + alteration2
 
-    # Calculate half steps between two notes
-    n1_int = notes.note_to_int(note1)
-    n2_int = notes.note_to_int(note2)
+    # Calculate the interval type and the half steps between the two notes
     if up:
+        distance = (letter2 - letter1) % 7 + 1
         half_steps = (n2_int - n1_int) % 12
     else:
+        distance = (letter1 - letter2) % 7 + 1
         half_steps = (n1_int - n2_int) % 12
 
-    # Determine interval quality modifier
-    half_step_diff = (half_steps - half_steps_pre_alt)
-    if half_step_diff < -6:  # minimize trailing accidentals
-        half_step_diff += 12
-    elif half_step_diff > 6:
-        half_step_diff -= 12
-
     try:
-        if hmy_qual == 'perfect':
-            mod = perfect_int_modifier[half_step_diff]
-        else:
-            mod = imperfect_int_modifier[half_step_diff]
+        name, short = _interval_names[(distance, half_steps)]
     except KeyError:
         raise KeyError('Remove impractical number of sharps and flats in the notes')
-
     if shorthand:
-        res = "".join([mod[1], str(distance_pre_alt)])
-    else:
-        res = " ".join([mod[0], int_type_name])
+        return short
+    return name
+
+
+def determine_many(pairs, shorthand=False, up=True):
+    """Name the intervals between every pair of notes in pairs.
+
+    Return a list with the same names determine() would give.
+
+    Example:
+    >>> determine_many([('C', 'E'), ('C', 'Eb')], True)
+    ['3', 'b3']
+    """
+    index = 1 if shorthand else 0
+    spelled_pitch = notes.spelled_pitch
+    res = []
+    for note1, note2 in pairs:
+        letter1, alteration1 = spelled_pitch(note1)
+        letter2, alteration2 = spelled_pitch(note2)
+        half_steps = (_letter_ints[letter2] + alteration2 -
+                      _letter_ints[letter1] - alteration1)
+        if up:
+            key = ((letter2 - letter1) % 7 + 1, half_steps % 12)
+        else:
+            key = ((letter1 - letter2) % 7 + 1, -half_steps % 12)
+        try:
+            res.append(_interval_names[key][index])
+        except KeyError:
+            raise KeyError('Remove impractical number of sharps and flats in the notes')
+    return res
+
+
+def _build_interval_names():
+    """Return a dictionary mapping (letter distance, half steps) to the long
+    and shorthand name of every nameable interval."""
+    res = {}
+    for distance, (int_type_name, hmy_qual, half_steps_pre_alt) in \
+            _pre_alt_int_lookup.items():
+        if hmy_qual == 'perfect':
+            modifiers = _perfect_int_modifier
+        else:
+            modifiers = _imperfect_int_modifier
+        for half_steps in range(12):
+            # Determine interval quality modifier
+            half_step_diff = (half_steps - half_steps_pre_alt)
+            if half_step_diff < -6:  # minimize trailing accidentals
+                half_step_diff += 12
+            elif half_step_diff > 6:
+                half_step_diff -= 12
+            if half_step_diff in modifiers:
+                mod = modifiers[half_step_diff]
+                res[(distance, half_steps)] = (
+                    " ".join([mod[0], int_type_name]),
+                    "".join([mod[1], str(distance)]))
     return res
 
 
 def parse_shorthand(shorthand):
-    r = re.compile('^([b#]*)([1-9]|1[0-5])$')
     try:
-        accidentals, _degree = r.findall(shorthand)[0]
+        accidentals, _degree = _shorthand_re.findall(shorthand)[0]
     except IndexError:
         raise ValueError('interval shorthand is not valid')
     degree = (int(_degree) - 1) % 7 + 1
@@ -455,36 +554,89 @@ def from_shorthand(note, interval, up=True):
     if not notes.is_valid_note(note):
         return False
 
+    return _from_shorthand(note, interval, up)
+
+
+@lru_cache(maxsize=4096)
+def _from_shorthand(note, interval, up):
+    """Cached implementation of from_shorthand for valid notes."""
     # Process the interval input
     accidentals, degree, _ = parse_shorthand(interval)
 
-    # Shorthand lookup dict (1: up=True, 0: up=False)
-    shorthand_lookup = {
-        1: {1: major_unison, 0: major_unison},
-        2: {1: major_second, 0: minor_seventh},
-        3: {1: major_third, 0: minor_sixth},
-        4: {1: major_fourth, 0: major_fifth},
-        5: {1: major_fifth, 0: major_fourth},
-        6: {1: major_sixth, 0: minor_third},
-        7: {1: major_seventh, 0: minor_second},
-    }
-
-    # Look up last character in interval in shorthand_lookup and call that function
+    # Look up the (degree, half steps, alteration) of the interval
     try:
-        interval_func = shorthand_lookup[degree][up]
+        interval_degree, half_steps, res = _shorthand_lookup[degree][up]
     except KeyError:
         # warning Last character in interval should be 1-7
         return False
-    res = interval_func(note)
+    if interval_degree == 1:
+        # The unison keeps the spelling of note
+        for x in accidentals:
+            if (x == '#' and up) or (x == 'b' and not up):
+                note = notes.augment(note)
+            elif (x == 'b' and up) or (x == '#' and not up):
+                note = notes.diminish(note)
+        return note
+    letter, alteration = _major_interval(note, interval_degree, half_steps)
 
     # Adjust for accidentals
     for x in accidentals:
         if (x == '#' and up) or (x == 'b' and not up):
-            res = notes.augment(res)
+            res += 1
         elif (x == 'b' and up) or (x == '#' and not up):
-            res = notes.diminish(res)
+            res -= 1
+    return _spell(letter, alteration + res)
 
-    return res
+
+class _Transposition(dict):
+
+    """A dict mapping note names to the (note name, octave change) they get
+    when transposed up or down an interval.
+
+    Names that are not in the dict yet are worked out and added when they
+    are looked up.
+    """
+
+    def __init__(self, interval, up):
+        self.interval = interval
+        self.up = up
+        self.octaves = parse_shorthand(interval)[2]
+        for letter in 'CDEFGAB':
+            for accidentals in ('bb', 'b', '', '#', '##'):
+                self[letter + accidentals]
+
+    def __missing__(self, name):
+        notes.assert_valid_note(name)
+        res = _from_shorthand(name, self.interval, self.up)
+        # Moving past B up or past C down changes the octave
+        octaves = self.octaves
+        letter = 'CDEFGAB'.index(name[0])
+        new_letter = 'CDEFGAB'.index(res[0])
+        if self.up and new_letter < letter:
+            octaves += 1
+        elif not self.up and new_letter > letter:
+            octaves -= 1
+        self[name] = (res, octaves)
+        return self[name]
+
+
+def transposition(interval, up=True):
+    """Return a dict mapping note names to the (note name, octave change)
+    they get when transposed up or down the interval.
+
+    The interval is given in the shorthand of from_shorthand and only parsed
+    once; the map is filled in for the 35 names with up to two sharps or
+    flats and learns other names when they are looked up.
+
+    Example:
+    >>> transposition('3')['A']
+    ('C#', 1)
+    """
+    try:
+        return _transpositions[interval, up]
+    except KeyError:
+        res = _transpositions[interval, up] = _Transposition(interval, up)
+        return res
 
 
 def is_consonant(note1, note2, include_fourths=True):
@@ -526,6 +678,27 @@ def is_imperfect_consonant(note1, note2):
     return measure(note1, note2) in [3, 4, 8, 9]
 
 
+def dissonance(note1, note2):
+    """Return how dissonant the interval from note1 to note2 is.
+
+    The result can be used to rank intervals:
+     0. unisons, octaves and perfect fifths
+     1. thirds and sixths
+     2. perfect fourths
+     3. major seconds and minor sevenths
+     4. tritones
+     5. minor seconds and major sevenths
+
+    Example:
+    >>> dissonance('C', 'G')
+    0
+    >>> dissonance('C', 'B')
+    5
+    """
+    return _dissonance_table[notes.note_to_int(note1)][
+            notes.note_to_int(note2)]
+
+
 def is_dissonant(note1, note2, include_fourths=False):
     """Return True if the insterval is dissonant.
 
@@ -536,3 +709,7 @@ def is_dissonant(note1, note2, include_fourths=False):
     can be changed by setting exclude_fourths to True.
     """
     return not is_consonant(note1, note2, not include_fourths)
+
+
+# The long and shorthand names of the intervals, see determine()
+_interval_names = _build_interval_names()
@@ -37,6 +37,7 @@ _note_dict = {
     'A': 9,
     'B': 11
 }
+_letter_ints = (0, 2, 4, 5, 7, 9, 11)  # 'C' to 'B'
 fifths = ('F', 'C', 'G', 'D', 'A', 'E', 'B')
 ns = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')  # sharp
 nf = ('C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab', 'A', 'Bb', 'B')  # flat
@@ -60,6 +61,10 @@ _keys = (
 )
 _major_keys, _minor_keys = tuple(zip(*_keys))
 
+# Interned (letter, alteration) tuples for every note seen by spelled_pitch
+_spelled_pitches = {}
+_max_spelled_pitches = 4096
+
 def int_to_note(note_int, accidentals='#'):
     """Convert integers in the range of 0-11 to notes in the form of C or C#
     or Db.
@@ -93,6 +98,8 @@ def is_enharmonic(note1, note2):
 
 def is_valid_note(note):
     """Return True if note is in a recognised format. False if not."""
+    if note in _spelled_pitches:
+        return True
     letter, accidentals = note[0], note[1:]
     if letter not in _note_dict:
         return False
@@ -107,21 +114,50 @@ def assert_valid_note(note):
         raise NoteFormatError("Unknown note format '%s'" % note)
 
 
+def spelled_pitch(note):
+    """Return the note as a (letter, alteration) tuple of integers.
+
+    The letter is the index of the natural note in 'CDEFGAB', the alteration
+    the number of sharps minus the number of flats. Results are interned, so
+    every spelling is only parsed once.
+
+    Examples:
+    >>> spelled_pitch('C')
+    (0, 0)
+    >>> spelled_pitch('Bbb')
+    (6, -2)
+    """
+    try:
+        return _spelled_pitches[note]
+    except KeyError:
+        pass
+    assert_valid_note(note)
+    res = ('CDEFGAB'.index(note[0]), note.count('#') - note.count('b'))
+    if len(_spelled_pitches) < _max_spelled_pitches:
+        _spelled_pitches[note] = res
+    return res
+
+
 def note_to_int(note):
     """Convert notes in the form of C, C#, Cb, C##, etc. to an integer in the
     range of 0-11.
     """
-    # Check if input is valid
-    assert_valid_note(note)
+    letter, alteration = spelled_pitch(note)
+    return (_letter_ints[letter] + alteration) % 12
 
-    # Check for '#' and 'b' postfixes
-    val = _note_dict[note[0]]
-    for post in note[1:]:
-        if post == 'b':
-            val -= 1
-        elif post == '#':
-            val += 1
-    return val % 12
+
+def to_pitch_class_many(note_seq):
+    """Convert a sequence of notes to a list of integers in the range of 0-11.
+
+    Example:
+    >>> to_pitch_class_many(['C', 'E', 'G#', 'Bb'])
+    [0, 4, 8, 10]
+    """
+    res = []
+    for note in note_seq:
+        letter, alteration = spelled_pitch(note)
+        res.append((_letter_ints[letter] + alteration) % 12)
+    return res
 
 
 def reduce_accidentals(note):
@@ -131,24 +167,14 @@ def reduce_accidentals(note):
     >>> reduce_accidentals('C####')
     'E'
     """
-    # Check if input is valid
-    assert_valid_note(note)
-
-    # Calculate note integer
-    val = note_to_int(note[0])
-    for token in note[1:]:
-        if token == 'b':
-            val -= 1
-        elif token == '#':
-            val += 1
-        else:
-            raise NoteFormatError("Unknown note format '%s'" % note)
+    letter, alteration = spelled_pitch(note)
+    val = (_letter_ints[letter] + alteration) % 12
 
     # Determine sharp or flat
-    if val >= note_to_int(note[0]):
-        return int_to_note(val % 12)
+    if alteration >= 0:
+        return int_to_note(val)
     else:
-        return int_to_note(val % 12, 'b')
+        return int_to_note(val, 'b')
 
 
 def remove_redundant_accidentals(note):
@@ -160,26 +186,10 @@ def remove_redundant_accidentals(note):
     >>> remove_redundant_accidentals('Eb##b')
     'E'
     """
-    # Check if input is valid
-    assert_valid_note(note)
-
-    # Calculate net accidentals
-    val = 0
-    for token in note[1:]:
-        if token == 'b':
-            val -= 1
-        elif token == '#':
-            val += 1
-    result = note[0]
-
-    # Cancel out redundancy
-    while val > 0:
-        result = augment(result)
-        val -= 1
-    while val < 0:
-        result = diminish(result)
-        val += 1
-    return result
+    letter, alteration = spelled_pitch(note)
+    if alteration > 0:
+        return note[0] + '#' * alteration
+    return note[0] + 'b' * -alteration
 
 
 def augment(note):
@@ -191,7 +201,7 @@ def augment(note):
     >>> augment('Cb')
     'C'
     """
-    assert_valid_note(note)
+    spelled_pitch(note)
     if note[-1] != 'b':
         return note + '#'
     else:
@@ -207,7 +217,7 @@ def diminish(note):
     >>> diminish('C#')
     'C'
     """
-    assert_valid_note(note)
+    spelled_pitch(note)
     if note[-1] != '#':
         return note + 'b'
     else:
@@ -54,11 +54,23 @@ Other scales
 # Todo: add melodic minor & harmonic minor modes
 
 
+from copy import copy
+from functools import wraps
+from itertools import chain, repeat
+
 from . import intervals
-from .notes import augment, diminish, reduce_accidentals
+from .notes import augment, diminish, reduce_accidentals, note_to_int
 from .keys import keys, get_notes
 from .mt_exceptions import NoteFormatError, FormatError, RangeError
 
+# The (_Scale subclasses, index) pair used by determine_many
+_scale_index = []
+
+# One octave of the ascending and descending notes of the scales that have
+# been asked for
+_scale_notes_cache = {}
+_max_scale_notes_cache = 4096
+
 def determine(notes):
     """Determine the scales containing the notes.
 
@@ -68,19 +80,103 @@ def determine(notes):
     >>> determine(['A', 'Bb', 'E', 'F#', 'G'])
     ['G melodic minor', 'G Bachian', 'D harmonic major']
     """
-    notes = set(notes)
+    return determine_many([notes])[0]
+
+
+def determine_many(note_sets):
+    """Determine the scales containing the notes for every collection of
+    notes in note_sets; return a list with a list of scale names for each.
+
+    The scales are looked up in an index that is built once. Every query
+    first tests the pitch class bitmask of the notes against those of the
+    scales and only compares the note names of the scales that pass.
+
+    Example:
+    >>> determine_many([['C', 'Db', 'E'], ['C', 'Db', 'D']])
+    [['F harmonic minor', 'F minor Neapolitan', 'F harmonic major'], []]
+    """
+    index = _get_scale_index()
     res = []
+    for notes in note_sets:
+        notes = set(notes)
+        try:
+            mask = _pitch_class_mask(notes)
+        except NoteFormatError:
+            # Scales only contain valid notes
+            res.append([])
+            continue
+        found = []
+        for name, asc_mask, asc, desc_mask, desc in index:
+            if ((not mask & ~asc_mask and notes <= asc) or
+                    (not mask & ~desc_mask and notes <= desc)):
+                found.append(name)
+        res.append(found)
+    return res
+
+
+def _pitch_class_mask(notes):
+    """Return the notes as a 12 bit mask of pitch classes."""
+    mask = 0
+    for note in notes:
+        mask |= 1 << note_to_int(note)
+    return mask
+
+
+def _get_scale_index():
+    """Return the index of all the major and minor scales.
 
+    Every entry is a tuple with the name of the scale and the pitch class
+    mask and set of note names of both its ascending and descending form.
+    The index is rebuilt when new _Scale subclasses have been defined.
+    """
+    subclasses = tuple(_Scale.__subclasses__())
+    if _scale_index and _scale_index[0] == subclasses:
+        return _scale_index[1]
+    index = []
     for key in keys:
-        for scale in _Scale.__subclasses__():
+        for scale in subclasses:
             if scale.type == 'major':
-                if (notes <= set(scale(key[0]).ascending()) or
-                        notes <= set(scale(key[0]).descending())):
-                    res.append(scale(key[0]).name)
+                s = scale(key[0])
             elif scale.type == 'minor':
-                if (notes <= set(scale(get_notes(key[1])[0]).ascending()) or
-                        notes <= set(scale(get_notes(key[1])[0]).descending())):
-                    res.append(scale(get_notes(key[1])[0]).name)
+                s = scale(get_notes(key[1])[0])
+            else:
+                continue
+            asc = set(s.ascending())
+            desc = set(s.descending())
+            index.append((s.name, _pitch_class_mask(asc), asc,
+                          _pitch_class_mask(desc), desc))
+    _scale_index[:] = [subclasses, index]
+    return index
+
+
+def _cached_notes(method):
+    """Decorate the ascending or descending method of a _Scale subclass.
+
+    One octave of the notes is computed once for every scale with the same
+    class and tonic and shared from then on; every call returns a new list
+    with the notes for all the octaves.
+    """
+    @wraps(method)
+    def notes(self):
+        octave = _scale_notes(self, method)
+        return list(octave) * self.octaves + [octave[0]]
+    notes.uncached = method
+    return notes
+
+
+def _scale_notes(scale, method):
+    """Return one octave of the notes method computes for scale, without
+    the closing tonic, as a cached tuple."""
+    key = (method, scale._cache_key())
+    try:
+        return _scale_notes_cache[key]
+    except KeyError:
+        pass
+    one = copy(scale)
+    one.octaves = 1
+    res = tuple(method(one))[:-1]
+    if len(_scale_notes_cache) < _max_scale_notes_cache:
+        _scale_notes_cache[key] = res
     return res
 
 
@@ -103,11 +199,12 @@ class _Scale(object):
 
     def __str__(self):
         return 'Ascending:  {0}\nDescending: {1}'.format(
-                ' '.join(self.ascending()), ' '.join(self.descending()))
+                ' '.join(self._notes('ascending')),
+                ' '.join(self._notes('descending')))
 
     def __eq__(self, other):
-        if self.ascending() == other.ascending():
-            if self.descending() == other.descending():
+        if self._notes('ascending') == other._notes('ascending'):
+            if self._notes('descending') == other._notes('descending'):
                 return True
         return False
 
@@ -115,16 +212,51 @@ class _Scale(object):
         return not self.__eq__(other)
 
     def __len__(self):
-        return len(self.ascending())
+        return len(self._octave('ascending')) * self.octaves + 1
+
+    def _cache_key(self):
+        """Return what identifies one octave of the notes of this scale.
+
+        Subclasses keeping more state than the tonic should add it.
+        """
+        return (type(self), self.tonic)
+
+    def _octave(self, direction):
+        """Return one octave of the cached 'ascending' or 'descending'
+        notes as a tuple."""
+        method = getattr(type(self), direction)
+        return _scale_notes(self, getattr(method, 'uncached', method))
+
+    def _notes(self, direction):
+        """Return the 'ascending' or 'descending' notes as a tuple."""
+        octave = self._octave(direction)
+        return octave * self.octaves + octave[:1]
 
     def ascending(self):
         """Return the list of ascending notes."""
         raise NotImplementedError
 
+    @_cached_notes
     def descending(self):
         """Return the list of descending notes."""
         return list(reversed(self.ascending()))
 
+    def iterate(self, direction='a'):
+        """Return an iterator over the notes of the scale.
+
+        The direction of the scale is 'a' for ascending (default) and 'd'
+        for descending. The notes are yielded octave by octave from the
+        cached notes of a single octave.
+        """
+        if direction == 'a':
+            octave = self._octave('ascending')
+        elif direction == 'd':
+            octave = self._octave('descending')
+        else:
+            raise FormatError("Unrecognised direction '%s'" % direction)
+        return chain(chain.from_iterable(repeat(octave, self.octaves)),
+                     octave[:1])
+
     def degree(self, degree_number, direction='a'):
         """Return the asked scale degree.
 
@@ -134,10 +266,10 @@ class _Scale(object):
         if degree_number < 1:
             raise RangeError("degree '%s' out of range" % degree_number)
         if direction == 'a':
-            notes = self.ascending()
+            notes = self._notes('ascending')
             return notes[(degree_number-1) % 7]
         elif direction == 'd':
-            notes = self.descending()[::-1]
+            notes = self._notes('descending')[::-1]
             return notes[(degree_number-1) % 7]
         else:
             raise FormatError("Unrecognised direction '%s'" % direction)
@@ -168,6 +300,10 @@ class Diatonic(_Scale):
         self.name = '{0} diatonic, semitones in {1}'.format(self.tonic,
                 self.semitones)
 
+    def _cache_key(self):
+        return (type(self), self.tonic, tuple(self.semitones))
+
+    @_cached_notes
     def ascending(self):
         notes = [self.tonic]
         for n in range(1, 7):
@@ -197,6 +333,7 @@ class Ionian(_Scale):
         super(Ionian, self).__init__(note, octaves)
         self.name = '{0} ionian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Diatonic(self.tonic, (3, 7)).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -219,6 +356,7 @@ class Dorian(_Scale):
         super(Dorian, self).__init__(note, octaves)
         self.name = '{0} dorian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Diatonic(self.tonic, (2, 6)).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -241,6 +379,7 @@ class Phrygian(_Scale):
         super(Phrygian, self).__init__(note, octaves)
         self.name = '{0} phrygian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Diatonic(self.tonic, (1, 5)).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -263,6 +402,7 @@ class Lydian(_Scale):
         super(Lydian, self).__init__(note, octaves)
         self.name = '{0} lydian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Diatonic(self.tonic, (4, 7)).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -285,6 +425,7 @@ class Mixolydian(_Scale):
         super(Mixolydian, self).__init__(note, octaves)
         self.name = '{0} mixolydian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Diatonic(self.tonic, (3, 6)).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -307,6 +448,7 @@ class Aeolian(_Scale):
         super(Aeolian, self).__init__(note, octaves)
         self.name = '{0} aeolian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Diatonic(self.tonic, (2, 5)).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -329,6 +471,7 @@ class Locrian(_Scale):
         super(Locrian, self).__init__(note, octaves)
         self.name = '{0} locrian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Diatonic(self.tonic, (1, 4)).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -353,6 +496,7 @@ class Major(_Scale):
         super(Major, self).__init__(note, octaves)
         self.name = '{0} major'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = get_notes(self.tonic)
         return notes * self.octaves + [notes[0]]
@@ -375,6 +519,7 @@ class HarmonicMajor(_Scale):
         super(HarmonicMajor, self).__init__(note, octaves)
         self.name = '{0} harmonic major'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = Major(self.tonic).ascending()[:-1]
         notes[5] = diminish(notes[5])
@@ -400,6 +545,7 @@ class NaturalMinor(_Scale):
         super(NaturalMinor, self).__init__(note, octaves)
         self.name = '{0} natural minor'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = get_notes(self.tonic.lower())
         return notes * self.octaves + [notes[0]]
@@ -422,6 +568,7 @@ class HarmonicMinor(_Scale):
         super(HarmonicMinor, self).__init__(note, octaves)
         self.name = '{0} harmonic minor'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = NaturalMinor(self.tonic).ascending()[:-1]
         notes[6] = augment(notes[6])
@@ -445,12 +592,14 @@ class MelodicMinor(_Scale):
         super(MelodicMinor, self).__init__(note, octaves)
         self.name = '{0} melodic minor'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = NaturalMinor(self.tonic).ascending()[:-1]
         notes[5] = augment(notes[5])
         notes[6] = augment(notes[6])
         return notes * self.octaves + [notes[0]]
         
+    @_cached_notes
     def descending(self):
         notes = NaturalMinor(self.tonic).descending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -474,6 +623,7 @@ class Bachian(_Scale):
         super(Bachian, self).__init__(note, octaves)
         self.name = '{0} Bachian'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = MelodicMinor(self.tonic).ascending()[:-1]
         return notes * self.octaves + [notes[0]]
@@ -496,11 +646,13 @@ class MinorNeapolitan(_Scale):
         super(MinorNeapolitan, self).__init__(note, octaves)
         self.name = '{0} minor Neapolitan'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = HarmonicMinor(self.tonic).ascending()[:-1]
         notes[1] = diminish(notes[1])
         return notes * self.octaves + [notes[0]]
 
+    @_cached_notes
     def descending(self):
         notes = NaturalMinor(self.tonic).descending()[:-1]
         notes[6] = diminish(notes[6])
@@ -531,6 +683,10 @@ class Chromatic(_Scale):
         self.octaves = octaves
         self.name = '{0} chromatic'.format(self.tonic)
 
+    def _cache_key(self):
+        return (type(self), self.key)
+
+    @_cached_notes
     def ascending(self):
         notes = [self.tonic]
         for note in get_notes(self.key)[1:] + [self.tonic]:
@@ -542,6 +698,7 @@ class Chromatic(_Scale):
         notes.pop()
         return notes * self.octaves + [notes[0]]
 
+    @_cached_notes
     def descending(self):
         notes = [self.tonic]
         for note in reversed(get_notes(self.key)):
@@ -571,6 +728,7 @@ class WholeTone(_Scale):
         super(WholeTone, self).__init__(note, octaves)
         self.name = '{0} whole tone'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = [self.tonic]
         for note in range(5):
@@ -596,6 +754,7 @@ class Octatonic(_Scale):
         super(Octatonic, self).__init__(note, octaves)
         self.name = '{0} octatonic'.format(self.tonic)
 
+    @_cached_notes
     def ascending(self):
         notes = [self.tonic]
         for i in range(3):
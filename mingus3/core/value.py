@@ -38,6 +38,8 @@ up your code. This module is here to help do the conversion.
 Medieval backwards compatibility privided.
 """
 
+from fractions import Fraction
+
 longa = 0.25
 breve = 0.5
 semibreve = 1
@@ -123,6 +125,23 @@ base_septuplets = [
 ]
 
 
+def to_fraction(value):
+    """Return the length of the note value as a Fraction of a whole note.
+
+    Values that were rounded by floating point division, like dotted and
+    tuplet values, are turned back into the exact ratio they stand for.
+
+    Examples:
+    >>> to_fraction(quarter)
+    Fraction(1, 4)
+    >>> to_fraction(dots(quarter))
+    Fraction(3, 8)
+    """
+    if type(value) is float:
+        value = Fraction(value).limit_denominator(1 << 16)
+    return 1 / Fraction(value)
+
+
 def add(value1, value2):
     """Return the value of the two combined.
 
@@ -313,7 +313,7 @@ def from_Track(track, maxwidth=80, tuning=None):
     if not tuning:
         tuning = track.get_tuning()
     lastlen = 0
-    for bar in track:
+    for bar in track.bars:
         r = from_Bar(bar, width, tuning, collapse=False)
         barstart = r[1].find('||') + 2
         if (len(r[0]) + lastlen) - barstart < maxwidth and result != []:
@@ -25,6 +25,9 @@ from mingus3.containers.note_container import NoteContainer
 from mingus3.core.mt_exceptions import RangeError
 import mingus3.core.notes as notes
 
+# The number of results find_chord_fingering keeps for every StringTuning
+_max_chord_fingerings = 1024
+
 class StringTuning(object):
 
     """A class to store and work with tunings and fingerings."""
@@ -48,6 +51,7 @@ class StringTuning(object):
             else:
                 self.tuning.append(Note(x))
         self.description = description
+        self._chord_fingerings = {}
 
     def count_strings(self):
         """Return the number of strings."""
@@ -209,6 +213,14 @@ class StringTuning(object):
         if len(notenames) == 0 or len(notenames) > len(self.tuning):
             return []
 
+        # The search only looks at the note names, so all the voicings of a
+        # chord share their results
+        key = (frozenset(notenames), max_distance, maxfret, max_fingers)
+        if key in self._chord_fingerings:
+            s, res = self._chord_fingerings[key]
+            return self._chord_fingering_result(s, res,
+                    return_best_as_NoteContainer)
+
         # Make string-fret dictionary
         fretdict = []
         for x in range(0, len(self.tuning)):
@@ -261,8 +273,16 @@ class StringTuning(object):
         s = sorted(result, key=lambda x: sum([t if t is not None else 1000
                    for (i, t) in enumerate(x)]))
         s = [a for a in s if fingers_needed(a) <= max_fingers]
+        if len(self._chord_fingerings) < _max_chord_fingerings:
+            self._chord_fingerings[key] = (s, res)
+        return self._chord_fingering_result(s, res,
+                return_best_as_NoteContainer)
+
+    def _chord_fingering_result(self, s, res, return_best_as_NoteContainer):
+        """Return the result of find_chord_fingering from the sorted
+        fingerings s and the lookup table res."""
         if not return_best_as_NoteContainer:
-            return s
+            return [list(x) for x in s]
         else:
             rnotes = self.frets_to_NoteContainer(s[0])
             for (i, x) in enumerate(rnotes):
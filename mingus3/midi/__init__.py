@@ -23,6 +23,8 @@ __all__ = [
     'Sequencer',
     'SequencerObserver',
     'midi_file_in',
+    'event_table',
+    'tempo_map',
     'midi_file_out',
     'midi_track',
     'fluidsynth',
@@ -0,0 +1,273 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, event_table module.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""The events of a MIDI file in flat arrays.
+
+An EventTable keeps one array per field of the events in a MIDI file: the
+absolute tick, the track, the type, the channel, the pitch, the velocity
+and, for notes, the duration in ticks found by pairing every note on with
+its note off. The arrays are NumPy arrays when NumPy is installed and
+array.array objects otherwise.
+
+The types are the status bytes without the channel: 0x80 for note off,
+0x90 for note on, etc., 0xFF for meta events and 0xF0 and 0xF7 for system
+exclusive events. A note on with velocity 0 is stored as a note off. The
+pitch and velocity hold the two parameters of the other channel events, the
+type of meta events as pitch, and -1 where there is no value. The data of
+meta and system exclusive events is kept in the data dictionary.
+
+Analyses like pitch histograms only need an EventTable, which is much
+cheaper to build than a Composition. to_note_array turns the notes into a
+NoteArray, which converts to Tracks, and tempo_map collects the tempo
+changes and time signatures in a TempoMap.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict, deque
+
+from mingus3.containers.note_array import NoteArray
+from mingus3.containers import arrays
+from mingus3.containers.arrays import _column, _take
+from .midi_file_in import MappedMidiFile, TimeDivisionError
+from .tempo_map import TempoMap
+
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+META_EVENT = 0xFF
+
+# The attribute and array.array typecode of every array in an EventTable
+_columns = (
+    ('tick', 'q'),
+    ('track', 'H'),
+    ('type', 'B'),
+    ('channel', 'b'),
+    ('pitch', 'h'),
+    ('velocity', 'h'),
+    ('duration', 'q'),
+    )
+
+
+class EventTable(object):
+
+    """A table holding the events of a MIDI file in flat arrays.
+
+    Example:
+    >>> t = EventTable().from_midi_file('song.mid')
+    >>> t.notes().pitch_histogram()[60]
+    12
+    """
+
+    format_type = 1
+    ticks_per_beat = None
+
+    def __init__(self):
+        self.data = {}
+        self._set_columns([[] for c in _columns])
+
+    def _set_columns(self, values, order=None):
+        """Set the arrays to the sequences in values, rearranged in order
+        when given."""
+        for (attr, typecode), column in zip(_columns, values):
+            if order is not None:
+                column = [column[i] for i in order]
+            setattr(self, attr, _column(typecode, column))
+
+    def _copy(self, indices):
+        """Return a new EventTable with the events at indices."""
+        res = EventTable.__new__(EventTable)
+        for attr, typecode in _columns:
+            setattr(res, attr, _take(getattr(self, attr), indices))
+        res.format_type = self.format_type
+        res.ticks_per_beat = self.ticks_per_beat
+        res.data = {}
+        if self.data:
+            for i, j in enumerate(indices):
+                if int(j) in self.data:
+                    res.data[i] = self.data[int(j)]
+        return res
+
+    def from_midi_file(self, file):
+        """Set the EventTable to the events in a MIDI file.
+
+        Raise the exceptions of MidiFile.parse_midi_file when the file can
+        not be read.
+        """
+        with MappedMidiFile(file) as m:
+            return self.from_tracks(m.header, m)
+
+    def from_tracks(self, header, tracks):
+        """Set the EventTable to the events in the header and tracks
+        returned by MidiFile.parse_midi_file.
+
+        The events of all the tracks are sorted on their ticks, keeping
+        the order of the tracks for events at the same tick.
+        """
+        (self.format_type, number_of_tracks, time_division) = header
+        self.ticks_per_beat = time_division.get('ticks_per_beat')
+        values = [[] for c in _columns]
+        (tick, track, type, channel, pitch, velocity, duration) = values
+        data = {}
+        for track_nr, events in enumerate(tracks):
+            now = 0
+            # The rows of the notes sounding on (channel, pitch)
+            playing = defaultdict(deque)
+            for (delta_time, status, param1, param2) in events:
+                now += delta_time
+                row = len(tick)
+                if status >= 0xF0:
+                    type.append(status)
+                    channel.append(-1)
+                    pitch.append(-1 if param1 is None else param1)
+                    velocity.append(-1)
+                    data[row] = param2
+                else:
+                    event = status & 0xF0
+                    if event == NOTE_ON and param2 == 0:
+                        event = NOTE_OFF
+                    type.append(event)
+                    channel.append(status & 0x0F)
+                    pitch.append(param1)
+                    velocity.append(-1 if param2 is None else param2)
+                    if event == NOTE_ON:
+                        playing[status & 0x0F, param1].append(row)
+                    elif event == NOTE_OFF:
+                        rows = playing.get((status & 0x0F, param1))
+                        if rows:
+                            on = rows.popleft()
+                            duration[on] = now - tick[on]
+                tick.append(now)
+                track.append(track_nr)
+                duration.append(-1)
+        order = sorted(range(len(tick)), key=tick.__getitem__)
+        self._set_columns(values, order)
+        position = dict((old, new) for new, old in enumerate(order))
+        self.data = dict((position[row], d) for row, d in data.items())
+        return self
+
+    def filter(self, mask):
+        """Return a new EventTable with the events for which mask is true.
+
+        The mask is a sequence of booleans, one for every event.
+
+        Example:
+        >>> t.filter(t.channel == 9)
+        """
+        numpy = arrays.numpy
+        if numpy is not None:
+            indices = numpy.flatnonzero(numpy.asarray(mask, dtype=bool))
+        else:
+            indices = [i for i, keep in enumerate(mask) if keep]
+        return self._copy(indices)
+
+    def notes(self):
+        """Return a new EventTable with the note on events."""
+        numpy = arrays.numpy
+        if numpy is not None:
+            return self.filter(self.type == NOTE_ON)
+        return self.filter([t == NOTE_ON for t in self.type])
+
+    def meta_events(self, meta_type=None):
+        """Return a new EventTable with the meta events, or only the ones of
+        the given type, like 0x51 for tempo changes."""
+        numpy = arrays.numpy
+        if numpy is not None:
+            mask = self.type == META_EVENT
+            if meta_type is not None:
+                mask &= self.pitch == meta_type
+            return self.filter(mask)
+        return self.filter([t == META_EVENT and (meta_type is None or
+                            p == meta_type) for t, p in zip(self.type,
+                            self.pitch)])
+
+    def slice_by_tick(self, start, end):
+        """Return a new EventTable with the events that have a tick in the
+        range [start, end)."""
+        numpy = arrays.numpy
+        if numpy is not None:
+            first, last = numpy.searchsorted(self.tick, [start, end])
+            indices = numpy.arange(first, last)
+        else:
+            indices = range(bisect_left(self.tick, start),
+                            bisect_left(self.tick, end))
+        return self._copy(indices)
+
+    def pitch_histogram(self):
+        """Return a list with the number of note on events for each of the
+        128 MIDI pitches."""
+        numpy = arrays.numpy
+        notes = self.notes()
+        if numpy is not None:
+            return numpy.bincount(notes.pitch, minlength=128).tolist()
+        res = [0] * 128
+        for p in notes.pitch:
+            res[p] += 1
+        return res
+
+    def tempo_map(self):
+        """Return a TempoMap with the tempo changes and time signatures.
+
+        Raise a TimeDivisionError when the time division of the file is in
+        frames per second.
+        """
+        if not self.ticks_per_beat:
+            raise TimeDivisionError("Can't convert SMPTE time to beats")
+        res = TempoMap(self.ticks_per_beat)
+        meta = self.meta_events()
+        for i in range(len(meta)):
+            d = meta.data[i]
+            if meta.pitch[i] == 0x51 and len(d) == 3:
+                res.add_tempo(int(meta.tick[i]), int.from_bytes(d, 'big'))
+            elif meta.pitch[i] == 0x58 and len(d) >= 2:
+                res.add_meter(int(meta.tick[i]), (d[0], 2 ** d[1]))
+        return res
+
+    def to_note_array(self):
+        """Return the notes with a duration as a NoteArray.
+
+        Ticks are converted to whole notes, so the NoteArray can be turned
+        into Tracks. Raise a TimeDivisionError when the time division of
+        the file is in frames per second.
+        """
+        numpy = arrays.numpy
+        if not self.ticks_per_beat:
+            raise TimeDivisionError("Can't convert SMPTE time to beats")
+        whole = 4.0 * self.ticks_per_beat
+        if numpy is not None:
+            notes = self.filter((self.type == NOTE_ON) & (self.duration > 0))
+        else:
+            notes = self.filter([t == NOTE_ON and d > 0 for t, d in
+                                 zip(self.type, self.duration)])
+        return NoteArray([t / whole for t in notes.tick], [whole / d for d
+                         in notes.duration], [int(p) - 12 for p in
+                         notes.pitch], [int(v) for v in notes.velocity],
+                         [int(c) for c in notes.channel])
+
+    def __iter__(self):
+        """Iterate over the events as (tick, track, type, channel, pitch,
+        velocity, duration) tuples."""
+        for i in range(len(self)):
+            yield tuple(int(getattr(self, attr)[i]) for attr, typecode in
+                        _columns)
+
+    def __len__(self):
+        """Return the number of events."""
+        return len(self.tick)
+
+    def __repr__(self):
+        """Return a string representing the EventTable."""
+        return str(list(self))
@@ -2,8 +2,8 @@
 # -*- coding: utf-8 -*-
 
 # Headers
-FILE_HEADER = 'MThd'
-TRACK_HEADER = 'MTrk'
+FILE_HEADER = b'MThd'
+TRACK_HEADER = b'MTrk'
 
 # MIDI Channel Events
 NOTE_OFF = 0x08
@@ -13,7 +13,7 @@ CONTROLLER = 0x0B
 PROGRAM_CHANGE = 0x0C
 CHANNEL_AFTERTOUCH = 0x0D
 PITCH_BEND = 0x0E
-META_EVENT = '\xff'
+META_EVENT = b'\xff'
 
 # MIDI Controller Type
 BANK_SELECT = 0x00
@@ -30,17 +30,17 @@ EFFECT_CONTROL_1 = 0x0C
 EFFECT_CONTROL_2 = 0x0D
 
 # Meta Events
-SEQUENCE_NUMBER = '\x00'
-TEXT_EVENT = '\x01'
-COPYRIGHT_NOTICE = '\x02'
-TRACK_NAME = '\x03'
-INSTRUMENT_NAME = '\x04'
-LYRICS = '\x05'
-MARKER = '\x06'
-CUE_POINT = '\x07'
-MIDI_CHANNEL_PREFIX = "\x20"
-END_OF_TRACK = "\x2F"
-SET_TEMPO = "\x51"
-SMPTE_OFFSET = "\x54"
-TIME_SIGNATURE = "\x58"
-KEY_SIGNATURE = "\x59"
+SEQUENCE_NUMBER = b'\x00'
+TEXT_EVENT = b'\x01'
+COPYRIGHT_NOTICE = b'\x02'
+TRACK_NAME = b'\x03'
+INSTRUMENT_NAME = b'\x04'
+LYRICS = b'\x05'
+MARKER = b'\x06'
+CUE_POINT = b'\x07'
+MIDI_CHANNEL_PREFIX = b'\x20'
+END_OF_TRACK = b'\x2F'
+SET_TEMPO = b'\x51'
+SMPTE_OFFSET = b'\x54'
+TIME_SIGNATURE = b'\x58'
+KEY_SIGNATURE = b'\x59'
@@ -25,9 +25,21 @@ from mingus3.containers.bar import Bar
 from mingus3.containers.track import Track
 from mingus3.containers.composition import Composition
 from mingus3.containers.instrument import MidiInstrument
+from .tempo_map import TempoMap
+from fractions import Fraction
 import mingus3.core.notes as notes
 import mingus3.core.intervals as intervals
-import binascii
+import mmap
+import multiprocessing
+import os
+import struct
+
+# The MThd chunk: its id and size, the format, the number of tracks and the
+# time division
+_file_header = struct.Struct('>4sLHHH')
+
+# The id and size starting every chunk
+_chunk_header = struct.Struct('>4sL')
 
 def MIDI_to_Composition(file):
     """Convert a MIDI file to a mingus3.containers.Composition and return it
@@ -40,6 +52,61 @@ def MIDI_to_Composition(file):
     m = MidiFile()
     return m.MIDI_to_Composition(file)
 
+def _read_varint(data, pos):
+    """Return the variable length quantity starting at pos in data and the
+    position after it."""
+    byte = data[pos]
+    pos += 1
+    result = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        result = (result << 7) | (byte & 0x7F)
+    return (result, pos)
+
+
+def _load(file):
+    """Return a (file, result, error) tuple for load_many."""
+    try:
+        return (file, MIDI_to_Composition(file), None)
+    except Exception as e:
+        return (file, None, e)
+
+
+def load_many(files, workers=None, ordered=True, chunksize=1):
+    """Convert MIDI files to Compositions in a pool of worker processes.
+
+    Return an iterator over (file, result, error) tuples. The result is the
+    (Composition, bpm) tuple of MIDI_to_Composition and error None, or the
+    result is None and error the exception raised for the file, so a
+    broken file does not stop the others.
+
+    The number of workers defaults to the number of CPUs; with 1 the files
+    are converted in this process. The tuples are yielded as soon as they
+    are ready, in the order of files or, when ordered is False, in the
+    order in which the workers finish. Files are handed to the workers in
+    batches of chunksize.
+
+    Example:
+    >>> for (file, result, error) in load_many(files):
+    ...     if error is None:
+    ...         (composition, bpm) = result
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        for file in files:
+            yield _load(file)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        if ordered:
+            results = pool.imap(_load, files, chunksize)
+        else:
+            results = pool.imap_unordered(_load, files, chunksize)
+        for res in results:
+            yield res
+
+
 class HeaderError(Exception):
     pass
 
@@ -60,96 +127,103 @@ class MidiFile:
     bpm = 120
     meter = (4, 4)
     bytes_read = 0
+    tempo_map = None
 
     def MIDI_to_Composition(self, file):
+        """Convert a MIDI file to a Composition and return it in a tuple
+        with the last tempo in beats per minute.
+
+        All the tempo changes and time signatures are kept in the tempo_map
+        attribute, a TempoMap.
+        """
         (header, track_data) = self.parse_midi_file(file)
         c = Composition()
         if header[2]['fps']:
             print("Don't know how to parse this yet")
             return c
         ticks_per_beat = header[2]['ticks_per_beat']
+        bpm = self.bpm
+        self.tempo_map = TempoMap(ticks_per_beat)
         for track in track_data:
+            tick = 0
             t = Track()
             b = Bar()
             metronome = 1  # Tick once every quarter note
             thirtyseconds = 8  # 8 thirtyseconds in a quarter note
             meter = (4, 4)
             key = 'C'
-            for e in track:
-                (deltatime, event) = e
-                duration = float(deltatime) / (ticks_per_beat * 4.0)
-                if duration != 0.0:
-                    duration = 1.0 / duration
-                    if len(b.bar) > 0:
-                        current_length = b.bar[-1][1]
-                        b.bar[-1][1] = duration
-                        if current_length - duration != 0:
-                            b.current_beat -= 1.0 / current_length
-                            b.current_beat += 1.0 / duration
+            for (deltatime, status, param1, param2) in track:
+                tick += deltatime
+                if deltatime:
+                    duration = Fraction(ticks_per_beat * 4, deltatime)
+                    b.change_last_duration(duration)
                     if not b.place_notes(NoteContainer(), duration):
                         t + b
                         b = Bar(key, meter)
                         b.place_notes(NoteContainer(), duration)
 
-                if event['event'] == 8:
-                    if deltatime == 0:
-                        pass
-                elif event['event'] == 9:
-                    # note on
-                    n = Note(notes.int_to_note(event['param1'] % 12),
-                             event['param1'] / 12 - 1)
-                    n.channel = event['channel']
-                    n.velocity = event['param2']
+                event = status >> 4
+                if event == 8:
+                    pass
+                elif event == 9:
+                    # note on, a velocity of 0 stands for note off
+                    if param2 == 0:
+                        continue
+                    n = Note(notes.int_to_note(param1 % 12), param1 // 12 - 1)
+                    n.channel = status & 0x0F
+                    n.velocity = param2
                     if len(b.bar) > 0:
                         b.bar[-1][2] + n
                     else:
                         b + n
-                elif event['event'] == 10:
+                elif event == 10:
                     # note aftertouch
                     pass
-                elif event['event'] == 11:
+                elif event == 11:
                     # controller select
                     pass
-                elif event['event'] == 12:
+                elif event == 12:
                     # program change
                     i = MidiInstrument()
-                    i.instrument_nr = event['param1']
+                    i.instrument_nr = param1
                     t.instrument = i
-                elif event['event'] == 0x0f:
+                elif status == 0xFF:
                     # meta event Text
-                    if event['meta_event'] == 1:
+                    if param1 == 1:
                         pass
-                    elif event['meta_event'] == 3:
+                    elif param1 == 3:
                         # Track name
-                        t.name = event['data']
-                    elif event['meta_event'] == 6:
+                        t.name = param2.decode('latin-1')
+                    elif param1 == 6:
                         # Marker
                         pass
-                    elif event['meta_event'] == 7:
+                    elif param1 == 7:
                         # Cue Point
                         pass
-                    elif event['meta_event'] == 47:
+                    elif param1 == 47:
                         # End of Track
                         pass
-                    elif event['meta_event'] == 81:
+                    elif param1 == 81:
                         # Set tempo warning Only the last change in bpm will get
                         # saved currently
-                        mpqn = self.bytes_to_int(event['data'])
+                        mpqn = self.bytes_to_int(param2)
                         bpm = 60000000 / mpqn
-                    elif event['meta_event'] == 88:
+                        self.tempo_map.add_tempo(tick, mpqn)
+                    elif param1 == 88:
                         # Time Signature
-                        d = event['data']
-                        thirtyseconds = self.bytes_to_int(d[3])
-                        metronome = self.bytes_to_int(d[2]) / 24.0
-                        denom = 2 ** self.bytes_to_int(d[1])
-                        numer = self.bytes_to_int(d[0])
+                        d = param2
+                        thirtyseconds = d[3]
+                        metronome = d[2] / 24.0
+                        denom = 2 ** d[1]
+                        numer = d[0]
                         meter = (numer, denom)
                         b.set_meter(meter)
-                    elif event['meta_event'] == 89:
+                        self.tempo_map.add_meter(tick, meter)
+                    elif param1 == 89:
                         # Key Signature
-                        d = event['data']
-                        sharps = self.bytes_to_int(d[0])
-                        minor = self.bytes_to_int(d[0])
+                        d = param2
+                        sharps = d[0] - 256 if d[0] > 127 else d[0]
+                        minor = d[1]
                         if minor:
                             key = 'A'
                         else:
@@ -161,9 +235,12 @@ class MidiFile:
                                 key = intervals.major_fifth(key)
                         b.key = Note(key)
                     else:
-                        print('Unsupported META event', event['meta_event'])
+                        print('Unsupported META event', param1)
+                elif status in (0xF0, 0xF7):
+                    # system exclusive
+                    pass
                 else:
-                    print('Unsupported MIDI event', event)
+                    print('Unsupported MIDI event', (status, param1, param2))
             t + b
             c.tracks.append(t)
         return (c, bpm)
@@ -171,51 +248,26 @@ class MidiFile:
     def parse_midi_file_header(self, fp):
         """Read the header of a MIDI file and return a tuple containing the
         format type, number of tracks and parsed time division information."""
-        # Check header
-        try:
-            if fp.read(4) != 'MThd':
-                raise HeaderError('Not a valid MIDI file header. Byte %d.'
-                        % self.bytes_read)
-            self.bytes_read += 4
-        except:
+        data = fp.read(_file_header.size)
+        if len(data) < _file_header.size:
             raise IOError("Couldn't read from file.")
-
-        # Parse chunk size
-        try:
-            chunk_size = self.bytes_to_int(fp.read(4))
-            self.bytes_read += 4
-        except:
-            raise IOError("Couldn't read chunk size from file. Byte %d."
+        (chunk_id, chunk_size, format_type, number_of_tracks,
+         time_division) = _file_header.unpack(data)
+        if chunk_id != b'MThd' or chunk_size < 6:
+            raise HeaderError('Not a valid MIDI file header. Byte %d.'
                     % self.bytes_read)
-
-        # Expect chunk size to be at least 6
-        if chunk_size < 6:
-            return False
-        try:
-            format_type = self.bytes_to_int(fp.read(2))
-            self.bytes_read += 2
-            if format_type not in [0, 1, 2]:
-                raise FormatError('%d is not a valid MIDI format.'
-                        % format_type)
-        except:
-            raise IOError("Couldn't read format type from file.")
-        try:
-            number_of_tracks = self.bytes_to_int(fp.read(2))
-            time_division = self.parse_time_division(fp.read(2))
-            self.bytes_read += 4
-        except:
-            raise IOError("Couldn't read number of tracks "
-                    "and/or time division from tracks.")
-
-        chunk_size -= 6
-        if chunk_size % 2 == 1:
-            raise FormatError("Won't parse this.")
-        fp.read(chunk_size / 2)
-        self.bytes_read += chunk_size / 2
+        if format_type not in [0, 1, 2]:
+            raise FormatError('%d is not a valid MIDI format.'
+                    % format_type)
+        time_division = self.parse_time_division(data[12:14])
+
+        # Skip the rest of a longer header
+        fp.read(chunk_size - 6)
+        self.bytes_read += 8 + chunk_size
         return (format_type, number_of_tracks, time_division)
 
     def bytes_to_int(self, bytes):
-        return int(binascii.b2a_hex(bytes), 16)
+        return int.from_bytes(bytes, 'big')
 
     def parse_time_division(self, bytes):
         """Parse the time division found in the header of a MIDI file and
@@ -242,124 +294,107 @@ class MidiFile:
     def parse_track(self, fp):
         """Parse a MIDI track from its header to its events.
 
-        Return a list of events and the number of bytes that were read.
+        The track is read from the file in one go. Return a list of events,
+        see iter_events.
         """
-        events = []
         chunk_size = self.parse_track_header(fp)
-        bytes = chunk_size
-        while chunk_size > 0:
-            (delta_time, chunk_delta) = self.parse_varbyte_as_int(fp)
-            chunk_size -= chunk_delta
-            (event, chunk_delta) = self.parse_midi_event(fp)
-            chunk_size -= chunk_delta
-            events.append([delta_time, event])
-        if chunk_size < 0:
-            print('yikes.', self.bytes_read, chunk_size)
+        data = fp.read(chunk_size)
+        if len(data) < chunk_size:
+            raise IOError("Couldn't read track from file. Byte %d."
+                    % self.bytes_read)
+        events = list(self.iter_events(data))
+        self.bytes_read += chunk_size
         return events
 
-    def parse_midi_event(self, fp):
-        """Parse a MIDI event.
+    def iter_events(self, data):
+        """Iterate over the events in the data of a track chunk.
+
+        Every event is a (delta_time, status, param1, param2) tuple, with
+        running status filled in. Events with a single parameter have None
+        as param2. Meta events have status 0xFF, the type of the meta event
+        as param1 and its data as param2. System exclusive events have
+        status 0xF0 or 0xF7, None as param1 and their data as param2.
 
-        Return a dictionary and the number of bytes read.
+        Raise a FormatError on unknown or truncated events.
         """
-        chunk_size = 0
+        view = memoryview(data)
+        end = len(view)
+        pos = 0
+        status = 0
         try:
-            ec = self.bytes_to_int(fp.read(1))
-            chunk_size += 1
-            self.bytes_read += 1
-        except:
-            raise IOError("Couldn't read event type "
-                    "and channel data from file.")
-
-        # Get the nibbles
-        event_type = (ec & 0xf0) >> 4
-        channel = ec & 0x0f
-
-        # I don't know what these events are supposed to do, but I keep finding
-        # them. The parser ignores them.
-        if event_type < 8:
-            raise FormatError('Unknown event type %d. Byte %d.' % (event_type,
-                self.bytes_read))
-
-        # Meta events can have strings of variable length
-        if event_type == 0x0f:
-            try:
-                meta_event = self.bytes_to_int(fp.read(1))
-                (length, chunk_delta) = self.parse_varbyte_as_int(fp)
-                data = fp.read(length)
-                chunk_size += 1 + chunk_delta + length
-                self.bytes_read += 1 + length
-            except:
-                raise IOError("Couldn't read meta event from file.")
-            return ({'event': event_type, 'meta_event': meta_event,
-                'data': data}, chunk_size)
-        elif event_type in [12, 13]:
-            # Program change and Channel aftertouch events only have one
-            # parameter
-            try:
-                param1 = fp.read(1)
-                chunk_size += 1
-                self.bytes_read += 1
-            except:
-                raise IOError("Couldn't read MIDI event parameters from file.")
-            param1 = self.bytes_to_int(param1)
-            return ({'event': event_type, 'channel': channel,
-                'param1': param1}, chunk_size)
-        else:
-            try:
-                param1 = fp.read(1)
-                param2 = fp.read(1)
-                chunk_size += 2
-                self.bytes_read += 2
-            except:
-                raise IOError("Couldn't read MIDI event parameters from file.")
-            param1 = self.bytes_to_int(param1)
-            param2 = self.bytes_to_int(param2)
-            return ({'event': event_type, 'channel': channel, 'param1': param1,
-                'param2': param2}, chunk_size)
+            while pos < end:
+                (delta_time, pos) = _read_varint(view, pos)
+                if view[pos] & 0x80:
+                    status = view[pos]
+                    pos += 1
+                elif status == 0:
+                    raise FormatError('Data byte without a status. Byte %d.'
+                            % (self.bytes_read + pos))
+                if status < 0xF0:
+                    if 0xC0 <= status < 0xE0:
+                        # Program change and Channel aftertouch events only
+                        # have one parameter
+                        yield (delta_time, status, view[pos], None)
+                        pos += 1
+                    else:
+                        yield (delta_time, status, view[pos], view[pos + 1])
+                        pos += 2
+                    continue
+                if status == 0xFF:
+                    param1 = view[pos]
+                    pos += 1
+                elif status in (0xF0, 0xF7):
+                    param1 = None
+                else:
+                    raise FormatError('Unknown event type %d. Byte %d.'
+                            % (status, self.bytes_read + pos))
+                # Meta and system exclusive events have data of variable
+                # length and cancel running status
+                (length, pos) = _read_varint(view, pos)
+                if pos + length > end:
+                    raise IndexError
+                yield (delta_time, status, param1, bytes(view[pos:pos
+                       + length]))
+                pos += length
+                status = 0
+        except IndexError:
+            raise FormatError('Truncated event. Byte %d.'
+                    % (self.bytes_read + end))
 
     def parse_track_header(self, fp):
-        """Return the size of the track chunk."""
-        # Check the header
-        try:
-            h = fp.read(4)
-            self.bytes_read += 4
-        except:
-            raise IOError("Couldn't read track header from file. Byte %d."
-                    % self.bytes_read)
-        if h != 'MTrk':
-            raise HeaderError('Not a valid Track header. Byte %d.'
-                    % self.bytes_read)
+        """Return the size of the track chunk.
 
-        # Parse the size of the header
-        try:
-            chunk_size = fp.read(4)
-            self.bytes_read += 4
-        except:
-            raise IOError("Couldn't read track chunk size from file.")
-        chunk_size = self.bytes_to_int(chunk_size)
-        return chunk_size
+        Chunks of other types are skipped.
+        """
+        while True:
+            h = fp.read(_chunk_header.size)
+            if len(h) < _chunk_header.size:
+                raise HeaderError('Not a valid Track header. Byte %d.'
+                        % self.bytes_read)
+            (chunk_id, chunk_size) = _chunk_header.unpack(h)
+            self.bytes_read += _chunk_header.size
+            if chunk_id == b'MTrk':
+                return chunk_size
+            fp.read(chunk_size)
+            self.bytes_read += chunk_size
 
     def parse_midi_file(self, file):
         """Parse a MIDI file.
 
         Return the header -as a tuple containing respectively the MIDI
-        format, the number of tracks and the time division-, the parsed
-        track data and the number of bytes read.
+        format, the number of tracks and the time division- and the parsed
+        track data, a list of events for every track.
         """
         try:
-            f = open(file, 'r')
+            f = open(file, 'rb')
         except:
             raise IOError('File not found')
         self.bytes_read = 0
-        header = self.parse_midi_file_header(f)
-        tracks = header[1]
-        result = []
-        while tracks > 0:
-            events = self.parse_track(f)
-            result.append(events)
-            tracks -= 1
-        f.close()
+        with f:
+            header = self.parse_midi_file_header(f)
+            result = []
+            for i in range(header[1]):
+                result.append(self.parse_track(f))
         return (header, result)
 
     def parse_varbyte_as_int(self, fp, return_bytes_read=True):
@@ -370,14 +405,11 @@ class MidiFile:
         r = 0x80
         while r & 0x80:
             try:
-                r = self.bytes_to_int(fp.read(1))
+                r = fp.read(1)[0]
                 self.bytes_read += 1
             except:
                 raise IOError("Couldn't read variable length byte from file.")
-            if r & 0x80:
-                result = (result << 7) + (r & 0x7F)
-            else:
-                result = (result << 7) + r
+            result = (result << 7) + (r & 0x7F)
             bytes_read += 1
         if not return_bytes_read:
             return result
@@ -385,6 +417,118 @@ class MidiFile:
             return (result, bytes_read)
 
 
+class MappedMidiFile(MidiFile):
+
+    """A MidiFile that maps a MIDI file into memory and only decodes the
+    tracks that are used.
+
+    Opening a file reads its header and the offsets of its track chunks.
+    The MappedMidiFile can then be indexed and iterated over like the list
+    of tracks returned by MidiFile.parse_midi_file, but every track is
+    decoded from the mapped file when it is accessed.
+
+    Example:
+    >>> with MappedMidiFile('song.mid') as m:
+    ...     tempo = [e for e in m.iter_track(0) if e[1:3] == (0xFF, 81)]
+    """
+
+    def __init__(self, file=None):
+        self.header = None
+        self.offsets = []
+        self._file = None
+        self._map = None
+        if file is not None:
+            self.open(file)
+
+    def open(self, file):
+        """Map the file and index its tracks.
+
+        Raise the same exceptions as MidiFile.parse_midi_file when the
+        header or the track headers are not valid.
+        """
+        self.close()
+        try:
+            self._file = open(file, 'rb')
+        except:
+            raise IOError('File not found')
+        try:
+            try:
+                self._map = mmap.mmap(self._file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            except ValueError:
+                raise HeaderError('Not a valid MIDI file header. Byte 0.')
+            self.bytes_read = 0
+            self.header = self.parse_midi_file_header(self._map)
+            self.offsets = []
+            for i in range(self.header[1]):
+                chunk_size = self.parse_track_header(self._map)
+                start = self._map.tell()
+                if start + chunk_size > len(self._map):
+                    raise IOError("Couldn't read track from file. Byte %d."
+                            % start)
+                self.offsets.append((start, chunk_size))
+                self._map.seek(chunk_size, os.SEEK_CUR)
+                self.bytes_read += chunk_size
+        except:
+            self.close()
+            raise
+        return self
+
+    def close(self):
+        """Unmap and close the file.
+
+        Raise a BufferError when a track is still being iterated over; the
+        file stays open then.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def iter_track(self, index):
+        """Iterate over the events of the track at index without copying
+        the track, see MidiFile.iter_events."""
+        (start, chunk_size) = self.offsets[index]
+        self.bytes_read = start
+        return self.iter_events(memoryview(self._map)[start:start
+                                + chunk_size])
+
+    def MIDI_to_Composition(self, file):
+        """Convert a MIDI file to a Composition like
+        MidiFile.MIDI_to_Composition and close the file when done."""
+        with self:
+            return MidiFile.MIDI_to_Composition(self, file)
+
+    def parse_midi_file(self, file):
+        """Map the file and return its header and the MappedMidiFile, which
+        decodes the tracks when they are accessed.
+
+        The file stays open until the MappedMidiFile is closed.
+        """
+        self.open(file)
+        return (self.header, self)
+
+    def __getitem__(self, index):
+        """Return the list of events of the track at index."""
+        return list(self.iter_track(index))
+
+    def __iter__(self):
+        for i in range(len(self.offsets)):
+            yield self[i]
+
+    def __len__(self):
+        """Return the number of tracks."""
+        return len(self.offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 if __name__ == '__main__':
     from sys import argv
     from . import fluidsynth
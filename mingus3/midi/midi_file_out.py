@@ -20,30 +20,71 @@
 """Functions that can generate MIDI files from the objects in
 mingus.containers."""
 
+import multiprocessing
+import os
+from struct import pack
 from .midi_track import MidiTrack
-from binascii import a2b_hex
+from .midi_events import FILE_HEADER
 
 class MidiFile(object):
 
     """A class that generates MIDI files from MidiTracks."""
 
     tracks = []
-    time_division = "\x00\x48"
+    time_division = b'\x00\x48'
 
     def __init__(self, tracks=[]):
         self.reset()
         self.tracks = tracks
 
     def get_midi_data(self):
-        """Collect and return the raw, binary MIDI data from the tracks."""
-        tracks = [t.get_midi_data() for t in self.tracks if t.track_data != '']
-        return self.header() + ''.join(tracks)
+        """Collect and return the raw, binary MIDI data from the tracks.
+
+        The header and every track are written into one bytearray, which is
+        returned.
+        """
+        data = bytearray(self.header())
+        for t in self.tracks:
+            if t.track_data:
+                t.write_into(data)
+        return data
 
     def header(self):
         """Return a header for type 1 MIDI file."""
-        tracks = a2b_hex('%04x' % len([t for t in self.tracks if
-            t.track_data != '']))
-        return 'MThd\x00\x00\x00\x06\x00\x01' + tracks + self.time_division
+        tracks = len([t for t in self.tracks if t.track_data])
+        return FILE_HEADER + pack('>LHH', 6, 1, tracks) + self.time_division
+
+    def write_stream(self, file, tracks, bpm=120):
+        """Write a type 1 MIDI file to file, a binary file object that
+        supports seek, with a track for every Track, or iterable of Bars, in
+        tracks.
+
+        The tracks are converted one Bar at a time and written straight to
+        the file, so generators producing the tracks and their Bars keep
+        the memory use flat however long the music is. The number of
+        tracks and the length of every track chunk are patched in once they
+        are known. Return the number of bytes written.
+        """
+        start = file.tell()
+        file.write(FILE_HEADER + pack('>LHH', 6, 1, 0) + self.time_division)
+        end = file.tell()
+        count = 0
+        for track in tracks:
+            t = MidiTrack(bpm)
+            chunk = file.tell()
+            file.write(t.header())
+            for data in t.iter_Track(track):
+                file.write(data)
+            file.write(t.end_of_track())
+            end = file.tell()
+            file.seek(chunk + 4)
+            file.write(pack('>L', end - chunk - 8))
+            file.seek(end)
+            count += 1
+        file.seek(start + 10)
+        file.write(pack('>H', count))
+        file.seek(end)
+        return end - start
 
     def reset(self):
         """Reset every track."""
@@ -78,9 +119,9 @@ def write_Note(file, note, bpm=120, repeat=0, verbose=False):
     t = MidiTrack(bpm)
     m.tracks = [t]
     while repeat >= 0:
-        t.set_deltatime('\x00')
+        t.set_deltatime(0)
         t.play_Note(note)
-        t.set_deltatime("\x48")
+        t.set_deltatime(0x48)
         t.stop_Note(note)
         repeat -= 1
     return m.write_file(file, verbose)
@@ -91,9 +132,9 @@ def write_NoteContainer(file, notecontainer, bpm=120, repeat=0, verbose=False):
     t = MidiTrack(bpm)
     m.tracks = [t]
     while repeat >= 0:
-        t.set_deltatime('\x00')
+        t.set_deltatime(0)
         t.play_NoteContainer(notecontainer)
-        t.set_deltatime("\x48")
+        t.set_deltatime(0x48)
         t.stop_NoteContainer(notecontainer)
         repeat -= 1
     return m.write_file(file, verbose)
@@ -127,19 +168,73 @@ def write_Track(file, track, bpm=120, repeat=0, verbose=False):
         repeat -= 1
     return m.write_file(file, verbose)
 
-def write_Composition(file, composition, bpm=120, repeat=0, verbose=False):
-    """Write a mingus.Composition to a MIDI file."""
-    m = MidiFile()
-    t = []
-    for x in range(len(composition.tracks)):
-        t += [MidiTrack(bpm)]
-    m.tracks = t
+def _encode_Track(args):
+    """Return a MidiTrack playing a (track, bpm, repeat) tuple, for
+    write_Composition."""
+    (track, bpm, repeat) = args
+    t = MidiTrack(bpm)
     while repeat >= 0:
-        for i in range(len(composition.tracks)):
-            m.tracks[i].play_Track(composition.tracks[i])
+        t.play_Track(track)
         repeat -= 1
+    return t
+
+def write_Composition(file, composition, bpm=120, repeat=0, verbose=False,
+                      workers=1):
+    """Write a mingus.Composition to a MIDI file.
+
+    The tracks are encoded in this process by default. With more than one
+    worker they are encoded concurrently in a pool of worker processes,
+    None meaning one per CPU; the file is the same either way.
+    """
+    jobs = [(track, bpm, repeat) for track in composition.tracks]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    m = MidiFile()
+    if workers <= 1 or len(jobs) <= 1:
+        m.tracks = [_encode_Track(job) for job in jobs]
+    else:
+        with multiprocessing.Pool(min(workers, len(jobs))) as pool:
+            m.tracks = pool.map(_encode_Track, jobs)
     return m.write_file(file, verbose)
 
+def _stream(file, tracks, bpm, verbose):
+    """Write tracks to file, a file name or a binary file object, with
+    MidiFile.write_stream."""
+    m = MidiFile()
+    if hasattr(file, 'write'):
+        size = m.write_stream(file, tracks, bpm)
+    else:
+        try:
+            f = open(file, 'wb')
+        except:
+            print("Couldn't open '%s' for writing." % file)
+            return False
+        with f:
+            size = m.write_stream(f, tracks, bpm)
+    if verbose:
+        print('Written %d bytes to %s.' % (size, file))
+    return True
+
+def stream_Track(file, track, bpm=120, verbose=False):
+    """Write a mingus.Track, or any iterable of Bars, to a MIDI file one Bar
+    at a time.
+
+    The file can be a file name or a binary file object that supports seek.
+    Like write_Track, but the Bars can come from a generator and are never
+    all kept in memory.
+    """
+    return _stream(file, [track], bpm, verbose)
+
+def stream_Composition(file, composition, bpm=120, verbose=False):
+    """Write a mingus.Composition, or any iterable of Tracks, to a MIDI file
+    one Bar at a time.
+
+    The file can be a file name or a binary file object that supports seek.
+    The Tracks can also be iterables of Bars and both can be generators.
+    """
+    return _stream(file, getattr(composition, 'tracks', composition), bpm,
+                   verbose)
+
 if __name__ == '__main__':
     from mingus.containers.NoteContainer import NoteContainer
     from mingus.containers.Bar import Bar
@@ -24,19 +24,37 @@ The MIDI file format specification I used can be found here:
 http://www.sonicspot.com/guide/midifiles.html
 """
 
-from binascii import a2b_hex
 from struct import pack, unpack
-from math import log
 from .midi_events import *
 from mingus3.core.keys import Key, major_keys, minor_keys
 from mingus3.containers.note import Note
 
+
+def _varbyte(value):
+    """Return value as a variable length byte, see
+    MidiTrack.int_to_varbyte."""
+    res = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        res.append(value & 0x7F | 0x80)
+        value >>= 7
+    res.reverse()
+    return bytes(res)
+
+# The variable length bytes of all the values that fit in two bytes
+_varbytes = [_varbyte(i) for i in range(0x4000)]
+
+
 class MidiTrack(object):
 
     """A class used to generate MIDI events from the objects in
-    mingus.containers."""
+    mingus.containers.
+
+    The events are appended to track_data, a bytearray, which grows in
+    place.
+    """
 
-    track_data = ''
+    track_data = b''
     delta_time = b'\x00'
     delay = 0
     bpm = 120
@@ -44,7 +62,7 @@ class MidiTrack(object):
     instrument = 1
 
     def __init__(self, start_bpm=120):
-        self.track_data = ''
+        self.track_data = bytearray()
         self.set_tempo(start_bpm)
 
     def end_of_track(self):
@@ -60,11 +78,13 @@ class MidiTrack(object):
         """
         velocity = 64
         channel = 1
-        if hasattr(note, 'dynamics'):
-            if 'velocity' in note.dynamics:
-                velocity = note.dynamics['velocity']
-            if 'channel' in note.dynamics:
-                channel = note.dynamics['channel']
+        if hasattr(note, '_dynamics'):
+            dynamics = note._dynamics
+        else:
+            dynamics = getattr(note, 'dynamics', None)
+        if dynamics:
+            velocity = dynamics.get('velocity', velocity)
+            channel = dynamics.get('channel', channel)
         if hasattr(note, 'channel'):
             channel = note.channel
         if hasattr(note, 'velocity'):
@@ -72,7 +92,7 @@ class MidiTrack(object):
         if self.change_instrument:
             self.set_instrument(channel, self.instrument)
             self.change_instrument = False
-        self.track_data += self.note_on(channel, int(note) + 12, velocity)
+        self._write_event(NOTE_ON, channel, int(note) + 12, velocity)
 
     def play_NoteContainer(self, notecontainer):
         """Convert a mingus.containers.NoteContainer to the equivalent MIDI
@@ -112,30 +132,59 @@ class MidiTrack(object):
     def play_Track(self, track):
         """Convert a Track object to MIDI events and write them to the
         track_data."""
+        self._start_Track(track)
+        for bar in track.bars:
+            self.play_Bar(bar)
+
+    def iter_Track(self, track):
+        """Convert a Track, or any iterable of Bars, to MIDI events one Bar
+        at a time.
+
+        Yield the track_data as soon as it holds events and start a new
+        one, so the MidiTrack only keeps the events of a single Bar in
+        memory. The end of track event is not included.
+        """
+        self._start_Track(track)
+        for bar in getattr(track, 'bars', track):
+            if self.track_data:
+                yield self._flush()
+            self.play_Bar(bar)
+        if self.track_data:
+            yield self._flush()
+
+    def _flush(self):
+        """Return the track_data and replace it by an empty one."""
+        data = self.track_data
+        self.track_data = bytearray()
+        return data
+
+    def _start_Track(self, track):
+        """Add the name of track and prepare the change to its
+        instrument."""
         if hasattr(track, 'name'):
             self.set_track_name(track.name)
         self.delay = 0
-        instr = track.instrument
+        instr = getattr(track, 'instrument', None)
         if hasattr(instr, 'instrument_nr'):
             self.change_instrument = True
             self.instrument = instr.instrument_nr
-        for bar in track:
-            self.play_Bar(bar)
 
     def stop_Note(self, note):
         """Add a note_off event for note to event_track."""
         velocity = 64
         channel = 1
-        if hasattr(note, 'dynamics'):
-            if 'velocity' in note.dynamics:
-                velocity = note.dynamics['velocity']
-            if 'channel' in note.dynamics:
-                channel = note.dynamics['channel']
+        if hasattr(note, '_dynamics'):
+            dynamics = note._dynamics
+        else:
+            dynamics = getattr(note, 'dynamics', None)
+        if dynamics:
+            velocity = dynamics.get('velocity', velocity)
+            channel = dynamics.get('channel', channel)
         if hasattr(note, 'channel'):
             channel = note.channel
         if hasattr(note, 'velocity'):
             velocity = note.velocity
-        self.track_data += self.note_off(channel, int(note) + 12, velocity)
+        self._write_event(NOTE_OFF, channel, int(note) + 12, velocity)
 
     def stop_NoteContainer(self, notecontainer):
         """Add note_off events for each note in the NoteContainer to the
@@ -161,27 +210,42 @@ class MidiTrack(object):
         call this function when you're done adding data (when you're not
         using get_midi_data).
         """
-        chunk_size = a2b_hex('%08x' % (len(self.track_data)
-                              + len(self.end_of_track())))
-        return TRACK_HEADER + chunk_size
+        return TRACK_HEADER + pack('>L', len(self.track_data)
+                                   + len(self.end_of_track()))
 
     def get_midi_data(self):
         """Return the MIDI data in bytes for this track.
 
         Include header, track_data and the end of track meta event.
         """
-        return self.header() + self.track_data + self.end_of_track()
+        return bytes(self.write_into(bytearray()))
+
+    def write_into(self, buffer):
+        """Append the header, the track_data and the end of track meta
+        event to buffer, a bytearray, and return it."""
+        buffer += self.header()
+        buffer += self.track_data
+        buffer += self.end_of_track()
+        return buffer
 
     def midi_event(self, event_type, channel, param1, param2=None):
         """Convert and return the paraters as a MIDI event in bytes."""
         assert event_type < 0x80 and event_type >= 0
         assert channel < 16 and channel >= 0
-        tc = a2b_hex('%x%x' % (event_type, channel))
         if param2 is None:
-            params = a2b_hex('%02x' % param1)
-        else:
-            params = a2b_hex('%02x%02x' % (param1, param2))
-        return self.delta_time + tc + params
+            return self.delta_time + bytes((event_type << 4 | channel,
+                                            param1))
+        return self.delta_time + bytes((event_type << 4 | channel, param1,
+                                        param2))
+
+    def _write_event(self, event_type, channel, param1, param2):
+        """Append a MIDI event with two parameters to the track_data."""
+        assert channel < 16 and channel >= 0
+        data = self.track_data
+        data += self.delta_time
+        data.append(event_type << 4 | channel)
+        data.append(param1)
+        data.append(param2)
 
     def note_off(self, channel, note, velocity):
         """Return bytes for a 'note off' event."""
@@ -197,7 +261,7 @@ class MidiTrack(object):
 
     def reset(self):
         """Reset track_data and delta_time."""
-        self.track_data = ''
+        self.track_data = bytearray()
         self.delta_time = b'\x00'
 
     def set_deltatime(self, delta_time):
@@ -211,7 +275,7 @@ class MidiTrack(object):
 
     def select_bank(self, channel, bank):
         """Return the MIDI event for a select bank controller event."""
-        return self.controller_event(BANK_SELECT, channel, bank)
+        return self.controller_event(channel, BANK_SELECT, bank)
 
     def program_change_event(self, channel, instr):
         """Return the bytes for a program change controller event."""
@@ -225,11 +289,7 @@ class MidiTrack(object):
     def set_tempo_event(self, bpm):
         """Calculate the microseconds per quarter note."""
         ms_per_min = 60000000
-        mpqn = a2b_hex('%06x' % (ms_per_min // bpm))
-        print(type(self.delta_time))
-        print(type(META_EVENT),META_EVENT)
-        print(type(SET_TEMPO),SET_TEMPO)
-        print(type(mpqn))
+        mpqn = int(ms_per_min // bpm).to_bytes(3, 'big')
         return self.delta_time + META_EVENT + SET_TEMPO + b'\x03' + mpqn
 
     def set_meter(self, meter=(4, 4)):
@@ -238,8 +298,8 @@ class MidiTrack(object):
 
     def time_signature_event(self, meter=(4, 4)):
         """Return a time signature event for meter."""
-        numer = a2b_hex('%02x' % meter[0])
-        denom = a2b_hex('%02x' % int(log(meter[1], 2)))
+        numer = bytes((meter[0],))
+        denom = bytes((meter[1].bit_length() - 1,))
         return self.delta_time + META_EVENT + TIME_SIGNATURE + b'\x04' + numer\
              + denom + b'\x18\x08'
 
@@ -259,7 +319,7 @@ class MidiTrack(object):
             mode = b'\x00'
         if val < 0:
             val = 256 + val
-        key = a2b_hex('%02x' % val)
+        key = bytes((val,))
         return self.delta_time + META_EVENT + KEY_SIGNATURE + b'\x02' + key + mode
 
     def set_track_name(self, name):
@@ -268,6 +328,7 @@ class MidiTrack(object):
 
     def track_name_event(self, name):
         """Return the bytes for a track name meta event."""
+        name = name.encode('latin-1', 'replace')
         l = self.int_to_varbyte(len(name))
         return b'\x00' + META_EVENT + TRACK_NAME + l + name
 
@@ -278,18 +339,15 @@ class MidiTrack(object):
         first), the highest bit of the byte (mask 0x80) is set when there
         are more bytes following. The remaining 7 bits (mask 0x7F) are used
         to store the value.
-        """
-        # Warning: bit kung-fu ahead. The length of the integer in bytes
-        length = int(log(max(value, 1), 0x80)) + 1
 
-        # Remove the highest bit and move the bits to the right if length > 1
-        bytes = [value >> i * 7 & 0x7F for i in range(length)]
-        bytes.reverse()
-
-        # Set the first bit on every one but the last bit.
-        for i in range(len(bytes) - 1):
-            bytes[i] = bytes[i] | 0x80
-        return pack('%sB' % len(bytes), *bytes)
+        Raise a ValueError when value is negative.
+        """
+        if value < 0:
+            raise ValueError("Can't store a negative value in a variable "
+                             "length byte: %d" % value)
+        if value < 0x4000:
+            return _varbytes[value]
+        return _varbyte(value)
 
 
 if __name__ == "__main__":
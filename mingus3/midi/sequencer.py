@@ -28,7 +28,10 @@ See SequencerObserver for a pre made, easy to extend base class that can be
 attached to the Sequencer.
 """
 
+from fractions import Fraction
+
 from mingus3.containers.instrument import MidiInstrument
+from mingus3.core import value
 
 class Sequencer(object):
 
@@ -225,7 +228,7 @@ class Sequencer(object):
         self.notify_listeners(self.MSG_PLAY_BARS, {'bars': bars,
             'channels': channels, 'bpm': bpm})
         qn_length = 60.0 / bpm  # length of a quarter note
-        tick = 0.0  # place in beat from 0.0 to bar.length
+        tick = Fraction(0)  # place in beat from 0 to bar.length
         cur = [0] * len(bars)  # keeps the index of the NoteContainer under
                                # investigation in each of the bars
         playing = []  # The NoteContainers being played.
@@ -237,7 +240,8 @@ class Sequencer(object):
             playing_new = []
             for (n, x) in enumerate(cur):
                 (start_tick, note_length, nc) = bars[n][x]
-                if start_tick <= tick:
+                if Fraction(start_tick).limit_denominator(1 << 16) <= tick:
+                    note_length = value.to_fraction(note_length)
                     self.play_NoteContainer(nc, channels[n])
                     playing_new.append([note_length, n])
                     playing.append([note_length, nc, channels[n], n])
@@ -250,9 +254,8 @@ class Sequencer(object):
 
             # Sort the list and sleep for the shortest duration
             if len(playing_new) != 0:
-                playing_new.sort()
-                shortest = playing_new[-1][0]
-                ms = qn_length * (4.0 / shortest)
+                shortest = min(p[0] for p in playing_new)
+                ms = qn_length * 4.0 * float(shortest)
                 self.sleep(ms)
                 self.notify_listeners(self.MSG_SLEEP, {'s': ms})
             else:
@@ -261,9 +264,8 @@ class Sequencer(object):
                 # make sure that at least the notes that are still playing get
                 # handled correctly.
                 if len(playing) != 0:
-                    playing.sort()
-                    shortest = playing[-1][0]
-                    ms = qn_length * (4.0 / shortest)
+                    shortest = min(p[0] for p in playing)
+                    ms = qn_length * 4.0 * float(shortest)
                     self.sleep(ms)
                     self.notify_listeners(self.MSG_SLEEP, {'s': ms})
                 else:
@@ -273,15 +275,15 @@ class Sequencer(object):
                     return {}
 
             # Add shortest interval to tick
-            tick += 1.0 / shortest
+            tick += shortest
 
             # This final piece adjusts the duration in `playing` and checks if a
             # NoteContainer should be stopped.
             new_playing = []
             for (length, nc, chan, n) in playing:
-                duration = 1.0 / length - 1.0 / shortest
-                if duration >= 0.00001:
-                    new_playing.append([1.0 / duration, nc, chan, n])
+                duration = length - shortest
+                if duration > 0:
+                    new_playing.append([duration, nc, chan, n])
                 else:
                     self.stop_NoteContainer(nc, chan)
                     if cur[n] < len(bars[n]) - 1:
@@ -297,7 +299,7 @@ class Sequencer(object):
         """Play a Track object."""
         self.notify_listeners(self.MSG_PLAY_TRACK, {'track': track, 'channel'
                               : channel, 'bpm': bpm})
-        for bar in track:
+        for bar in track.bars:
             res = self.play_Bar(bar, channel, bpm)
             if res != {}:
                 bpm = res['bpm']
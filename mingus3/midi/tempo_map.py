@@ -0,0 +1,191 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+#    mingus - Music theory Python package, tempo_map module.
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Convert the ticks of a MIDI file to seconds and bars.
+
+A TempoMap keeps the tempo changes and the time signatures of a MIDI file
+as breakpoints sorted on their ticks. Every tempo breakpoint also stores the
+microseconds passed before it and every meter breakpoint the bar it starts,
+so a conversion only has to look up a breakpoint with bisect and count from
+there.
+"""
+
+from bisect import bisect_right
+
+from mingus3.containers import arrays
+
+
+class TempoMap(object):
+
+    """The tempo changes and time signatures of a MIDI file.
+
+    Tempos are set in microseconds per quarter note, like in the set tempo
+    meta event. Before the first tempo change the tempo is 120 bpm and
+    before the first time signature the meter is 4/4.
+
+    Example:
+    >>> m = TempoMap(480)
+    >>> m.add_tempo(1920, 1000000)
+    >>> m.tick_to_seconds(2400)
+    3.0
+    """
+
+    def __init__(self, ticks_per_beat=480):
+        if ticks_per_beat <= 0:
+            raise ValueError('ticks_per_beat should be positive')
+        self.ticks_per_beat = ticks_per_beat
+        self._tempos = {0: 500000}
+        self._meters = {0: (4, 4)}
+        self._tempo_table = None
+        self._meter_table = None
+
+    def add_tempo(self, tick, tempo):
+        """Set the tempo to tempo microseconds per quarter note from tick
+        on."""
+        self._tempos[tick] = tempo
+        self._tempo_table = None
+
+    def add_bpm(self, tick, bpm):
+        """Set the tempo to bpm quarter notes per minute from tick on."""
+        self.add_tempo(tick, 60000000.0 / bpm)
+
+    def add_meter(self, tick, meter):
+        """Set the meter to a (numerator, denominator) tuple from tick on.
+
+        Time signatures should start bars; one that does not ends the bar
+        before it early.
+        """
+        self._meters[tick] = tuple(meter)
+        self._meter_table = None
+
+    def _tempo_breakpoints(self):
+        """Return the ticks, the tempos and the microseconds at the start of
+        every tempo breakpoint."""
+        if self._tempo_table is None:
+            ticks = sorted(self._tempos)
+            tempos = [self._tempos[t] for t in ticks]
+            micros = [0.0]
+            for i in range(1, len(ticks)):
+                micros.append(micros[-1] + (ticks[i] - ticks[i - 1])
+                              * tempos[i - 1] / float(self.ticks_per_beat))
+            self._tempo_table = (ticks, tempos, micros)
+        return self._tempo_table
+
+    def _meter_breakpoints(self):
+        """Return the ticks, the meters and the bar number at the start of
+        every meter breakpoint."""
+        if self._meter_table is None:
+            ticks = sorted(self._meters)
+            meters = [self._meters[t] for t in ticks]
+            bars = [0]
+            for i in range(1, len(ticks)):
+                bar_ticks = self._bar_ticks(meters[i - 1])
+                bars.append(bars[-1] - int(-(ticks[i] - ticks[i - 1])
+                            // bar_ticks))
+            self._meter_table = (ticks, meters, bars)
+        return self._meter_table
+
+    def _bar_ticks(self, meter):
+        """Return the number of ticks in a bar of meter."""
+        return self.ticks_per_beat * 4.0 * meter[0] / meter[1]
+
+    def tempo_at(self, tick):
+        """Return the tempo at tick in microseconds per quarter note."""
+        (ticks, tempos, micros) = self._tempo_breakpoints()
+        return tempos[bisect_right(ticks, tick) - 1]
+
+    def bpm_at(self, tick):
+        """Return the tempo at tick in quarter notes per minute."""
+        return 60000000.0 / self.tempo_at(tick)
+
+    def meter_at(self, tick):
+        """Return the meter at tick as a (numerator, denominator) tuple."""
+        (ticks, meters, bars) = self._meter_breakpoints()
+        return meters[bisect_right(ticks, tick) - 1]
+
+    def tick_to_seconds(self, tick):
+        """Return the number of seconds from the start to tick."""
+        (ticks, tempos, micros) = self._tempo_breakpoints()
+        i = bisect_right(ticks, tick) - 1
+        return (micros[i] + (tick - ticks[i]) * tempos[i]
+                / float(self.ticks_per_beat)) / 1000000.0
+
+    def seconds_to_tick(self, seconds):
+        """Return the tick, as a float, at seconds from the start."""
+        (ticks, tempos, micros) = self._tempo_breakpoints()
+        micro = seconds * 1000000.0
+        i = max(bisect_right(micros, micro) - 1, 0)
+        return ticks[i] + (micro - micros[i]) * self.ticks_per_beat \
+            / float(tempos[i])
+
+    def tick_to_bar(self, tick):
+        """Return the (bar, beat) at tick.
+
+        Bars are counted from 0 and beats from 0.0 in the unit of the
+        meter, so beat 1.5 in 6/8 lies halfway between the second and the
+        third eighth note.
+        """
+        (ticks, meters, bars) = self._meter_breakpoints()
+        i = bisect_right(ticks, tick) - 1
+        bar_ticks = self._bar_ticks(meters[i])
+        (n, offset) = divmod(tick - ticks[i], bar_ticks)
+        return (bars[i] + int(n), offset * meters[i][1]
+                / (self.ticks_per_beat * 4.0))
+
+    def bar_to_tick(self, bar, beat=0):
+        """Return the tick, as a float, at beat in bar; the inverse of
+        tick_to_bar."""
+        (ticks, meters, bars) = self._meter_breakpoints()
+        i = max(bisect_right(bars, bar) - 1, 0)
+        return (ticks[i] + (bar - bars[i]) * self._bar_ticks(meters[i])
+                + beat * self.ticks_per_beat * 4.0 / meters[i][1])
+
+    def ticks_to_seconds(self, ticks):
+        """Convert a sequence of ticks to seconds at once.
+
+        Return a NumPy array when NumPy is installed and a list otherwise.
+        """
+        numpy = arrays.numpy
+        if numpy is None:
+            return [self.tick_to_seconds(t) for t in ticks]
+        (points, tempos, micros) = self._tempo_breakpoints()
+        ticks = numpy.asarray(ticks, dtype='d')
+        i = numpy.searchsorted(points, ticks, 'right') - 1
+        return (numpy.asarray(micros)[i] + (ticks - numpy.asarray(points)[i])
+                * numpy.asarray(tempos, dtype='d')[i] / self.ticks_per_beat
+                ) / 1000000.0
+
+    def seconds_to_ticks(self, seconds):
+        """Convert a sequence of times in seconds to ticks at once.
+
+        Return a NumPy array when NumPy is installed and a list otherwise.
+        """
+        numpy = arrays.numpy
+        if numpy is None:
+            return [self.seconds_to_tick(s) for s in seconds]
+        (points, tempos, micros) = self._tempo_breakpoints()
+        micro = numpy.asarray(seconds, dtype='d') * 1000000.0
+        i = numpy.maximum(numpy.searchsorted(micros, micro, 'right') - 1, 0)
+        return (numpy.asarray(points, dtype='d')[i] + (micro
+                - numpy.asarray(micros)[i]) * self.ticks_per_beat
+                / numpy.asarray(tempos, dtype='d')[i])
+
+    def __repr__(self):
+        """Return a string representing the TempoMap."""
+        return str([sorted(self._tempos.items()),
+                    sorted(self._meters.items())])
@@ -43,9 +43,15 @@ import test_bar
 import test_track
 import test_composition
 import test_suite
+import test_note_array
 
 # MIDI TESTS HERE ...
 
+import test_midi_file_in
+import test_midi_track
+import test_event_table
+import test_tempo_map
+
 import test_fft
 import test_tablature
 import test_tunings
@@ -74,6 +80,13 @@ containers = [
     test_track,
     test_composition,
     test_suite,
+    test_note_array,
+    ]
+midi = [
+    test_midi_file_in,
+    test_midi_track,
+    test_event_table,
+    test_tempo_map,
     ]
 extra = [
         test_fft, 
@@ -84,5 +97,6 @@ extra = [
 
 # Run all tests
 
-suite = unittest.TestSuite([x.suite() for x in core + containers + extra])
+suite = unittest.TestSuite([x.suite() for x in core + containers + midi +
+                             extra])
 unittest.TextTestRunner(verbosity=2).run(suite)
@@ -7,6 +7,8 @@ from mingus3.containers.bar import Bar
 from mingus3.containers.note import Note
 from mingus3.containers.note_container import NoteContainer
 from mingus3.containers.mt_exceptions import MeterFormatError
+from mingus3.core import value
+from fractions import Fraction
 import unittest
 
 
@@ -121,6 +123,75 @@ class test_Bar(unittest.TestCase):
         self.assertEqual([[0.0, ['I']], [0.25, ['IV']]],
                          b.determine_progression(True))
 
+    def test_tuplets(self):
+        for x in range(12):
+            self.assertEqual(True, self.b.place_notes('C', value.triplet(8)))
+        self.assertEqual(True, self.b.is_full())
+        self.assertEqual(False, self.b.place_notes('C', 64))
+        self.assertEqual(1.0, self.b.current_beat)
+        self.assertEqual(0.0, self.b.space_left())
+        self.b.remove_last_entry()
+        self.assertEqual(False, self.b.is_full())
+        for x in range(7):
+            self.c.place_notes('C', value.septuplet(8))
+        self.assertEqual(True, self.c.place_notes('C', 2))
+        self.assertEqual(True, self.c.is_full())
+
+    def test_get_entry_at(self):
+        self.b + 'C'
+        self.b.place_notes('E', value.triplet(8))
+        self.b.place_rest(2)
+        self.assertEqual(self.b[0], self.b.get_entry_at(0.0))
+        self.assertEqual(self.b[0], self.b.get_entry_at(0.2))
+        self.assertEqual(self.b[1], self.b.get_entry_at(0.25))
+        self.assertEqual(self.b[2], self.b.get_entry_at(0.25 + 1 / 12.0))
+        self.assertEqual(None, self.b.get_entry_at(0.9))
+        self.assertEqual(None, Bar().get_entry_at(0.0))
+        b = Bar()
+        b.place_notes('C', Fraction(3, 2))
+        self.assertEqual(b[0], b.get_entry_at(Fraction(2, 3) - Fraction(1,
+                         1 << 20)))
+        self.assertEqual(None, b.get_entry_at(Fraction(2, 3)))
+
+    def test_length(self):
+        self.b.length = 0.5
+        self.assertEqual(0.5, self.b.length)
+        self.b + 'C'
+        self.b + 'E'
+        self.assertTrue(self.b.is_full())
+
+    def test_change_note_duration(self):
+        self.b + 'C'
+        self.b + 'E'
+        self.b + 'G'
+        self.b.change_note_duration(0.25, 2)
+        self.assertEqual("[[0.0, 4, ['C-4']], [0.25, 2, ['E-4']], [0.75, 4, "
+                         "['G-4']]]", repr(self.b))
+        self.assertEqual(True, self.b.is_full())
+        self.b.change_note_duration(0.0, 8)
+        self.assertEqual(0.125, self.b[1][0])
+        self.assertEqual(self.b[2], self.b.get_entry_at(0.7))
+        self.assertEqual(False, self.b.is_full())
+
+    def test_change_last_duration(self):
+        self.assertFalse(self.b.change_last_duration(4))
+        self.b + 'C'
+        self.b.place_notes('E', Fraction(120000, 7))
+        self.assertEqual(120000 / 7.0, self.b[1][1])
+        self.assertTrue(self.b.change_last_duration(Fraction(120000, 3)))
+        self.assertEqual(Fraction(1, 4) + Fraction(3, 120000),
+                         self.b._current_beat)
+        self.b.remove_last_entry()
+        self.assertEqual(Fraction(1, 4), self.b._current_beat)
+
+    def test_place_notes_at(self):
+        self.b + 'C'
+        self.b.place_rest(4)
+        self.b.place_notes_at('E', 0.0)
+        self.b.place_notes_at(['G', 'B'], 0.25)
+        self.assertEqual("[[0.0, 4, ['C-4', 'E-4']], [0.25, 4, ['G-4', "
+                         "'B-4']]]", repr(self.b))
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_Bar)
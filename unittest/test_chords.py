@@ -344,6 +344,15 @@ class test_chords(unittest.TestCase):
             'The shorthand of %s is not %s, expecting %s' % (x,
             chords.from_shorthand(x), answers[x])), list(answers.keys())))
 
+    def test_from_shorthand_cache(self):
+        self.assertEqual(['Cbb', 'Ebb', 'Gbb'], chords.from_shorthand('Cbb'))
+        self.assertEqual(['Cbb', 'Ebb', 'Gbb'], chords.from_shorthand('Cbb'))
+        res = chords.from_shorthand('Am7')
+        res.append('B')
+        self.assertEqual(['A', 'C', 'E', 'G'], chords.from_shorthand('Am7'))
+        self.assertEqual(['G', 'B', 'D', 'F', 'A'], chords.from_shorthand('Dm|G'))
+        self.assertEqual(['G', 'B', 'D', 'F', 'A'], chords.from_shorthand('Dm|G'))
+
     def test_malformed_from_shorthand(self):
         for x in ['Bollocks', 'Asd', 'Bbasd@#45']:
             self.assertRaises(FormatError, chords.from_shorthand, x)
@@ -388,6 +397,27 @@ class test_chords(unittest.TestCase):
             'F#',
             ]]], lambda x: chords.determine(x, True), 'chord name')
 
+    def test_determine_inversions(self):
+        self.assertEqual(['C major seventh, first inversion'],
+                         chords.determine(['E', 'G', 'B', 'C']))
+        self.assertEqual([], chords.determine(['E', 'G', 'B', 'C'], True,
+                         True))
+        self.assertEqual(['CM6', 'Am7'], chords.determine(['C', 'E', 'G',
+                         'A'], True, False, True))
+
+    def test_determine_many(self):
+        self.assertEqual([['CM'], ['Am7', 'CM6'], []],
+                         chords.determine_many([[60, 64, 67, -1], [57, 60,
+                         64, 67], [60, 61, -1, -1]], True))
+        self.assertEqual([['C# minor triad']], chords.determine_many([0, 1,
+                         0, 0, 1, 0, 0, 0, 1, 0, 0, 0], bitmasks=True))
+        self.assertEqual([['Dbm']], chords.determine_many([[False, True,
+                         False, False, True, False, False, False, True, False,
+                         False, False]], True, 'b', True))
+        self.assertEqual([[]], chords.determine_many([0, 1, 0, 0, 1, 0, 0, 0,
+                         1, 0, 0, 0]))
+        self.assertEqual([], chords.determine_many([]))
+
     def test_determine_polychord(self):
         self.chordsTest([  # insano test
             [['FM|Dm'], ['D', 'F', 'A', 'C']],
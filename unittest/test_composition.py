@@ -3,13 +3,57 @@
 import sys
 sys.path += ['../']
 from mingus3.containers.composition import Composition
+from mingus3.containers.track import Track
 import unittest
 
 
 class test_Composition(unittest.TestCase):
 
     def setUp(self):
-        pass
+        self.c = Composition()
+        t = Track()
+        for n in ['C', 'E', 'G', 'B', 'C']:
+            t + n
+        self.c + t
+        t = Track()
+        t.add_notes('D', 2)
+        t.add_notes('F', 2)
+        self.c + t
+
+    def test_bar_at(self):
+        self.assertEqual([0, 0], self.c.bar_at(0.5))
+        self.assertEqual([1, None], self.c.bar_at(1.0))
+
+    def test_notes_at(self):
+        self.assertEqual("[(0.0, 2, ['D-4']), (0.25, 4, ['E-4'])]",
+                         repr(self.c.notes_at(0.25)))
+        self.assertEqual("[(1.0, 4, ['C-4'])]", repr(self.c.notes_at(1.0)))
+
+    def test_notes_between(self):
+        self.assertEqual("[(0.5, 4, ['G-4']), (0.5, 2, ['F-4']), (0.75, 4, "
+                         "['B-4']), (1.0, 4, ['C-4'])]",
+                         repr(self.c.notes_between(0.5, 2.0)))
+
+    def test_transpose(self):
+        self.c[0][0].place_rest(4)
+        self.c.transpose('b3')
+        self.assertEqual("[(0.0, 2, ['F-4']), (0.25, 4, ['G-4'])]",
+                         repr(self.c.notes_at(0.25)))
+        self.assertEqual("[(1.0, 4, ['Eb-4'])]", repr(self.c.notes_at(1.0)))
+        self.c.transpose('b3', False)
+        self.assertEqual("[(1.0, 4, ['C-4'])]", repr(self.c.notes_at(1.0)))
+        self.c.augment()
+        self.assertEqual("[(0.5, 2, ['F#-4'])]", repr(self.c[1].notes_at(0.5)))
+
+    def test_fork(self):
+        f = self.c.fork()
+        self.assertTrue(f[1].bars[0] is self.c[1].bars[0])
+        f.transpose('5')
+        self.assertEqual("[(0.0, 2, ['D-4'])]", repr(self.c[1].notes_at(0.0)))
+        self.assertEqual("[(0.0, 2, ['A-4'])]", repr(f[1].notes_at(0.0)))
+        f.add_note('A')
+        self.assertEqual(1, len(self.c[1]))
+        self.assertEqual(2, len(f[1]))
 
 
 def suite():
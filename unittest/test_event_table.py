@@ -0,0 +1,100 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sys
+sys.path += ['../']
+from mingus3.midi.event_table import EventTable
+from mingus3.midi.midi_file_in import TimeDivisionError
+import mingus3.containers.arrays as arrays
+import unittest
+
+
+class test_EventTable(unittest.TestCase):
+
+    def setUp(self):
+        header = (1, 2, {'fps': False, 'ticks_per_beat': 480})
+        tracks = [[
+            (0, 0xFF, 81, b'\x07\xa1\x20'),
+            (0, 0x90, 60, 100),
+            (0, 0x90, 64, 80),
+            (240, 0x90, 60, 90),
+            (240, 0x90, 60, 0),
+            (0, 0x80, 64, 0),
+            (0, 0xB0, 7, 100),
+            (480, 0x80, 60, 0),
+            (0, 0xFF, 47, b''),
+            ], [
+            (0, 0xC9, 0, None),
+            (120, 0x99, 36, 127),
+            (120, 0x89, 36, 0),
+            (0, 0xF0, None, b'\x7e\xf7'),
+            (0, 0x99, 38, 127),
+            ]]
+        self.table = EventTable().from_tracks(header, tracks)
+
+    def test_from_tracks(self):
+        t = self.table
+        self.assertEqual(14, len(t))
+        self.assertEqual([0, 0, 0, 0, 120, 240, 240, 240, 240, 480, 480, 480,
+                         960, 960], [int(x) for x in t.tick])
+        self.assertEqual([0, 0, 0, 1, 1, 0, 1, 1, 1, 0, 0, 0, 0, 0],
+                         [int(x) for x in t.track])
+        self.assertEqual((0, 0, 0x90, 0, 60, 100, 480), list(t)[1])
+        self.assertEqual((0, 1, 0xC0, 9, 0, -1, -1), list(t)[3])
+        self.assertEqual((480, 0, 0x80, 0, 60, 0, -1), list(t)[9])
+        self.assertEqual({0: b'\x07\xa1\x20', 7: b'\x7e\xf7', 13: b''},
+                         t.data)
+
+    def test_notes(self):
+        n = self.table.notes()
+        self.assertEqual([60, 64, 36, 60, 38], list(n.pitch))
+        self.assertEqual([480, 480, 120, 720, -1], list(n.duration))
+        self.assertEqual([0, 0, 9, 0, 9], list(n.channel))
+        self.assertEqual(2, self.table.pitch_histogram()[60])
+        self.assertEqual(128, len(self.table.pitch_histogram()))
+
+    def test_meta_events(self):
+        self.assertEqual({0: b'\x07\xa1\x20'},
+                         self.table.meta_events(0x51).data)
+        self.assertEqual(2, len(self.table.meta_events()))
+
+    def test_slice_by_tick(self):
+        s = self.table.slice_by_tick(240, 480)
+        self.assertEqual([240, 240, 240, 240], [int(x) for x in s.tick])
+        self.assertEqual({2: b'\x7e\xf7'}, s.data)
+
+    def test_to_note_array(self):
+        a = self.table.to_note_array()
+        self.assertEqual([0.0, 0.0, 0.0625, 0.125], list(a.onset))
+        self.assertEqual([4, 4, 16, 8 / 3.0], list(a.duration))
+        self.assertEqual("[(0.0, 4.0, 'C-4'), (0.0, 4.0, 'E-4'), "
+                         "(0.0625, 16.0, 'C-2'), (0.125, 2.6666666666666665, "
+                         "'C-4')]", repr(a))
+        self.table.ticks_per_beat = None
+        self.assertRaises(TimeDivisionError, self.table.to_note_array)
+
+    def test_array_fallback(self):
+        numpy = arrays.numpy
+        arrays.numpy = None
+        try:
+            self.setUp()
+            t = self.table
+            self.assertEqual('array', type(t.tick).__name__)
+            self.assertEqual([480, 480, 120, 720, -1],
+                             list(t.notes().duration))
+            self.assertEqual(2, t.pitch_histogram()[60])
+            self.assertEqual({0: b'\x07\xa1\x20'}, t.meta_events(0x51).data)
+            self.assertEqual([240, 240, 240, 240],
+                             list(t.slice_by_tick(240, 480).tick))
+        finally:
+            arrays.numpy = numpy
+
+    def test_tempo_map(self):
+        m = self.table.tempo_map()
+        self.assertEqual(120.0, m.bpm_at(0))
+        self.assertEqual(0.5, m.tick_to_seconds(480))
+        self.table.ticks_per_beat = None
+        self.assertRaises(TimeDivisionError, self.table.tempo_map)
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(test_EventTable)
@@ -298,6 +298,16 @@ class test_intervals(unittest.TestCase):
         self.assertEqual('#1', intervals.determine('Cb', 'C', True))
         self.assertEqual('bb1', intervals.determine('C', 'Cbb', True))
 
+    def test_determine_many(self):
+        self.assertEqual(['major third', 'perfect unison', 'major seventh'],
+                         intervals.determine_many([('C', 'E'), ('A', 'A'),
+                         ('Cbb', 'Bbb')]))
+        self.assertEqual(['3', 'b3', '#1'], intervals.determine_many([('C',
+                         'E'), ('C', 'Eb'), ('Cb', 'C')], True))
+        self.assertEqual(['b6'], intervals.determine_many([('C', 'E')], True,
+                         False))
+        self.assertEqual([], intervals.determine_many([]))
+
     def test_from_shorthand(self):
         self.assertEqual('C', intervals.from_shorthand('A', 'b3'))
         self.assertEqual('A', intervals.from_shorthand('C', 'b3', False))
@@ -310,6 +320,15 @@ class test_intervals(unittest.TestCase):
         self.assertEqual('C###', intervals.from_shorthand('A', '##3'))
         self.assertEqual('E', intervals.from_shorthand('D', '2'))
         self.assertEqual('F#', intervals.from_shorthand('D', '3'))
+        self.assertEqual('Abb', intervals.from_shorthand('Cbb', 'b3', False))
+        self.assertEqual('E###', intervals.from_shorthand('B#', '##4'))
+        self.assertEqual('Cb#', intervals.from_shorthand('Cb#', '1'))
+        self.assertEqual(False, intervals.from_shorthand('H', '1'))
+
+    def test_exotic_accidentals(self):
+        self.assertEqual('Bbb', intervals.minor_seventh('Cb'))
+        self.assertEqual('D##', intervals.major_third('B#'))
+        self.assertEqual('Ebbbb', intervals.major_seventh('Fbbbb'))
 
     def test_invert(self):
         self.assertEqual(['C', 'E'], intervals.invert(['E', 'C']))
@@ -346,6 +365,28 @@ class test_intervals(unittest.TestCase):
         self.assertTrue(intervals.is_dissonant('C', 'Bb'))
         self.assertTrue(intervals.is_dissonant('C', 'B'))
 
+    def test_dissonance(self):
+        self.assertEqual(0, intervals.dissonance('C', 'G'))
+        self.assertEqual(0, intervals.dissonance('C', 'B#'))
+        self.assertEqual(1, intervals.dissonance('C', 'Eb'))
+        self.assertEqual(2, intervals.dissonance('C', 'F'))
+        self.assertEqual(3, intervals.dissonance('C', 'Bb'))
+        self.assertEqual(4, intervals.dissonance('C', 'F#'))
+        self.assertEqual(5, intervals.dissonance('C', 'Db'))
+        self.assertEqual(0, intervals.dissonance('F', 'C'))
+
+    def test_transposition(self):
+        t = intervals.transposition('3')
+        self.assertEqual(35, len(t))
+        self.assertEqual(('C#', 1), t['A'])
+        self.assertEqual(('E', 0), t['C'])
+        self.assertEqual(('D###', 1), t['B##'])
+        self.assertEqual(('G', 0), intervals.transposition('b3', False)['Bb'])
+        self.assertEqual(('A', -1), intervals.transposition('b3', False)['C'])
+        self.assertEqual(('C', 2), intervals.transposition('9')['Bb'])
+        self.assertTrue(t is intervals.transposition('3'))
+        self.assertRaises(ValueError, intervals.transposition, '3#')
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_intervals)
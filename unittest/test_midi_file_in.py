@@ -0,0 +1,173 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sys
+sys.path += ['../']
+from mingus3.midi.midi_file_in import MidiFile, MappedMidiFile, \
+    MIDI_to_Composition, FormatError, HeaderError, load_many
+from fractions import Fraction
+import os
+import struct
+import tempfile
+import unittest
+
+
+def varint(n):
+    res = [n & 0x7F]
+    n >>= 7
+    while n:
+        res.append(n & 0x7F | 0x80)
+        n >>= 7
+    return bytes(reversed(res))
+
+
+def track(events):
+    data = b''.join([varint(delta) + event for delta, event in events])
+    return b'MTrk' + struct.pack('>L', len(data)) + data
+
+
+class test_MidiFileIn(unittest.TestCase):
+
+    def setUp(self):
+        self.events = track([
+            (0, b'\xff\x03\x05Piano'),
+            (0, b'\xff\x51\x03\x07\xa1\x20'),
+            (0, b'\xff\x58\x04\x03\x02\x18\x08'),
+            (0, b'\xc0\x05'),
+            (0, b'\x90\x3c\x64'),
+            (0, b'\x40\x50'),
+            (480, b'\x3c\x00'),
+            (0, b'\x40\x00'),
+            (0, b'\xf0\x03\x7e\x01\xf7'),
+            (0, b'\x90\x43\x64'),
+            (200000, b'\x80\x43\x00'),
+            (0, b'\xff\x2f\x00'),
+            ])
+        data = (b'MThd' + struct.pack('>LHHH', 6, 1, 2, 480) + b'XFIH' +
+                struct.pack('>L', 2) + b'\x00\x00' + self.events +
+                track([(0, b'\xff\x2f\x00')]))
+        (fd, self.file) = tempfile.mkstemp('.mid')
+        os.write(fd, data)
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.file)
+
+    def test_iter_events(self):
+        self.assertEqual([
+            (0, 0xFF, 3, b'Piano'),
+            (0, 0xFF, 81, b'\x07\xa1\x20'),
+            (0, 0xFF, 88, b'\x03\x02\x18\x08'),
+            (0, 0xC0, 5, None),
+            (0, 0x90, 60, 100),
+            (0, 0x90, 64, 80),
+            (480, 0x90, 60, 0),
+            (0, 0x90, 64, 0),
+            (0, 0xF0, None, b'\x7e\x01\xf7'),
+            (0, 0x90, 67, 100),
+            (200000, 0x80, 67, 0),
+            (0, 0xFF, 47, b''),
+            ], list(MidiFile().iter_events(self.events[8:])))
+
+    def test_iter_events_errors(self):
+        m = MidiFile()
+        self.assertRaises(FormatError, list, m.iter_events(b'\x00\x3c\x64'))
+        self.assertRaises(FormatError, list, m.iter_events(b'\x00\x90\x3c'))
+        self.assertRaises(FormatError, list,
+                          m.iter_events(b'\x00\xff\x03\x05Pi'))
+        self.assertRaises(FormatError, list,
+                          m.iter_events(b'\x00\xff\x2f\x00\x00\x3c\x64'))
+
+    def test_parse_midi_file(self):
+        (header, tracks) = MidiFile().parse_midi_file(self.file)
+        self.assertEqual((1, 2, {'fps': False, 'ticks_per_beat': 480}),
+                         header)
+        self.assertEqual(2, len(tracks))
+        self.assertEqual(12, len(tracks[0]))
+        self.assertEqual([(0, 0xFF, 47, b'')], tracks[1])
+
+    def test_not_a_midi_file(self):
+        with open(self.file, 'wb') as f:
+            f.write(b'RIFF' + b'\x00' * 20)
+        self.assertRaises(HeaderError, MidiFile().parse_midi_file, self.file)
+
+    def test_MIDI_to_Composition(self):
+        (c, bpm) = MIDI_to_Composition(self.file)
+        self.assertEqual(120, bpm)
+        t = c.tracks[0]
+        self.assertEqual('Piano', t.name)
+        self.assertEqual(5, t.instrument.instrument_nr)
+        self.assertEqual((3, 4), t.bars[0].meter)
+        self.assertEqual("['C-4', 'E-4']", repr(t.bars[0][0][2]))
+        self.assertEqual(80, t.bars[0][0][2][1].velocity)
+        self.assertEqual("['G-4']", repr(t.bars[0][1][2]))
+
+    def test_exact_beats(self):
+        events = [(0, b'\x90\x3c\x64'), (7, b'\x80\x3c\x00'), (0,
+                  b'\x90\x40\x64'), (30000, b'\x80\x40\x00')]
+        with open(self.file, 'wb') as f:
+            f.write(b'MThd' + struct.pack('>LHHH', 6, 1, 1, 30000) +
+                    track(events))
+        b = MIDI_to_Composition(self.file)[0].tracks[0].bars[0]
+        self.assertEqual(Fraction(7, 120000), b._onsets[1])
+        self.assertEqual(Fraction(7, 120000) + Fraction(1, 4),
+                         b._onsets[2])
+
+    def test_tempo_map(self):
+        m = MidiFile()
+        m.MIDI_to_Composition(self.file)
+        self.assertEqual((3, 4), m.tempo_map.meter_at(0))
+        self.assertEqual((1, 1.0), m.tempo_map.tick_to_bar(1920))
+        self.assertEqual(1.0, m.tempo_map.tick_to_seconds(960))
+
+    def test_mapped_midi_file(self):
+        (header, tracks) = MidiFile().parse_midi_file(self.file)
+        with MappedMidiFile(self.file) as m:
+            self.assertEqual(header, m.header)
+            self.assertEqual([(32, 61), (101, 4)], m.offsets)
+            self.assertEqual(2, len(m))
+            self.assertEqual(tracks[1], m[1])
+            self.assertEqual(tracks[0], m[0])
+            self.assertEqual(tracks, list(m))
+            self.assertEqual((0, 0xFF, 3, b'Piano'), next(m.iter_track(0)))
+        m = MappedMidiFile()
+        self.assertEqual(repr(MIDI_to_Composition(self.file)),
+                         repr(m.MIDI_to_Composition(self.file)))
+        self.assertEqual(None, m._map)
+        self.assertEqual(None, m._file)
+        self.assertEqual([], MappedMidiFile().offsets)
+
+    def test_mapped_midi_file_close(self):
+        m = MappedMidiFile(self.file)
+        events = m.iter_track(0)
+        next(events)
+        self.assertRaises(BufferError, m.close)
+        events.close()
+        m.close()
+        self.assertEqual(None, m._map)
+        self.assertEqual(None, m._file)
+
+    def test_mapped_midi_file_errors(self):
+        with open(self.file, 'r+b') as f:
+            f.truncate(80)
+        self.assertRaises(IOError, MappedMidiFile, self.file)
+        with open(self.file, 'wb') as f:
+            pass
+        self.assertRaises(HeaderError, MappedMidiFile, self.file)
+
+    def test_load_many(self):
+        files = [self.file, self.file + '.missing', self.file]
+        for workers in (1, 2):
+            res = list(load_many(files, workers))
+            self.assertEqual(files, [r[0] for r in res])
+            self.assertEqual(repr(MIDI_to_Composition(self.file)),
+                             repr(res[0][1]))
+            self.assertEqual(None, res[0][2])
+            self.assertEqual(None, res[1][1])
+            self.assertTrue(isinstance(res[1][2], IOError))
+            self.assertEqual(repr(res[0][1]), repr(res[2][1]))
+        self.assertEqual(sorted(files), sorted([r[0] for r in
+                         load_many(files, 2, ordered=False)]))
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(test_MidiFileIn)
@@ -0,0 +1,192 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sys
+sys.path += ['../']
+from mingus3.midi.midi_track import MidiTrack
+from mingus3.midi.midi_file_out import MidiFile, write_Track, \
+    write_Composition, stream_Track, stream_Composition
+from mingus3.midi.midi_file_in import MidiFile as MidiFileIn
+from mingus3.containers.note import Note
+from mingus3.containers.bar import Bar
+from mingus3.containers.track import Track
+from mingus3.containers.composition import Composition
+from mingus3.containers.instrument import MidiInstrument
+import io
+import os
+import tempfile
+import unittest
+
+
+class test_MidiTrack(unittest.TestCase):
+
+    def setUp(self):
+        self.track = Track()
+        for n in ['C', 'E', ['C', 'E', 'G'], None]:
+            self.track.add_notes(n, 4)
+        self.track.instrument = MidiInstrument()
+        self.track.instrument.instrument_nr = 13
+        self.track.name = 'Test'
+
+    def test_int_to_varbyte(self):
+        t = MidiTrack()
+        self.assertEqual(b'\x00', t.int_to_varbyte(0))
+        self.assertEqual(b'\x7f', t.int_to_varbyte(0x7F))
+        self.assertEqual(b'\x81\x00', t.int_to_varbyte(0x80))
+        self.assertEqual(b'\xff\x7f', t.int_to_varbyte(0x3FFF))
+        self.assertEqual(b'\x81\x80\x00', t.int_to_varbyte(0x4000))
+        self.assertEqual(b'\xff\xff\xff\x7f', t.int_to_varbyte(0xFFFFFFF))
+        self.assertRaises(ValueError, t.int_to_varbyte, -1)
+
+    def test_play_Note(self):
+        t = MidiTrack()
+        n = Note('C', 4)
+        t.play_Note(n)
+        t.stop_Note(n)
+        self.assertEqual(None, n._dynamics)
+        self.assertEqual(b'\x00\x91\x3c\x40\x00\x81\x3c\x40',
+                         bytes(t.track_data[7:]))
+
+    def test_play_Note_like(self):
+
+        class NoteLike(object):
+            dynamics = {'velocity': 100, 'channel': 2}
+
+            def __int__(self):
+                return 48
+
+        t = MidiTrack()
+        t.play_Note(NoteLike())
+        t.stop_Note(NoteLike())
+        self.assertEqual(b'\x00\x92\x3c\x64\x00\x82\x3c\x64',
+                         bytes(t.track_data[7:]))
+
+    def test_events(self):
+        t = MidiTrack()
+        self.assertEqual(b'\x00\xff\x51\x03\x07\xa1\x20', bytes(t.track_data))
+        self.assertEqual(b'\x00\x91\x3c\x40', t.note_on(1, 60, 64))
+        self.assertEqual(b'\x00\xc1\x0d', t.program_change_event(1, 13))
+        self.assertEqual(b'\x00\xb1\x00\x01', t.select_bank(1, 1))
+        self.assertEqual(b'\x00\xff\x58\x04\x06\x03\x18\x08',
+                         t.time_signature_event((6, 8)))
+        self.assertEqual(b'\x00\xff\x59\x02\x03\x01',
+                         t.key_signature_event('f#'))
+        self.assertEqual(b'\x00\xff\x59\x02\xfd\x00',
+                         t.key_signature_event('Eb'))
+        t.set_deltatime(0x80)
+        self.assertEqual(b'\x81\x00\x81\x3c\x40', t.note_off(1, 60, 64))
+
+    def test_write_into(self):
+        t = MidiTrack()
+        t.play_Track(self.track)
+        data = bytearray(b'xyz')
+        self.assertTrue(t.write_into(data) is data)
+        self.assertEqual(b'xyz' + t.get_midi_data(), bytes(data))
+        self.assertEqual(t.header(), data[3:11])
+        self.assertEqual(len(t.track_data) + 4, len(data) - 11)
+        self.assertEqual(b'\x00\xff\x2f\x00', data[-4:])
+
+    def test_get_midi_data(self):
+        t = MidiTrack()
+        t.play_Track(self.track)
+        m = MidiFile([t, MidiTrack()])
+        m.tracks[1].reset()
+        data = m.get_midi_data()
+        self.assertEqual(b'MThd\x00\x00\x00\x06\x00\x01\x00\x01\x00\x48',
+                         bytes(data[:14]))
+        self.assertEqual(t.get_midi_data(), bytes(data[14:]))
+
+    def test_round_trip(self):
+        (fd, file) = tempfile.mkstemp('.mid')
+        os.close(fd)
+        try:
+            self.assertTrue(write_Track(file, self.track))
+            m = MidiFileIn()
+            (header, tracks) = m.parse_midi_file(file)
+        finally:
+            os.remove(file)
+        self.assertEqual((1, 1, {'fps': False, 'ticks_per_beat': 72}),
+                         header)
+        events = [e for e in tracks[0] if e[1] & 0xF0 in (0x80, 0x90)]
+        self.assertEqual([
+            (0, 0x91, 60, 64),
+            (72, 0x81, 60, 64),
+            (0, 0x91, 64, 64),
+            (72, 0x81, 64, 64),
+            (0, 0x91, 60, 64),
+            (0, 0x91, 64, 64),
+            (0, 0x91, 67, 64),
+            (72, 0x81, 60, 64),
+            (0, 0x81, 64, 64),
+            (0, 0x81, 67, 64),
+            ], events)
+        self.assertEqual((0, 0xFF, 3, b'Test'), tracks[0][1])
+        self.assertTrue((0, 0xC1, 13, None) in tracks[0])
+
+    def test_iter_Track(self):
+        t = MidiTrack()
+        t.play_Track(self.track)
+        s = MidiTrack()
+        chunks = list(s.iter_Track(self.track))
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(all(chunks))
+        self.assertEqual(bytes(t.track_data), b''.join(chunks))
+        self.assertEqual(0, len(s.track_data))
+
+    def test_stream_Composition(self):
+        c = Composition()
+        c.add_track(self.track)
+        t = Track()
+        t.add_notes('D', 2)
+        c.add_track(t)
+        (fd, file) = tempfile.mkstemp('.mid')
+        os.close(fd)
+        try:
+            write_Composition(file, c)
+            with open(file, 'rb') as f:
+                data = f.read()
+            self.assertTrue(stream_Composition(file, c))
+            with open(file, 'rb') as f:
+                self.assertEqual(data, f.read())
+        finally:
+            os.remove(file)
+        f = io.BytesIO()
+        self.assertTrue(stream_Composition(f, iter([self.track, t])))
+        self.assertEqual(data, f.getvalue())
+
+    def test_stream_Track(self):
+
+        def bars():
+            for i in range(3):
+                b = Bar()
+                b.place_notes('C', 1)
+                yield b
+
+        f = io.BytesIO()
+        self.assertTrue(stream_Track(f, bars()))
+        t = MidiTrack()
+        for b in bars():
+            t.play_Bar(b)
+        self.assertEqual(MidiFile([t]).get_midi_data(), f.getvalue())
+
+    def test_write_Composition_workers(self):
+        c = Composition()
+        c.add_track(self.track)
+        t = Track()
+        t.add_notes('D', 2)
+        c.add_track(t)
+        c.add_track(Track())
+        (fd, file) = tempfile.mkstemp('.mid')
+        os.close(fd)
+        try:
+            write_Composition(file, c, 90, 1)
+            with open(file, 'rb') as f:
+                data = f.read()
+            self.assertTrue(write_Composition(file, c, 90, 1, workers=2))
+            with open(file, 'rb') as f:
+                self.assertEqual(data, f.read())
+        finally:
+            os.remove(file)
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(test_MidiTrack)
@@ -3,6 +3,8 @@
 import sys
 sys.path += ['../']
 from mingus3.containers.note import Note
+import copy
+import pickle
 import unittest
 from mingus3.containers.mt_exceptions import NoteFormatError
 
@@ -114,6 +116,66 @@ class test_Note(unittest.TestCase):
         self.assertTrue(Note().from_shorthand("c'") == Note('C-4'))
         self.assertTrue(Note().from_shorthand("c''''''") == Note('C-9'))
 
+    def test_cached_int(self):
+        a = Note('C', 4)
+        self.assertEqual(48, int(a))
+        a.augment()
+        self.assertEqual(49, int(a))
+        a.name = 'D'
+        self.assertEqual(50, int(a))
+        a.octave = 5
+        self.assertEqual(62, int(a))
+        a.transpose('3')
+        self.assertEqual(66, int(a))
+        a.set_note('A', 3)
+        self.assertEqual(45, int(a))
+
+    def test_hash(self):
+        self.assertEqual(hash(Note('C#')), hash(Note('Db')))
+        self.assertEqual(2, len(set([Note('C'), Note('B#', 3), Note('D')])))
+
+    def test_dynamics(self):
+        a = Note('C')
+        b = Note('D')
+        a.dynamics['velocity'] = 100
+        self.assertEqual({}, b.dynamics)
+        self.assertEqual({'velocity': 100}, Note(a).dynamics)
+
+    def test_pickle(self):
+        a = Note('Eb', 5)
+        a.velocity = 90
+        a.channel = 3
+        a.string = 2
+        for b in [pickle.loads(pickle.dumps(a)), copy.deepcopy(a)]:
+            self.assertEqual(a, b)
+            self.assertEqual((90, 3, 2), (b.velocity, b.channel, b.string))
+            self.assertEqual(63, int(b))
+        self.assertFalse(hasattr(pickle.loads(pickle.dumps(Note())),
+                         'string'))
+
+    def test_copy(self):
+        a = Note('C', 5)
+        b = Note(a)
+        self.assertTrue(a._dynamics is None and b._dynamics is None)
+        a.dynamics['vibrato'] = True
+        a.velocity = 100
+        c = Note(a)
+        self.assertEqual({'vibrato': True}, c.dynamics)
+        self.assertFalse(a.dynamics is c.dynamics)
+        self.assertEqual((1, 100), (c.channel, c.velocity))
+        self.assertTrue(a._midi is c._midi)
+        self.assertFalse(hasattr(c, 'string'))
+
+    def test_extra_attributes(self):
+        a = Note('C', 5)
+        a.accent = True
+        a.string = 2
+        b = copy.deepcopy(a)
+        self.assertEqual((True, 2), (b.accent, b.string))
+        b = pickle.loads(pickle.dumps(a))
+        self.assertEqual((True, 2), (b.accent, b.string))
+        self.assertFalse(hasattr(copy.copy(Note('C')), 'accent'))
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_Note)
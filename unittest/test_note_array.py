@@ -0,0 +1,151 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sys
+sys.path += ['../']
+from mingus3.containers.note_array import NoteArray
+from mingus3.containers.note_container import NoteContainer
+from mingus3.containers.note import Note
+from mingus3.containers.bar import Bar
+from mingus3.containers.track import Track
+from mingus3.containers.mt_exceptions import MeterFormatError
+import mingus3.containers.arrays as arrays
+import unittest
+
+
+class test_NoteArray(unittest.TestCase):
+
+    def setUp(self):
+        self.track = Track()
+        for n in ['C', 'E', ['C', 'Eb', 'G'], None, 'B#', 'Fb', None, None,
+                  None, None, None, None, 'A##']:
+            self.track.add_notes(n, 4)
+        self.track.bars[0][0][2][0].velocity = 100
+
+    def test_create(self):
+        a = NoteArray([0.25, 0.0], [4, 8], [52, 48])
+        self.assertEqual(2, len(a))
+        self.assertEqual([0.0, 0.25], list(a.onset))
+        self.assertEqual([(0.0, 8.0, Note('C', 4)), (0.25, 4.0, Note('E',
+                         4))], list(a))
+        a = NoteArray([0.0], [4], [49], names=['Db'])
+        self.assertEqual('Db', list(a)[0][2].name)
+
+    def test_from_track(self):
+        a = NoteArray().from_track(self.track)
+        self.assertEqual(8, len(a))
+        self.assertEqual([0.0, 0.25, 0.5, 0.5, 0.5, 1.0, 1.25, 3.0],
+                         list(a.onset))
+        self.assertEqual([48, 52, 48, 51, 55, 60, 52, 59], list(a.pitch))
+        self.assertEqual([100, 64, 64, 64, 64, 64, 64, 64],
+                         list(a.velocity))
+
+    def test_to_track(self):
+        t = NoteArray().from_track(self.track).to_track()
+        self.assertEqual(4, len(t))
+        self.assertEqual(repr(self.track.bars[0]), repr(t.bars[0]))
+        self.assertEqual('[[0.0, 4, [\'B#-4\']], [0.25, 4, [\'Fb-4\']], '
+                         '[0.5, 2, None]]', repr(t.bars[1]))
+        self.assertEqual('[[0.0, 1, None]]', repr(t.bars[2]))
+        self.assertEqual(repr(self.track.bars[3]), repr(t.bars[3]))
+        self.assertEqual(100, t.bars[0][0][2][0].velocity)
+
+    def test_to_track_splits_notes(self):
+        a = NoteArray([0.0, 0.875], [4, 4], [48, 50])
+        t = a.to_track()
+        self.assertEqual('[[0.0, 4, [\'C-4\']], [0.25, 1.6, None], [0.875, 8, '
+                         '[\'D-4\']]]', repr(t.bars[0]))
+        self.assertEqual('[[0.0, 8, [\'D-4\']]]', repr(t.bars[1]))
+        self.assertTrue(t.bars[0][2][2][0].dynamics['tie'])
+        b = NoteArray().from_track(t)
+        self.assertEqual(([0.0, 0.875], [4.0, 4.0], [48, 50], {}),
+                         (list(b.onset), list(b.duration), list(b.pitch),
+                         b.dynamics))
+        for onset, duration in [([0.0, 0.25], [1, 4]), ([0.0, 0.0], [1,
+                                4])]:
+            b = NoteArray().from_track(NoteArray(onset, duration, [48,
+                                       52]).to_track())
+            self.assertEqual((onset, [1.0, 4.0], [48, 52]), (list(b.onset),
+                             list(b.duration), list(b.pitch)))
+        self.assertRaises(MeterFormatError, NoteArray([0.0, 0.5], [1, 4],
+                          [48, 48]).to_track)
+        self.assertRaises(MeterFormatError, NoteArray([0.0], [0], [48])
+                          .to_track)
+
+    def test_to_track_bars(self):
+        t = Track()
+        t.add_bar(Bar('C', (3, 4)))
+        t.add_notes('C', 4)
+        t.bars[0][0][2][0].dynamics['vibrato'] = True
+        t.add_bar(Bar('G', (4, 4)))
+        t.add_notes('E', 2)
+        a = NoteArray().from_track(t)
+        self.assertEqual({0: {'vibrato': True}}, a.dynamics)
+        r = a.to_track()
+        self.assertEqual([(3, 4), (4, 4)], [b.meter for b in r.bars])
+        self.assertEqual([t.bars[0].key, t.bars[1].key], [b.key for b in
+                         r.bars])
+        self.assertEqual(repr(t.bars[1]), repr(r.bars[1]))
+        self.assertEqual({'vibrato': True}, r.bars[0][0][2][0].dynamics)
+        self.assertEqual(2, len(a.slice_by_time(0.0, 1.0).to_track()))
+
+    def test_bar_and_note_container(self):
+        b = Bar()
+        b + 'C'
+        b.place_rest(4)
+        b + ['E', 'G']
+        a = NoteArray().from_bar(b)
+        self.assertEqual([0.0, 0.5, 0.5], list(a.onset))
+        self.assertEqual(repr(b), repr(a.to_bar()))
+        n = NoteContainer(['C', 'E', 'G'])
+        self.assertEqual(n, NoteArray().from_note_container(n)
+                         .to_note_container())
+
+    def test_transpose(self):
+        a = NoteArray().from_track(self.track)
+        a.transpose('3')
+        self.assertEqual(['E-4', 'G#-4', 'E-4', 'G-4', 'B-4', 'D##-5', 'Ab-4',
+                         'C###-5'], [repr(n)[1:-1] for o, d, n in a])
+        self.assertEqual([52, 56, 52, 55, 59, 64, 56, 63], list(a.pitch))
+        a.transpose('3', False)
+        self.assertEqual(repr(self.track), repr(a.to_track()).replace(
+                         '[[0.0, 1, None]]', '[[0.0, 4, None], [0.25, 4, '
+                         'None], [0.5, 4, None], [0.75, 4, None]]').replace(
+                         '[0.5, 2, None]', '[0.5, 4, None], [0.75, 4, None]'))
+
+    def test_get_range(self):
+        a = NoteArray().from_track(self.track)
+        low, high = a.get_range()
+        self.assertEqual(('C', 4), (low.name, low.octave))
+        self.assertEqual(('B#', 4), (high.name, high.octave))
+        self.assertEqual((None, None), NoteArray().get_range())
+
+    def test_filter(self):
+        a = NoteArray().from_track(self.track)
+        self.assertEqual([60], list(a.filter(a.pitch >= 60).pitch))
+        self.assertEqual([48, 48], list(a.filter([p == 48 for p in
+                         a.pitch]).pitch))
+
+    def test_slice_by_time(self):
+        a = NoteArray().from_track(self.track)
+        self.assertEqual([48, 51, 55, 60, 52], list(a.slice_by_time(0.5,
+                         2.0).pitch))
+        self.assertEqual(0, len(a.slice_by_time(2.0, 3.0)))
+
+    def test_array_fallback(self):
+        numpy = arrays.numpy
+        arrays.numpy = None
+        try:
+            a = NoteArray().from_track(self.track)
+            self.assertEqual('array', type(a.pitch).__name__)
+            a.transpose('5')
+            self.assertEqual([55, 59, 55, 58, 62, 67, 59, 66], list(a.pitch))
+            self.assertEqual([67, 66], list(a.filter([p > 62 for p in
+                             a.pitch]).pitch))
+            self.assertEqual([55, 58, 62], list(a.slice_by_time(0.5,
+                             1.0).pitch))
+        finally:
+            arrays.numpy = numpy
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(test_NoteArray)
@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 import sys
 sys.path += ['../']
-from mingus3.containers.note_container import NoteContainer
+from mingus3.containers.note_container import NoteContainer, FrozenNoteContainer
 from mingus3.containers.note import Note
 import unittest
 
@@ -146,6 +146,118 @@ class test_NoteContainers(unittest.TestCase):
         self.assertTrue(not NoteContainer().from_chord('G').is_dissonant())
         self.assertTrue(not NoteContainer().from_chord('Dm').is_dissonant())
 
+    def test_add_notes_sorted(self):
+        n = NoteContainer(['G', 'C', 'E', Note('B#', 4), ['D', 3]])
+        self.assertEqual(['D-3', 'G-4', 'C-5', 'E-5'], [repr(x)[1:-1] for x in
+                         n])
+        n.add_notes([Note('C', 5), 'A', Note('F', 2)])
+        self.assertEqual(['F-2', 'D-3', 'G-4', 'C-5', 'E-5', 'A-5'],
+                         [repr(x)[1:-1] for x in n])
+        n[0] = 'B'
+        n.add_note('C', 6)
+        self.assertEqual(['D-3', 'G-4', 'B-4', 'C-5', 'E-5', 'A-5', 'C-6'],
+                         [repr(x)[1:-1] for x in n])
+        self.assertTrue(Note('C', 5) in n)
+        self.assertTrue(Note('B#', 4) in n)
+        self.assertFalse(Note('C', 4) in n)
+        n = NoteContainer(['C', 'E', 'G'])
+        n.notes[0].transpose('5')
+        n.sort()
+        n.add_note('E', 4)
+        self.assertEqual(['E-4', 'G-4', 'G-4'], [repr(x)[1:-1] for x in n])
+        n.notes.append(Note('D', 4))
+        n.add_note('A', 4)
+        self.assertEqual(['D-4', 'E-4', 'G-4', 'G-4', 'A-4'], [repr(x)[1:-1]
+                         for x in n])
+        self.assertTrue(Note('D', 4) in n)
+        n.remove_duplicate_notes()
+        n.remove_note(Note('E', 4))
+        self.assertFalse(Note('E', 4) in n)
+        n.add_note('E', 4)
+        self.assertEqual(['D-4', 'E-4', 'G-4', 'A-4'], [repr(x)[1:-1]
+                         for x in n])
+        n.transpose('2')
+        self.assertTrue(Note('B', 4) in n)
+        self.assertFalse(Note('D', 4) in n)
+        n.add_note('A', 4)
+        self.assertEqual(['E-4', 'F#-4', 'A-4', 'B-4'],
+                         [repr(x)[1:-1] for x in n])
+
+    def test_remove_notes_at_once(self):
+        n = NoteContainer(['C', 'E', 'G', 'C-5', 'Db-5'])
+        n.remove_notes(['C', Note('C#', 5)])
+        self.assertEqual(NoteContainer(['E', 'G']), n)
+        n.notes += [Note('E'), Note('Fb'), Note('G')]
+        n.remove_duplicate_notes()
+        self.assertEqual(['E-4', 'G-4'], [repr(x)[1:-1] for x in n])
+
+    def test_freeze(self):
+        f = NoteContainer(['C', 'E', 'G']).freeze()
+        self.assertTrue(f is FrozenNoteContainer(['C', 'E', 'G']))
+        self.assertTrue(f is FrozenNoteContainer(f))
+        self.assertEqual((48, 52, 55), f.pitches)
+        self.assertEqual(hash(f), hash(FrozenNoteContainer(['B#-3', 'E-4',
+                         'G-4'])))
+        self.assertEqual(f, FrozenNoteContainer(['B#-3', 'E-4', 'G-4']))
+        self.assertEqual(f, NoteContainer(['C', 'E', 'G']))
+        self.assertEqual({f: 'C'}[FrozenNoteContainer(['C-4', 'E-4', 'G-4'])],
+                         'C')
+        self.assertTrue(Note('E') in f)
+        self.assertEqual(NoteContainer(['C', 'E', 'G']), f)
+        self.assertNotEqual(f, NoteContainer(['C', 'E', 'G', 'B']))
+        self.assertNotEqual(NoteContainer(['C', 'E']), f)
+        self.assertNotEqual(f, 'abc')
+        self.assertNotEqual(f, (48, 52, 55))
+        self.assertTrue(f in ['x', f])
+        n = NoteContainer(['C', 'E', 'G'])
+        n.notes[0].transpose('7')
+        self.assertEqual((52, 55, 59), n.freeze().pitches)
+        self.assertEqual(['C major triad'], f.determine())
+        self.assertEqual(['CM'], f.determine(True))
+
+    def test_thaw(self):
+        f = FrozenNoteContainer(['C', 'E'])
+        n = f.thaw()
+        n.add_note('G')
+        n[0].augment()
+        self.assertEqual(['C-4', 'E-4'], [repr(x)[1:-1] for x in f])
+        self.assertEqual(['C#-4', 'E-4', 'G-4'], [repr(x)[1:-1] for x in n])
+
+    def test_dissonance(self):
+        self.assertEqual(0, NoteContainer().dissonance())
+        self.assertEqual(2, NoteContainer(['C', 'E', 'G']).dissonance())
+        self.assertEqual(7, NoteContainer(['C', 'D', 'E']).dissonance())
+        n = NoteContainer(['C', 'E', 'G'])
+        self.assertTrue(n.is_consonant())
+        n.add_note('B')
+        self.assertFalse(n.is_consonant())
+        self.assertEqual(8, n.dissonance())
+        n.remove_note('B')
+        self.assertTrue(n.is_consonant())
+        n.add_notes(['F', 'A'])
+        self.assertEqual(NoteContainer(['C', 'E', 'F', 'G', 'A'])
+                         .dissonance(), n.dissonance())
+        n.transpose('3')
+        self.assertEqual(NoteContainer(['E', 'G#', 'A', 'B', 'C#'])
+                         .dissonance(), n.dissonance())
+        n = NoteContainer(['C', 'E', 'G'])
+        self.assertTrue(n.is_consonant())
+        n[0].name = 'C#'
+        n.sort()
+        self.assertFalse(n.is_consonant())
+        n.notes.append(Note('B'))
+        self.assertEqual(NoteContainer(['C#', 'E', 'G', 'B']).dissonance(),
+                         n.dissonance())
+        n = NoteContainer(['C', 'E'])
+        n.dissonance()
+        for x in ['G', ['D', 5], 'F#', 'Bb', ['C#', 3]]:
+            n.add_notes([x])
+        n.add_notes(['A', Note('Eb', 5), 'C'])
+        n.remove_notes(['E', Note('D', 5)])
+        n.remove_note('F#', 4)
+        counts = n._dissonance_counts()
+        self.assertEqual(NoteContainer(n.notes)._dissonance_counts(), counts)
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_NoteContainers)
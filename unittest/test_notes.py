@@ -3,7 +3,7 @@
 import sys
 sys.path = ['../'] + sys.path
 import mingus3.core.notes as notes
-from mingus3.core.mt_exceptions import RangeError
+from mingus3.core.mt_exceptions import RangeError, NoteFormatError
 import unittest
 
 class test_notes(unittest.TestCase):
@@ -101,6 +101,20 @@ class test_notes(unittest.TestCase):
             'The diminished note of %s is not %s, expecting %s' % (x,
                 notes.diminish(x), known[x])), list(known.keys())))
 
+    def test_spelled_pitch(self):
+        self.assertEqual((0, 0), notes.spelled_pitch('C'))
+        self.assertEqual((6, -2), notes.spelled_pitch('Bbb'))
+        self.assertEqual((3, 1), notes.spelled_pitch('Fb##'))
+        self.assertEqual((3, 1), notes.spelled_pitch('Fb##'))
+        self.assertRaises(NoteFormatError, notes.spelled_pitch, 'H')
+
+    def test_to_pitch_class_many(self):
+        self.assertEqual([0, 4, 8, 10, 11], notes.to_pitch_class_many(['C',
+                         'E', 'G#', 'Bb', 'Cb']))
+        self.assertEqual([], notes.to_pitch_class_many([]))
+        self.assertRaises(NoteFormatError, notes.to_pitch_class_many, ['C',
+                          'X'])
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_notes)
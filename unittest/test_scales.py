@@ -4,6 +4,7 @@
 import sys
 sys.path += ['../']
 import mingus3.core.scales as scales
+from mingus3.core.mt_exceptions import FormatError
 import unittest
 
 class test_scales(unittest.TestCase):
@@ -296,6 +297,47 @@ class test_scales(unittest.TestCase):
         self.assertNotEqual(scales.Major('F'), scales.Major('D'))
         self.assertNotEqual(scales.Ionian('E'), scales.Dorian('E'))
 
+    def test_determine(self):
+        self.assertEqual(['G melodic minor', 'G Bachian', 'D harmonic major'],
+                         scales.determine(['A', 'Bb', 'E', 'F#', 'G']))
+        self.assertEqual([], scales.determine(['C', 'Db', 'D']))
+        self.assertEqual([], scales.determine(['C', 'x']))
+        self.assertEqual(['F# harmonic major'], scales.determine(['F#',
+                         'E#', 'D', 'B', 'A#']))
+
+    def test_determine_many(self):
+        self.assertEqual([['F harmonic minor', 'F minor Neapolitan',
+                         'F harmonic major'], []],
+                         scales.determine_many([['C', 'Db', 'E'], ['C', 'Db',
+                         'D']]))
+
+    def test_cached_notes(self):
+        notes = scales.Major('C').ascending()
+        notes.append('D')
+        self.assertEqual(['C', 'D', 'E', 'F', 'G', 'A', 'B', 'C'],
+                         scales.Major('C').ascending())
+        self.assertEqual(['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#',
+                         'A', 'A#', 'B', 'C'], scales.Chromatic('C').ascending())
+        self.assertEqual(['A', 'A#', 'B', 'C', 'C#', 'D', 'D#', 'E', 'F',
+                         'F#', 'G', 'G#', 'A'], scales.Chromatic('a').ascending())
+        self.assertEqual(['C', 'D', 'Eb', 'F', 'G', 'A', 'Bb', 'C'],
+                         scales.Diatonic('C', (2, 6)).ascending())
+
+    def test_iterate(self):
+        self.assertEqual(scales.Octatonic('C', 2).ascending(),
+                         list(scales.Octatonic('C', 2).iterate()))
+        self.assertEqual(scales.MelodicMinor('A').descending(),
+                         list(scales.MelodicMinor('A').iterate('d')))
+        self.assertRaises(FormatError, scales.Major('C').iterate, 'x')
+        it = scales.Major('C', 10 ** 9).iterate()
+        self.assertEqual(['C', 'D', 'E'], [next(it), next(it), next(it)])
+        self.assertEqual(['C', 'D', 'E', 'F#', 'G#', 'A#', 'C', 'D', 'E',
+                         'F#', 'G#', 'A#', 'C'],
+                         list(scales.WholeTone('C', 2).iterate()))
+        self.assertEqual(22, len(scales.Major('C', 3)))
+        self.assertTrue(max([len(n) for n in
+                        scales._scale_notes_cache.values()]) <= 12)
+
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_scales)
 
@@ -0,0 +1,61 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+import sys
+sys.path += ['../']
+from mingus3.midi.tempo_map import TempoMap
+import mingus3.containers.arrays as arrays
+import unittest
+
+
+class test_TempoMap(unittest.TestCase):
+
+    def setUp(self):
+        self.m = TempoMap(480)
+        self.m.add_tempo(1920, 1000000)
+        self.m.add_meter(3840, (6, 8))
+        self.m.add_meter(7200, (3, 4))
+
+    def test_tempo(self):
+        self.assertEqual(500000, self.m.tempo_at(1919))
+        self.assertEqual(60.0, self.m.bpm_at(1920))
+        self.m.add_bpm(960, 240)
+        self.assertEqual(240.0, self.m.bpm_at(1000))
+        self.assertEqual(1.5, self.m.tick_to_seconds(1920))
+
+    def test_seconds(self):
+        self.assertEqual(0.0, self.m.tick_to_seconds(0))
+        self.assertEqual(2.0, self.m.tick_to_seconds(1920))
+        self.assertEqual(3.0, self.m.tick_to_seconds(2400))
+        self.assertEqual(480.0, self.m.seconds_to_tick(0.5))
+        self.assertEqual(2400.0, self.m.seconds_to_tick(3.0))
+
+    def test_bars(self):
+        self.assertEqual((6, 8), self.m.meter_at(5000))
+        self.assertEqual((1, 3.0), self.m.tick_to_bar(3360))
+        self.assertEqual((2, 0.0), self.m.tick_to_bar(3840))
+        self.assertEqual((3, 1.0), self.m.tick_to_bar(5520))
+        # The 3/4 starts halfway through bar 4, which is cut short
+        self.assertEqual((4, 1.0), self.m.tick_to_bar(6960))
+        self.assertEqual((5, 0.0), self.m.tick_to_bar(7200))
+        for tick in [0, 3360, 3840, 5520, 7200, 9000]:
+            self.assertEqual(tick, self.m.bar_to_tick(*self.m.tick_to_bar(
+                             tick)))
+
+    def test_bulk(self):
+        self.assertEqual([0.0, 0.5, 2.0, 3.0],
+                         list(self.m.ticks_to_seconds([0, 480, 1920, 2400])))
+        self.assertEqual([0.0, 480.0, 1920.0, 2400.0],
+                         list(self.m.seconds_to_ticks([0, 0.5, 2, 3])))
+        numpy = arrays.numpy
+        arrays.numpy = None
+        try:
+            self.assertEqual([0.0, 0.5, 2.0, 3.0],
+                             self.m.ticks_to_seconds([0, 480, 1920, 2400]))
+            self.assertEqual([0.0, 480.0, 1920.0, 2400.0],
+                             self.m.seconds_to_ticks([0, 0.5, 2, 3]))
+        finally:
+            arrays.numpy = numpy
+
+
+def suite():
+    return unittest.TestLoader().loadTestsFromTestCase(test_TempoMap)
@@ -29,6 +29,93 @@ class test_Track(unittest.TestCase):
         s + 'G#'
         self.assertEqual(s, t)
 
+    def test_time_index(self):
+        t = Track()
+        for n in ['C', 'E', None, 'G', 'A']:
+            t.add_notes(n, 4)
+        t.add_notes('C', 2)
+        self.assertEqual(0, t.bar_at(0))
+        self.assertEqual(1, t.bar_at(1.0))
+        self.assertEqual(1, t.bar_at(1.75))
+        self.assertEqual(None, t.bar_at(2.0))
+        self.assertEqual(None, t.bar_at(-0.5))
+        self.assertEqual("[(0.25, 4, ['E-4'])]", repr(t.notes_at(0.3)))
+        self.assertEqual([], t.notes_at(0.5))
+        self.assertEqual("[(0.0, 4, ['C-4']), (0.25, 4, ['E-4']), (0.75, 4, "
+                         "['G-4']), (1.0, 4, ['A-4'])]",
+                         repr(t.notes_between(0.2, 1.1)))
+        t.add_notes('B', 4)
+        self.assertEqual("[(1.75, 4, ['B-4'])]", repr(t.notes_at(1.8)))
+        t.add_bar(Bar())
+        self.assertEqual(2, t.bar_at(2.0))
+        t[0].change_note_duration(0.0, 8)
+        self.assertEqual("[(0.125, 4, ['E-4'])]", repr(t.notes_at(0.3)))
+        t[0].remove_last_entry()
+        self.assertEqual([], t.notes_between(0.5, 1.0))
+        t[0].place_notes('D', 4)
+        self.assertEqual("[(0.625, 4, ['D-4'])]", repr(t.notes_at(0.7)))
+        t.bars[0].remove_last_entry()
+        t.reset_index()
+        self.assertEqual([], t.notes_at(0.7))
+
+    def test_time_index_set_bar(self):
+        t = Track()
+        t + 'C'
+        self.assertEqual("[(0.0, 4, ['C-4'])]", repr(t.notes_at(0.0)))
+        b = Bar()
+        b + 'A'
+        t[0] = b
+        self.assertEqual("[(0.0, 4, ['A-4'])]", repr(t.notes_at(0.0)))
+
+    def test_time_index_add_notes(self):
+        t = Track()
+        t + 'C'
+        t + 'D'
+        self.assertEqual("[(0.25, 4, ['D-4'])]", repr(t.notes_at(0.3)))
+        t.bars[-1].remove_last_entry()
+        t.add_notes('E', 2)
+        self.assertEqual("[(0.25, 2, ['E-4'])]", repr(t.notes_at(0.3)))
+        self.assertEqual("[(0.25, 2, ['E-4'])]", repr(t.notes_at(0.6)))
+
+    def test_fork(self):
+        t = Track()
+        for n in ['C', 'E', 'G', 'B', 'C', 'E']:
+            t + n
+        f = t.fork()
+        self.assertTrue(f.bars[0] is t.bars[0])
+        self.assertTrue(f.bars[1] is t.bars[1])
+        f + 'G'
+        self.assertFalse(f.bars[1] is t.bars[1])
+        self.assertTrue(f.bars[0] is t.bars[0])
+        self.assertEqual(2, len(t[1]))
+        self.assertEqual(3, len(f[1]))
+        f[0].transpose('5')
+        self.assertEqual("['C-4']", repr(t.bars[0][0][2]))
+        self.assertEqual("['G-4']", repr(f.bars[0][0][2]))
+        f[0].transpose('5', False)
+        for b in f:
+            b.augment()
+        self.assertEqual("['C-4']", repr(t.bars[1][0][2]))
+        self.assertEqual("['C#-4']", repr(f.bars[1][0][2]))
+        f.diminish()
+        t.transpose('3')
+        self.assertEqual("['C-4']", repr(f.bars[0][0][2]))
+        self.assertEqual("['E-4']", repr(t.bars[0][0][2]))
+        g = f.fork()
+        g.transpose('2')
+        self.assertEqual("['C-4']", repr(f.bars[0][0][2]))
+        self.assertEqual("['D-4']", repr(g.bars[0][0][2]))
+        h = f.fork()
+        self.assertTrue(f.bars[1] is h.bars[1])
+        self.assertEqual(2, len(h[:]))
+        self.assertFalse(f.bars[1] is h.bars[1])
+        b = Bar()
+        b + 'A'
+        h[-1] = b
+        h.transpose('2')
+        self.assertTrue(h.bars[-1] is b)
+        self.assertEqual("['B-4']", repr(b[0][2]))
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_Track)
@@ -4,6 +4,7 @@ import sys
 sys.path += ['../']
 import mingus3.extra.tunings as tunings
 from mingus3.containers.note import Note
+from mingus3.containers.note_container import NoteContainer, FrozenNoteContainer
 from mingus3.core.mt_exceptions import RangeError
 import unittest
 
@@ -121,6 +122,18 @@ class test_Tunings(unittest.TestCase):
         self.assertRaises(RangeError, self.guitar6.get_Note, 3, -1)
         self.assertRaises(RangeError, self.guitar6.get_Note, 3, 25)
 
+    def test_find_chord_fingering(self):
+        am = [[0, 0, 2, 2, 1, 0], [0, 3, 2, 2, 1, 0]]
+        res = self.guitar6.find_chord_fingering(NoteContainer().from_chord('Am'))
+        self.assertEqual(am, res[:2])
+        res.pop(0)
+        self.assertEqual(am, self.guitar6.find_chord_fingering(
+                         FrozenNoteContainer(['A-3', 'C-4', 'E-4']))[:2])
+        self.assertEqual(['E-2', 'A-2', 'E-3', 'A-3', 'C-4', 'E-4'],
+                         [repr(n)[1:-1] for n in self.guitar6
+                         .find_chord_fingering(['A', 'C', 'E'],
+                         return_best_as_NoteContainer=True)])
+
 
 def suite():
     return unittest.TestLoader().loadTestsFromTestCase(test_Tunings)